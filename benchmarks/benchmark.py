@@ -0,0 +1,406 @@
+"""Offline benchmark of arbitron's throughput and ranking quality.
+
+Runs contests against simulated agents that decide every pair from hidden
+latent strengths, so no API calls are made. Reports, for each sampler,
+wall-clock time, model calls per second, comparisons per second, peak
+memory and Kendall tau against the ground truth; Bradley-Terry solve time
+and accuracy against the number of items for each engine; the time and
+accuracy of every ranker; the time and coverage of bootstrap intervals;
+the overhead of the rate limiter; and the import time of the package's
+entry points, each measured in a fresh interpreter.
+
+    uv run benchmarks/benchmark.py
+    uv run benchmarks/benchmark.py --quick
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import arbitron
+from arbitron.models import ComparisonResult
+from arbitron.rankers import RANKERS, get_ranker
+from arbitron.ranking import calculate_bradley_terry_scores, kendall_tau, rank_items
+from arbitron.samplers import (
+    AdaptiveSampler,
+    BalancedSampler,
+    GroupSampler,
+    RandomSampler,
+    Sampler,
+    SortSampler,
+)
+from arbitron.simulation import simulated_agents
+from arbitron.uncertainty import bootstrap
+
+SAMPLERS: Dict[str, Callable[[], Sampler]] = {
+    "random": RandomSampler,
+    "random-stratified": lambda: RandomSampler("stratified"),
+    "balanced": BalancedSampler,
+    "balanced-2-judges": lambda: BalancedSampler(judges_per_pair=2),
+    "adaptive": AdaptiveSampler,
+    "sort": SortSampler,
+    "sort-3-votes": lambda: SortSampler(votes=3),
+    "group-4": lambda: GroupSampler(group_size=4),
+}
+
+
+def latent_strengths(n_items: int, seed: int) -> Dict[str, float]:
+    """Normally distributed strengths for items named item_0000, ..."""
+    rng = random.Random(seed)
+    return {f"item_{k:04d}": rng.gauss(0.0, 1.5) for k in range(n_items)}
+
+
+def true_ranking(strengths: Dict[str, float]) -> List[str]:
+    return sorted(strengths, key=strengths.get, reverse=True)
+
+
+def print_table(title: str, rows: List[Dict[str, object]]) -> None:
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [
+        [f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns]
+        for row in rows
+    ]
+    widths = [
+        max(len(column), *(len(cell[k]) for cell in cells))
+        for k, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(w) for column, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for cell in cells:
+        print("  ".join(value.ljust(w) for value, w in zip(cell, widths)))
+
+
+def bench_contest(
+    name: str,
+    sampler: Sampler,
+    strengths: Dict[str, float],
+    args: argparse.Namespace,
+    batch_size: Optional[int] = None,
+) -> Dict[str, object]:
+    """Run one simulated contest and measure it."""
+    agents = simulated_agents(
+        strengths,
+        n_agents=args.agents,
+        noise=args.noise,
+        position_bias=args.position_bias,
+        latency=args.latency,
+        seed=args.seed,
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = arbitron.rank(
+        list(strengths),
+        "Pick the stronger item.",
+        agents,
+        n_comparisons_per_agent=args.comparisons,
+        random_seed=args.seed,
+        max_concurrency=args.concurrency,
+        max_concurrency_per_agent=args.concurrency,
+        sampler=sampler,
+        batch_size=batch_size,
+    )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = sum(agent.usage["requests"] for agent in agents)
+    n_comparisons = len(result.comparisons)
+    return {
+        "sampler": name,
+        "comparisons": n_comparisons,
+        "calls": calls,
+        "rounds": result.metadata.get("n_rounds", 1),
+        "seconds": elapsed,
+        "calls/s": calls / elapsed,
+        "comparisons/s": n_comparisons / elapsed,
+        "peak MiB": peak / 2**20,
+        "kendall tau": kendall_tau(result.ranking, true_ranking(strengths)),
+    }
+
+
+def simulated_comparisons(
+    strengths: Dict[str, float],
+    n_comparisons: int,
+    noise: float,
+    seed: int,
+    n_agents: int = 1,
+) -> List[ComparisonResult]:
+    """Random Bradley-Terry outcomes, built without validation."""
+    rng = random.Random(seed)
+    names = list(strengths)
+    comparisons = []
+    for k in range(n_comparisons):
+        a, b = rng.sample(names, 2)
+        diff = (strengths[a] - strengths[b]) / noise
+        p = 1.0 / (1.0 + math.exp(-diff))
+        comparisons.append(
+            ComparisonResult.model_construct(
+                item_a=a,
+                item_b=b,
+                winner=a if rng.random() < p else b,
+                reasoning="",
+                agent_id=f"simulated_{k % n_agents}" if n_agents > 1 else "simulated",
+            )
+        )
+    return comparisons
+
+
+def bench_solvers(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time Bradley-Terry for each engine against the number of items."""
+    rows = []
+    for n_items in args.sizes:
+        strengths = latent_strengths(n_items, args.seed)
+        comparisons = simulated_comparisons(
+            strengths, args.solver_comparisons * n_items, args.noise, args.seed
+        )
+        for engine in ("python", "numpy", "sparse"):
+            if engine == "python" and n_items > args.python_max_items:
+                continue
+            tracemalloc.start()
+            start = time.perf_counter()
+            try:
+                scores = calculate_bradley_terry_scores(
+                    comparisons, list(strengths), engine=engine
+                )
+            except ImportError:
+                tracemalloc.stop()
+                continue
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows.append(
+                {
+                    "engine": engine,
+                    "items": n_items,
+                    "comparisons": len(comparisons),
+                    "seconds": elapsed,
+                    "peak MiB": peak / 2**20,
+                    "kendall tau": kendall_tau(
+                        rank_items(scores), true_ranking(strengths)
+                    ),
+                }
+            )
+    return rows
+
+
+def bench_rankers(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time every ranker, and its per-agent consensus, on the same log."""
+    strengths = latent_strengths(args.items, args.seed)
+    comparisons = simulated_comparisons(
+        strengths, args.ranker_comparisons, args.noise, args.seed, args.agents
+    )
+    names = [name for name in RANKERS if name != "consensus"]
+    rows = []
+    for name in names + [f"consensus:{name}" for name in names]:
+        ranker = get_ranker(name)
+        start = time.perf_counter()
+        scores = ranker.fit(comparisons, list(strengths))
+        elapsed = time.perf_counter() - start
+        rows.append(
+            {
+                "ranker": name,
+                "comparisons": len(comparisons),
+                "seconds": elapsed,
+                "us/comparison": elapsed / len(comparisons) * 1e6,
+                "kendall tau": kendall_tau(rank_items(scores), true_ranking(strengths)),
+            }
+        )
+    return rows
+
+
+def bench_bootstrap(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time bootstrap intervals and check how often they cover the truth."""
+    rows = []
+    for n_items in (args.items, 150):
+        strengths = latent_strengths(n_items, args.seed)
+        truth = true_ranking(strengths)
+        comparisons = simulated_comparisons(
+            strengths, args.bootstrap_comparisons, args.noise, args.seed
+        )
+        start = time.perf_counter()
+        try:
+            result = bootstrap(
+                comparisons,
+                list(strengths),
+                n_replicates=args.bootstrap_replicates,
+                random_seed=args.seed,
+            )
+        except ImportError:
+            return rows
+        elapsed = time.perf_counter() - start
+        covered = sum(
+            low <= truth.index(item) + 1 <= high
+            for item, (low, high) in result.rank_intervals.items()
+        )
+        rows.append(
+            {
+                "items": n_items,
+                "comparisons": len(comparisons),
+                "replicates": args.bootstrap_replicates,
+                "seconds": elapsed,
+                "mean rank width": sum(
+                    high - low + 1 for low, high in result.rank_intervals.values()
+                )
+                / n_items,
+                "rank coverage": covered / n_items,
+            }
+        )
+    return rows
+
+
+def bench_rate_limiter(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Measure the limiter's own overhead and how closely it holds a rate."""
+    rows = []
+
+    limiter = arbitron.RateLimiter(requests_per_minute=1e12, burst=10**9)
+    n = 200_000 if not args.quick else 20_000
+    start = time.perf_counter()
+    for _ in range(n):
+        limiter.acquire()
+    elapsed = time.perf_counter() - start
+    rows.append(
+        {
+            "case": "uncontended acquire",
+            "requests": n,
+            "seconds": elapsed,
+            "requests/s": n / elapsed,
+            "target/s": "-",
+        }
+    )
+
+    rate = 600.0 if not args.quick else 1200.0
+    limiter = arbitron.RateLimiter(requests_per_minute=rate)
+    n = 50
+
+    async def contend() -> None:
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(n)))
+
+    start = time.perf_counter()
+    asyncio.run(contend())
+    elapsed = time.perf_counter() - start
+    rows.append(
+        {
+            "case": "contended acquire_async",
+            "requests": n,
+            "seconds": elapsed,
+            # The first request goes out at once, the rest are spaced
+            "requests/s": (n - 1) / elapsed,
+            "target/s": f"{rate / 60:.1f}",
+        }
+    )
+    return rows
+
+
+# Statements timed by bench_imports, each in a fresh interpreter
+IMPORTS = {
+    "import arbitron": "import arbitron",
+    "load_result": "from arbitron import load_result",
+    "Bradley-Terry": "from arbitron.ranking import calculate_bradley_terry_scores",
+    "rank, Agent": "from arbitron import Agent, rank",
+    "100 agents": (
+        "from arbitron import Agent\n"
+        "agents = [Agent('judge', model='openai:gpt-4o-mini') for _ in range(100)]"
+    ),
+    "first request path": (
+        "from arbitron import Agent\nAgent('judge', model='test')._get_agent('pair')"
+    ),
+}
+
+_IMPORT_TIMER = """
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+print(time.perf_counter() - start, "pydantic_ai" in sys.modules, "numpy" in sys.modules)
+"""
+
+
+def bench_imports(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Time the package's entry points, each in a fresh interpreter."""
+    rows = []
+    repeats = 3 if args.quick else 10
+    for name, statement in IMPORTS.items():
+        seconds = []
+        for _ in range(repeats):
+            output = subprocess.run(
+                [sys.executable, "-c", _IMPORT_TIMER, statement],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            seconds.append(float(output[0]))
+        rows.append(
+            {
+                "statement": name,
+                "median ms": statistics.median(seconds) * 1000,
+                "pydantic_ai": output[1],
+                "numpy": output[2],
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=60)
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--comparisons", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--noise", type=float, default=1.0)
+    parser.add_argument("--position-bias", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--solver-comparisons", type=int, default=10)
+    parser.add_argument("--python-max-items", type=int, default=300)
+    parser.add_argument("--ranker-comparisons", type=int, default=20000)
+    parser.add_argument("--bootstrap-comparisons", type=int, default=3000)
+    parser.add_argument("--bootstrap-replicates", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.items = min(args.items, 30)
+        args.comparisons = min(args.comparisons, 40)
+        args.sizes = [size for size in args.sizes if size <= 1000]
+        args.ranker_comparisons = min(args.ranker_comparisons, 5000)
+
+    arbitron.setup_logging("ERROR")
+
+    strengths = latent_strengths(args.items, args.seed)
+    rows = [
+        bench_contest(name, factory(), strengths, args)
+        for name, factory in SAMPLERS.items()
+    ]
+    rows.append(bench_contest("random, batch 5", RandomSampler(), strengths, args, 5))
+    print_table(
+        f"Contests: {args.items} items, {args.agents} agents, "
+        f"{args.comparisons} comparisons per agent, {args.latency * 1000:.0f} ms "
+        f"latency, noise {args.noise}, position bias {args.position_bias}",
+        rows,
+    )
+
+    print_table(
+        f"Bradley-Terry: {args.solver_comparisons} comparisons per item",
+        bench_solvers(args),
+    )
+    print_table(
+        f"Rankers: {args.items} items, {args.agents} agents", bench_rankers(args)
+    )
+    print_table("Bootstrap, 95% intervals", bench_bootstrap(args))
+    print_table("Rate limiter", bench_rate_limiter(args))
+    print_table("Import time, fresh interpreter", bench_imports(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,121 @@
 
 __version__ = "0.1.0"
 
-from .agent import Agent
-from .contest import rank
-from .models import ComparisonResult, Competition, Item, RankingResult
-from .utils import setup_logging
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .agent import Agent, InvalidAnswerError
+    from .backends import Backend
+    from .cache import ComparisonCache
+    from .checkpoint import Checkpoint
+    from .contest import (
+        extend,
+        extend_async,
+        rank,
+        rank_async,
+        rank_many,
+        rank_many_async,
+    )
+    from .metrics import CallRecord, MetricsCollector
+    from .models import (
+        BootstrapResult,
+        ComparisonResult,
+        Competition,
+        GroupRanking,
+        Item,
+        RankingResult,
+    )
+    from .rate_limit import RateLimiter, get_rate_limiter, set_rate_limiter
+    from .retry import RetryPolicy
+    from .stopping import StoppingRule
+    from .store import ComparisonLog, iter_comparisons, load_result, save_result
+    from .streaming import rank_iter, rank_iter_async
+    from .uncertainty import bootstrap
+    from .utils import setup_logging
+
+# Module defining every public name, imported on first access. Tools that
+# only load or re-rank stored results never import the agent and engine stack
+_EXPORTS = {
+    "Agent": "agent",
+    "InvalidAnswerError": "agent",
+    "Backend": "backends",
+    "ComparisonCache": "cache",
+    "Checkpoint": "checkpoint",
+    "extend": "contest",
+    "extend_async": "contest",
+    "rank": "contest",
+    "rank_async": "contest",
+    "rank_many": "contest",
+    "rank_many_async": "contest",
+    "CallRecord": "metrics",
+    "MetricsCollector": "metrics",
+    "BootstrapResult": "models",
+    "ComparisonResult": "models",
+    "Competition": "models",
+    "GroupRanking": "models",
+    "Item": "models",
+    "RankingResult": "models",
+    "RateLimiter": "rate_limit",
+    "get_rate_limiter": "rate_limit",
+    "set_rate_limiter": "rate_limit",
+    "RetryPolicy": "retry",
+    "StoppingRule": "stopping",
+    "ComparisonLog": "store",
+    "iter_comparisons": "store",
+    "load_result": "store",
+    "save_result": "store",
+    "rank_iter": "streaming",
+    "rank_iter_async": "streaming",
+    "bootstrap": "uncertainty",
+    "setup_logging": "utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "Agent",
+    "InvalidAnswerError",
+    "Backend",
+    "Checkpoint",
+    "ComparisonCache",
+    "ComparisonLog",
+    "CallRecord",
+    "MetricsCollector",
+    "extend",
+    "extend_async",
     "rank",
+    "rank_async",
+    "rank_many",
+    "rank_many_async",
+    "rank_iter",
+    "rank_iter_async",
     "Item",
     "Competition",
     "ComparisonResult",
+    "GroupRanking",
     "RankingResult",
+    "BootstrapResult",
+    "bootstrap",
+    "RateLimiter",
+    "get_rate_limiter",
+    "set_rate_limiter",
+    "RetryPolicy",
+    "StoppingRule",
     "setup_logging",
+    "iter_comparisons",
+    "load_result",
+    "save_result",
 ]
-
-# Setup default logging
-setup_logging()
@@ -1,16 +1,123 @@
 """Agent wrapper for PydanticAI agents."""
 
+import asyncio
+import contextvars
+import difflib
 import logging
-import threading
 import time
-from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-from pydantic_ai import Agent as PydanticAgent
+from .backends import Backend, make_pool
+from .metrics import CallHook, CallRecord
+from .models import ComparisonResult, GroupRanking, Item
+from .rate_limit import RateLimiter
 
-from .models import ComparisonResult, Item
+if TYPE_CHECKING:
+    from pydantic_ai import Agent as PydanticAgent
+    from pydantic_ai.usage import Usage
 
 logger = logging.getLogger(__name__)
 
+# Event set once the rate limiter lets the current request through, so
+# callers can time the request itself rather than the wait for a slot
+request_granted: contextvars.ContextVar[Optional[asyncio.Event]] = (
+    contextvars.ContextVar("arbitron_request_granted", default=None)
+)
+
+Pair = Tuple[Item, Item]
+
+# Keys of Usage.details holding prompt tokens served from the provider's cache
+# (OpenAI, Anthropic and Gemini respectively)
+CACHED_TOKEN_KEYS = (
+    "cached_tokens",
+    "cache_read_input_tokens",
+    "cached_content_tokens",
+)
+
+_SYSTEM_PROMPTS = {
+    "pair": """You are an expert evaluator participating in a pairwise comparison task.
+Your role is to compare two items and choose which one is better according to your specific evaluation criteria.
+
+IMPORTANT: You must respond with a structured comparison that includes:
+1. The names of both items being compared (item_a and item_b)
+2. Your chosen winner (must be exactly one of the two items)
+3. Clear reasoning explaining your choice
+
+Your specific evaluation criteria:
+""",
+    "batch": """You are an expert evaluator participating in a pairwise comparison task.
+Your role is to compare several pairs of items and, for each pair, choose which one is better according to your specific evaluation criteria.
+
+IMPORTANT: You must respond with one structured comparison per pair, in the order the pairs are given, each including:
+1. The names of both items being compared (item_a and item_b)
+2. Your chosen winner (must be exactly one of the two items)
+3. Clear reasoning explaining your choice
+
+Your specific evaluation criteria:
+""",
+    "group": """You are an expert evaluator participating in a ranking task.
+Your role is to order a small group of items from best to worst according to your specific evaluation criteria.
+
+IMPORTANT: You must respond with a structured ranking that includes:
+1. The names of every item, each exactly once, from best to worst
+2. Clear reasoning explaining the order
+
+Your specific evaluation criteria:
+""",
+}
+
+_OUTPUT_TYPES: Dict[str, Any] = {
+    "pair": ComparisonResult,
+    "batch": List[ComparisonResult],
+    "group": GroupRanking,
+}
+
+
+def cached_tokens(usage: "Usage") -> int:
+    """Number of prompt tokens of a request served from the provider's cache.
+
+    Args:
+        usage: Usage reported for a model run
+
+    Returns:
+        Cached prompt tokens, 0 if the provider doesn't report any
+    """
+    details = usage.details or {}
+    return sum(details.get(key, 0) for key in CACHED_TOKEN_KEYS)
+
+
+def _retries(messages: List[Any]) -> int:
+    """Number of extra model requests PydanticAI made to get a valid output."""
+    from pydantic_ai.messages import ModelResponse
+
+    return max(0, sum(isinstance(m, ModelResponse) for m in messages) - 1)
+
+
+class InvalidAnswerError(ValueError):
+    """A model answer that can't be turned into comparisons, e.g. a winner
+    matching neither item or a batch with the wrong number of answers."""
+
+
+def _finish(finish: Callable[[Any], List[ComparisonResult]], output: Any):
+    """Turn a model output into comparisons, flagging unusable answers."""
+    try:
+        return finish(output)
+    except ValueError as e:
+        raise InvalidAnswerError(str(e)) from e
+
+
+def _complete_group(pairs: List[Pair]) -> Optional[List[Item]]:
+    """Return the items of `pairs` if they are every pair among 3+ items."""
+    items: Dict[str, Item] = {}
+    for item_a, item_b in pairs:
+        items.setdefault(item_a.name, item_a)
+        items.setdefault(item_b.name, item_b)
+    k = len(items)
+    distinct = {frozenset((a.name, b.name)) for a, b in pairs}
+    if k < 3 or len(pairs) != k * (k - 1) // 2 or len(distinct) != len(pairs):
+        return None
+    return list(items.values())
+
 
 class Agent:
     """Wrapper for PydanticAI agents that perform pairwise comparisons."""
@@ -19,75 +126,377 @@ class Agent:
         self,
         system_prompt: str,
         agent_id: str | None = None,
-        model: str = "google-gla:gemini-2.0-flash-lite",
+        model: Any = "google-gla:gemini-2.0-flash-lite",
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         """Initialize an Arbitron agent.
 
         Args:
             system_prompt: The agent's value system and decision criteria
             agent_id: Optional identifier for the agent
-            model: The LLM model to use
+            model: The LLM model to use, or a list of equivalent models or
+                Backends (e.g. several API keys or providers, with weights)
+                to spread the agent's requests over
+            rate_limiter: Optional limiter to use instead of the one shared
+                by every agent on the same model (15 requests per minute).
+                Applies to the models not given as a Backend
         """
         self.system_prompt = system_prompt
         self.agent_id = agent_id or f"agent_{id(self)}"
 
-        # Rate limiting: 15 requests per minute
-        self._rate_limit = 15
-        self._rate_window = 60  # seconds
-        self._request_times = deque()
-        self._rate_lock = threading.Lock()
-
-        # Create the PydanticAI agent with structured output
-        self._agent = PydanticAgent(
-            model=model,
-            output_type=ComparisonResult,
-            system_prompt=self._build_system_prompt(),
-        )
+        # Rate limiting is shared per backend, since quotas belong to the
+        # provider key
+        self.backends = make_pool(model, rate_limiter)
+        self.model = self.backends.primary.model
+        self.rate_limiter = self.backends.primary.rate_limiter
+
+        # PydanticAI agents with structured output, one per task ("pair",
+        # "batch" or "group") and backend, built when first used so that
+        # creating agents stays cheap
+        self._agents: Dict[Tuple[str, str], "PydanticAgent"] = {}
+
+        # Contest prefixes, compiled once per (task, contest)
+        self._contest_prompts: Dict[Tuple[str, str], str] = {}
+
+        # Token usage reported by the provider across all requests
+        self.usage = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_tokens": 0,
+        }
 
         logger.info(f"Initialized agent {self.agent_id}")
 
-    def _build_system_prompt(self) -> str:
+    def _build_system_prompt(self, task: str = "pair") -> str:
         """Build the full system prompt for the agent."""
-        base_prompt = """You are an expert evaluator participating in a pairwise comparison task.
-Your role is to compare two items and choose which one is better according to your specific evaluation criteria.
+        return _SYSTEM_PROMPTS[task] + self.system_prompt
 
-IMPORTANT: You must respond with a structured comparison that includes:
-1. The names of both items being compared (item_a and item_b)
-2. Your chosen winner (must be exactly one of the two items)
-3. Clear reasoning explaining your choice
+    def _get_agent(
+        self, task: str, backend: Optional[Backend] = None
+    ) -> "PydanticAgent":
+        """Return the PydanticAI agent for a task, building it on first use.
 
-Your specific evaluation criteria:
+        The static system prompt is followed by the contest prompt passed as
+        `deps`, so the prefix of every request of a contest is byte-identical
+        and only the items at the end of the user message change. The model
+        client comes from the backend and is shared by every agent on it.
+        """
+        backend = backend or self.backends.primary
+        agent = self._agents.get((task, backend.name))
+        if agent is None:
+            from pydantic_ai import Agent as PydanticAgent
+            from pydantic_ai import RunContext
+
+            agent = PydanticAgent(
+                model=backend.client,
+                output_type=_OUTPUT_TYPES[task],
+                system_prompt=self._build_system_prompt(task),
+                deps_type=str,
+            )
+
+            @agent.system_prompt
+            def contest_prompt(ctx: RunContext[str]) -> str:
+                return ctx.deps
+
+            self._agents[(task, backend.name)] = agent
+        return agent
+
+    @property
+    def model_key(self) -> str:
+        """Identifier of the model, or of the set of models of a pool."""
+        return "|".join(sorted({backend.model_key for backend in self.backends}))
+
+    def _estimate_tokens(
+        self, prompt: str, task: str = "pair", contest_prompt: str = ""
+    ) -> int:
+        """Roughly estimate the tokens a request will use (4 chars per token)."""
+        system_prompt = self._build_system_prompt(task)
+        return (len(system_prompt) + len(contest_prompt) + len(prompt)) // 4
+
+    def _contest_prompt(self, task: str, contest_description: str) -> str:
+        """Return the cacheable contest prefix for a task, compiled once."""
+        key = (task, contest_description)
+        prompt = self._contest_prompts.get(key)
+        if prompt is None:
+            prompt = self._build_contest_prompt(task, contest_description)
+            self._contest_prompts[key] = prompt
+        return prompt
+
+    def _build_contest_prompt(self, task: str, contest_description: str) -> str:
+        """Build the instructions shared by every request of a contest."""
+        if task == "group":
+            return f"""Contest: {contest_description}
+
+You will be shown a group of options. Rank them from best to worst according to your evaluation criteria. You must set:
+- ranking: the names of all the options, each exactly once, from best to worst
+- reasoning: your explanation
+
+CRITICAL: Every name in the ranking must be an exact character-for-character match of one of the option names. Do not modify, rephrase, or add any characters.
 """
-        return base_prompt + self.system_prompt
-
-    def _wait_for_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        with self._rate_lock:
-            current_time = time.time()
-
-            # Remove old requests outside the time window
-            while (
-                self._request_times
-                and current_time - self._request_times[0] > self._rate_window
-            ):
-                self._request_times.popleft()
-
-            # Always wait at least 4 seconds between requests (15 requests/60 seconds = 1 request per 4 seconds)
-            if self._request_times:
-                time_since_last = current_time - self._request_times[-1]
-                min_interval = self._rate_window / self._rate_limit
-                if time_since_last < min_interval:
-                    wait_time = min_interval - time_since_last
-                    logger.debug(
-                        f"Waiting {wait_time:.2f} seconds to maintain rate limit"
-                    )
-                    time.sleep(wait_time)
-
-            # Record this request
-            self._request_times.append(time.time())
+        if task == "batch":
+            intro = """You will be shown several numbered pairs of options, Option A and Option B. For each pair, in order, choose which option is better according to your evaluation criteria and return one comparison. For each comparison you must set:"""
+        else:
+            intro = """You will be shown two options, Option A and Option B. Choose which option is better according to your evaluation criteria. You must set:"""
+        return f"""Contest: {contest_description}
+
+{intro}
+- item_a: the name of Option A, exactly as written
+- item_b: the name of Option B, exactly as written
+- winner: EXACTLY the name of Option A OR EXACTLY the name of Option B (copy the exact spelling)
+- reasoning: your explanation
+- agent_id: "{self.agent_id}"
+
+CRITICAL: The winner field must be an exact character-for-character match of one of the two option names. Do not modify, rephrase, or add any characters.
+"""
+
+    def _build_prompt(self, item_a: Item, item_b: Item) -> str:
+        """Build the per-pair user prompt for a single comparison."""
+        return f"""Option A: {item_a.name}
+{f"Description: {item_a.description}" if item_a.description else ""}
+
+Option B: {item_b.name}
+{f"Description: {item_b.description}" if item_b.description else ""}
+"""
+
+    def _build_batch_prompt(self, pairs: List[Pair]) -> str:
+        """Build the per-batch user prompt for judging several pairs."""
+        lines = [
+            f"There are {len(pairs)} pairs; return exactly {len(pairs)} comparisons."
+        ]
+        for k, (item_a, item_b) in enumerate(pairs, 1):
+            lines.append("")
+            lines.append(f"Pair {k}:")
+            lines.append(f"Option A: {item_a.name}")
+            if item_a.description:
+                lines.append(f"Description: {item_a.description}")
+            lines.append(f"Option B: {item_b.name}")
+            if item_b.description:
+                lines.append(f"Description: {item_b.description}")
+        return "\n".join(lines) + "\n"
+
+    def _build_group_prompt(self, items: List[Item]) -> str:
+        """Build the per-group user prompt for ranking several items."""
+        lines = []
+        for item in items:
+            lines.append(f"Option: {item.name}")
+            if item.description:
+                lines.append(f"Description: {item.description}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def _batch_comparisons(
+        self, outputs: List[ComparisonResult], pairs: List[Pair]
+    ) -> List[ComparisonResult]:
+        """Match a batched answer to the pairs that were asked, in order."""
+        if len(outputs) != len(pairs):
+            raise ValueError(
+                f"Agent {self.agent_id} returned {len(outputs)} comparisons "
+                f"for {len(pairs)} pairs"
+            )
+        # Pin the item names to the request; the winner is re-validated
+        comparisons = []
+        for output, (item_a, item_b) in zip(outputs, pairs):
+            comparison = ComparisonResult(
+                item_a=item_a.name,
+                item_b=item_b.name,
+                winner=output.winner,
+                reasoning=output.reasoning,
+                agent_id=self.agent_id,
+            )
+            if output.corrected_from is not None:
+                comparison._corrected_from = output.corrected_from
+            comparisons.append(self._finalize(comparison, item_a, item_b))
+        return comparisons
+
+    def _group_comparisons(
+        self, output: GroupRanking, items: List[Item], pairs: List[Pair]
+    ) -> List[ComparisonResult]:
+        """Expand a k-way ranking into the pairwise outcomes it implies."""
+        names = [item.name for item in items]
+        positions: Dict[str, int] = {}
+        corrected_from: Dict[str, str] = {}
+        for position, name in enumerate(output.ranking):
+            if name not in names:
+                closest_match = difflib.get_close_matches(name, names, n=1, cutoff=0.6)
+                if not closest_match:
+                    raise ValueError(f"Ranked item '{name}' is not one of {names}")
+                logger.warning(
+                    f"Ranked item '{name}' corrected to '{closest_match[0]}'"
+                )
+                corrected_from[closest_match[0]] = name
+                name = closest_match[0]
+            positions.setdefault(name, position)
+        missing = [name for name in names if name not in positions]
+        if missing:
+            raise ValueError(f"Agent {self.agent_id} left {missing} out of its ranking")
+
+        comparisons = []
+        for item_a, item_b in pairs:
+            winner = (
+                item_a if positions[item_a.name] < positions[item_b.name] else item_b
+            )
+            comparison = ComparisonResult(
+                item_a=item_a.name,
+                item_b=item_b.name,
+                winner=winner.name,
+                reasoning=output.reasoning,
+                agent_id=self.agent_id,
+            )
+            comparison._corrected_from = corrected_from.get(winner.name)
+            comparisons.append(self._finalize(comparison, item_a, item_b))
+        return comparisons
+
+    def _record_usage(
+        self,
+        estimated_tokens: int,
+        usage: "Usage",
+        record: CallRecord,
+        backend: Backend,
+    ) -> None:
+        """Settle the rate limiter and add a request to the usage totals."""
+        backend.rate_limiter.record_usage(estimated_tokens, usage.total_tokens)
+        self.usage["requests"] += 1
+        self.usage["input_tokens"] += usage.request_tokens or 0
+        self.usage["output_tokens"] += usage.response_tokens or 0
+        self.usage["cached_tokens"] += cached_tokens(usage)
+
+        record.input_tokens = usage.request_tokens or 0
+        record.output_tokens = usage.response_tokens or 0
+        record.cached_tokens = cached_tokens(usage)
+
+    def _emit(
+        self,
+        record: CallRecord,
+        comparisons: List[ComparisonResult],
+        on_call: Optional[CallHook],
+        backend: Backend,
+    ) -> None:
+        """Complete a call record, settle the backend and pass it to the hook."""
+        self.backends.release(backend, record.request_seconds, record.error is None)
+        for comparison in comparisons:
+            comparison.backend = backend.name
+        record.n_comparisons = len(comparisons)
+        record.corrections = sum(c.corrected_from is not None for c in comparisons)
+        if on_call is not None:
+            on_call(record)
+
+    def _run(
+        self,
+        task: str,
+        prompt: str,
+        contest_description: str,
+        finish: Callable[[Any], List[ComparisonResult]],
+        on_call: Optional[CallHook] = None,
+    ) -> List[ComparisonResult]:
+        """Run a prompt under the rate limiter and record the call.
+
+        `finish` turns the model output into comparisons.
+        """
+        contest_prompt = self._contest_prompt(task, contest_description)
+        estimated_tokens = self._estimate_tokens(prompt, task, contest_prompt)
+        backend = self.backends.acquire(estimated_tokens)
+        record = CallRecord(agent_id=self.agent_id, model=backend.name, task=task)
+
+        # Apply rate limiting
+        try:
+            record.wait_seconds = backend.rate_limiter.acquire(estimated_tokens)
+        except BaseException:
+            # Interrupted while waiting, so the request was never sent
+            self.backends.cancel(backend)
+            raise
+
+        start = time.perf_counter()
+        comparisons: List[ComparisonResult] = []
+        try:
+            result = self._get_agent(task, backend).run_sync(
+                prompt, deps=contest_prompt
+            )
+            record.request_seconds = time.perf_counter() - start
+            record.retries = _retries(result.all_messages())
+            self._record_usage(estimated_tokens, result.usage(), record, backend)
+            comparisons = _finish(finish, result.output)
+        except BaseException as e:
+            record.request_seconds = record.request_seconds or (
+                time.perf_counter() - start
+            )
+            record.error = type(e).__name__
+            raise
+        finally:
+            self._emit(record, comparisons, on_call, backend)
+        return comparisons
+
+    async def _run_async(
+        self,
+        task: str,
+        prompt: str,
+        contest_description: str,
+        finish: Callable[[Any], List[ComparisonResult]],
+        on_call: Optional[CallHook] = None,
+        timeout: Optional[float] = None,
+    ) -> List[ComparisonResult]:
+        """Run a prompt under the rate limiter without blocking the loop.
+
+        `timeout` bounds the request itself, not the wait for the limiter.
+        """
+        contest_prompt = self._contest_prompt(task, contest_description)
+        estimated_tokens = self._estimate_tokens(prompt, task, contest_prompt)
+        backend = self.backends.acquire(estimated_tokens)
+        record = CallRecord(agent_id=self.agent_id, model=backend.name, task=task)
+
+        try:
+            record.wait_seconds = await backend.rate_limiter.acquire_async(
+                estimated_tokens
+            )
+        except BaseException:
+            # Cancelled while waiting, e.g. a hedged duplicate that lost
+            self.backends.cancel(backend)
+            raise
+        granted = request_granted.get()
+        if granted is not None:
+            granted.set()
+
+        start = time.perf_counter()
+        comparisons: List[ComparisonResult] = []
+        try:
+            result = await asyncio.wait_for(
+                self._get_agent(task, backend).run(prompt, deps=contest_prompt),
+                timeout,
+            )
+            record.request_seconds = time.perf_counter() - start
+            record.retries = _retries(result.all_messages())
+            self._record_usage(estimated_tokens, result.usage(), record, backend)
+            comparisons = _finish(finish, result.output)
+        except BaseException as e:
+            record.request_seconds = record.request_seconds or (
+                time.perf_counter() - start
+            )
+            record.error = type(e).__name__
+            raise
+        finally:
+            self._emit(record, comparisons, on_call, backend)
+        return comparisons
+
+    def _finalize(
+        self, comparison: ComparisonResult, item_a: Item, item_b: Item
+    ) -> ComparisonResult:
+        """Stamp the agent id on a comparison and log the decision."""
+        # Ensure agent_id is set correctly
+        comparison.agent_id = self.agent_id
+
+        logger.info(
+            f"Agent {self.agent_id} chose {comparison.winner} "
+            f"over {item_a.name if comparison.winner == item_b.name else item_b.name}"
+        )
+
+        return comparison
 
     def compare(
-        self, item_a: Item, item_b: Item, contest_description: str
+        self,
+        item_a: Item,
+        item_b: Item,
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
     ) -> ComparisonResult:
         """Compare two items and return the agent's decision.
 
@@ -95,47 +504,218 @@ Your specific evaluation criteria:
             item_a: First item to compare
             item_b: Second item to compare
             contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
 
         Returns:
             ComparisonResult with the agent's choice and reasoning
         """
-        # Apply rate limiting
-        self._wait_for_rate_limit()
+        logger.debug(f"Agent {self.agent_id} comparing {item_a.name} vs {item_b.name}")
 
-        prompt = f"""Contest: {contest_description}
+        # The agent returns a ComparisonResult directly due to output_type
+        return self._run(
+            "pair",
+            self._build_prompt(item_a, item_b),
+            contest_description,
+            lambda output: [self._finalize(output, item_a, item_b)],
+            on_call,
+        )[0]
+
+    async def compare_async(
+        self,
+        item_a: Item,
+        item_b: Item,
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+        timeout: Optional[float] = None,
+    ) -> ComparisonResult:
+        """Compare two items asynchronously and return the agent's decision.
 
-Please compare these two options:
+        Args:
+            item_a: First item to compare
+            item_b: Second item to compare
+            contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
+            timeout: Optional seconds the request may take, not counting the
+                wait for the rate limiter
 
-Option A: {item_a.name}
-{f"Description: {item_a.description}" if item_a.description else ""}
+        Returns:
+            ComparisonResult with the agent's choice and reasoning
+        """
+        logger.debug(f"Agent {self.agent_id} comparing {item_a.name} vs {item_b.name}")
 
-Option B: {item_b.name}
-{f"Description: {item_b.description}" if item_b.description else ""}
+        comparisons = await self._run_async(
+            "pair",
+            self._build_prompt(item_a, item_b),
+            contest_description,
+            lambda output: [self._finalize(output, item_a, item_b)],
+            on_call,
+            timeout,
+        )
+        return comparisons[0]
 
-Choose which option is better according to your evaluation criteria. You must set:
-- item_a: "{item_a.name}"
-- item_b: "{item_b.name}"
-- winner: EXACTLY "{item_a.name}" OR EXACTLY "{item_b.name}" (copy the exact spelling)
-- reasoning: your explanation
-- agent_id: "{self.agent_id}"
+    def compare_batch(
+        self,
+        pairs: List[Pair],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+    ) -> List[ComparisonResult]:
+        """Judge several pairs in a single request.
 
-CRITICAL: The winner field must be an exact character-for-character match of one of the two option names above. Do not modify, rephrase, or add any characters.
-"""
+        The system prompt and contest description are sent once for the whole
+        batch instead of once per pair. When `pairs` holds every pair among a
+        group of three or more items, the agent is asked for a ranking of the
+        group instead (see `rank_group`).
 
-        logger.debug(f"Agent {self.agent_id} comparing {item_a.name} vs {item_b.name}")
+        Args:
+            pairs: (item_a, item_b) pairs to judge
+            contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
 
-        # Run the comparison
-        result = self._agent.run_sync(prompt)
+        Returns:
+            One ComparisonResult per pair, in the same order
+        """
+        if len(pairs) == 1:
+            return [self.compare(*pairs[0], contest_description, on_call)]
+        group = _complete_group(pairs)
+        if group is not None:
+            return self._rank_group_pairs(group, pairs, contest_description, on_call)
+
+        logger.debug(f"Agent {self.agent_id} comparing a batch of {len(pairs)} pairs")
+        return self._run(
+            "batch",
+            self._build_batch_prompt(pairs),
+            contest_description,
+            lambda outputs: self._batch_comparisons(outputs, pairs),
+            on_call,
+        )
 
-        # The agent returns a ComparisonResult directly due to output_type
-        comparison = result.output
+    async def compare_batch_async(
+        self,
+        pairs: List[Pair],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+        timeout: Optional[float] = None,
+    ) -> List[ComparisonResult]:
+        """Judge several pairs in a single request, asynchronously.
 
-        # Ensure agent_id is set correctly
-        comparison.agent_id = self.agent_id
+        Args:
+            pairs: (item_a, item_b) pairs to judge
+            contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
+            timeout: Optional seconds the request may take, not counting the
+                wait for the rate limiter
 
-        logger.info(
-            f"Agent {self.agent_id} chose {comparison.winner} "
-            f"over {item_a.name if comparison.winner == item_b.name else item_b.name}"
+        Returns:
+            One ComparisonResult per pair, in the same order
+        """
+        if len(pairs) == 1:
+            return [
+                await self.compare_async(
+                    *pairs[0], contest_description, on_call, timeout
+                )
+            ]
+        group = _complete_group(pairs)
+        if group is not None:
+            return await self._rank_group_pairs_async(
+                group, pairs, contest_description, on_call, timeout
+            )
+
+        logger.debug(f"Agent {self.agent_id} comparing a batch of {len(pairs)} pairs")
+        return await self._run_async(
+            "batch",
+            self._build_batch_prompt(pairs),
+            contest_description,
+            lambda outputs: self._batch_comparisons(outputs, pairs),
+            on_call,
+            timeout,
         )
 
-        return comparison
+    def _rank_group_pairs(
+        self,
+        items: List[Item],
+        pairs: List[Pair],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+    ) -> List[ComparisonResult]:
+        logger.debug(f"Agent {self.agent_id} ranking a group of {len(items)} items")
+        return self._run(
+            "group",
+            self._build_group_prompt(items),
+            contest_description,
+            lambda output: self._group_comparisons(output, items, pairs),
+            on_call,
+        )
+
+    async def _rank_group_pairs_async(
+        self,
+        items: List[Item],
+        pairs: List[Pair],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+        timeout: Optional[float] = None,
+    ) -> List[ComparisonResult]:
+        logger.debug(f"Agent {self.agent_id} ranking a group of {len(items)} items")
+        return await self._run_async(
+            "group",
+            self._build_group_prompt(items),
+            contest_description,
+            lambda output: self._group_comparisons(output, items, pairs),
+            on_call,
+            timeout,
+        )
+
+    def rank_group(
+        self,
+        items: List[Item],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+    ) -> List[ComparisonResult]:
+        """Rank a group of items in a single request.
+
+        The ranking is expanded into the k(k-1)/2 pairwise outcomes it
+        implies, so it can be fed to Bradley-Terry like any other comparisons.
+        These outcomes come from one judgment and are not independent, which
+        makes them worth somewhat less than as many separate comparisons.
+
+        Args:
+            items: Items to rank
+            contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
+
+        Returns:
+            One ComparisonResult for every pair of items
+        """
+        pairs = [
+            (items[i], items[j])
+            for i in range(len(items))
+            for j in range(i + 1, len(items))
+        ]
+        return self._rank_group_pairs(items, pairs, contest_description, on_call)
+
+    async def rank_group_async(
+        self,
+        items: List[Item],
+        contest_description: str,
+        on_call: Optional[CallHook] = None,
+        timeout: Optional[float] = None,
+    ) -> List[ComparisonResult]:
+        """Rank a group of items in a single request, asynchronously.
+
+        Args:
+            items: Items to rank
+            contest_description: Description of what's being evaluated
+            on_call: Optional callback receiving the CallRecord of the request
+            timeout: Optional seconds the request may take, not counting the
+                wait for the rate limiter
+
+        Returns:
+            One ComparisonResult for every pair of items
+        """
+        pairs = [
+            (items[i], items[j])
+            for i in range(len(items))
+            for j in range(i + 1, len(items))
+        ]
+        return await self._rank_group_pairs_async(
+            items, pairs, contest_description, on_call, timeout
+        )
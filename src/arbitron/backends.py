@@ -0,0 +1,236 @@
+"""Pools of equivalent model backends behind one agent."""
+
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .rate_limit import RateLimiter, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest request in a backend's latency average
+LATENCY_SMOOTHING = 0.2
+
+# Latency assumed for a backend before any request to the pool has finished
+DEFAULT_LATENCY = 1.0
+
+# PydanticAI models built from model names, shared by every backend and
+# agent on the same name so they reuse one HTTP client and its connections
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(model: Any) -> Any:
+    """The PydanticAI model to send requests to for a model name or instance.
+
+    A model name is resolved once per process, on first use; model
+    instances are used as given.
+
+    Args:
+        model: Model name (e.g. "openai:gpt-4o-mini") or PydanticAI model
+
+    Returns:
+        PydanticAI model
+    """
+    if not isinstance(model, str):
+        return model
+    with _clients_lock:
+        client = _clients.get(model)
+        if client is None:
+            from pydantic_ai.models import infer_model
+
+            client = _clients[model] = infer_model(model)
+            logger.debug(f"Created client for {model}")
+    return client
+
+
+def model_key(model: Any) -> str:
+    """Identifier of a model name or PydanticAI model instance."""
+    if isinstance(model, str):
+        return model
+    return f"{model.system}:{model.model_name}"
+
+
+class Backend:
+    """One way of reaching a model: a model name or instance, and its quota.
+
+    Backends of the same model with different API keys are told apart by
+    `name`, which is also the key of the shared rate limiter; give each key
+    its own name, e.g. Backend(GoogleModel(..., provider=GoogleProvider(
+    api_key=key_2)), name="gemini-key-2").
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        weight: float = 1.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        name: Optional[str] = None,
+    ):
+        """Initialize a backend.
+
+        Args:
+            model: Model name (e.g. "openai:gpt-4o-mini") or PydanticAI model
+            weight: Relative share of the requests this backend gets when
+                every backend has capacity
+            rate_limiter: Optional limiter to use instead of the one shared
+                under `name`
+            name: Identifier of the backend, recorded on the comparisons it
+                answers. Defaults to the model key
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+
+        self.model = model
+        self.weight = weight
+        self.name = name or model_key(model)
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.name)
+
+        # Live state used for routing
+        self.latency: Optional[float] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def model_key(self) -> str:
+        """Identifier of the model, regardless of the key used to reach it."""
+        return model_key(self.model)
+
+    @property
+    def client(self) -> Any:
+        """PydanticAI model for this backend, built on first use."""
+        return shared_client(self.model)
+
+    def __repr__(self) -> str:
+        return f"Backend({self.name!r}, weight={self.weight})"
+
+
+class BackendPool:
+    """Routes the requests of an agent across equivalent backends.
+
+    Each request goes to the backend expected to answer first: the wait its
+    rate limiter would impose now plus its average latency for every request
+    already in flight on it, divided by its weight. When all backends are
+    idle and equally fast, requests are spread in proportion to the weights.
+    Failed requests count as slow ones, so a failing backend is used less
+    until the others run out of capacity.
+    """
+
+    def __init__(self, backends: Sequence[Backend]):
+        """Initialize the pool.
+
+        Args:
+            backends: The backends, at least one, with distinct names
+        """
+        if not backends:
+            raise ValueError("A backend pool needs at least one backend")
+        names = [backend.name for backend in backends]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Backend names must be distinct, got {names}")
+
+        self.backends = list(backends)
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[Backend]:
+        return iter(self.backends)
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    @property
+    def primary(self) -> Backend:
+        """The first backend of the pool."""
+        return self.backends[0]
+
+    def _expected_seconds(self, backend: Backend, tokens: int, default: float) -> float:
+        latency = backend.latency if backend.latency is not None else default
+        wait = backend.rate_limiter.estimate_wait(tokens)
+        return (wait + latency * (backend.in_flight + 1)) / backend.weight
+
+    def acquire(self, tokens: int = 0) -> Backend:
+        """Pick the backend for a request and mark the request in flight.
+
+        Call `release` with the same backend once the request is over.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+
+        Returns:
+            The chosen Backend
+        """
+        with self._lock:
+            if len(self.backends) == 1:
+                backend = self.backends[0]
+            else:
+                known = [b.latency for b in self.backends if b.latency is not None]
+                default = sum(known) / len(known) if known else DEFAULT_LATENCY
+                backend = min(
+                    self.backends,
+                    key=lambda b: (
+                        self._expected_seconds(b, tokens, default),
+                        b.requests / b.weight,
+                    ),
+                )
+            backend.in_flight += 1
+            backend.requests += 1
+        return backend
+
+    def cancel(self, backend: Backend) -> None:
+        """Forget a request to `backend` that was never sent."""
+        with self._lock:
+            backend.in_flight -= 1
+            backend.requests -= 1
+
+    def release(self, backend: Backend, seconds: float, ok: bool) -> None:
+        """Record how a request to `backend` went.
+
+        Args:
+            backend: Backend returned by `acquire`
+            seconds: Time the request took
+            ok: Whether it succeeded
+        """
+        with self._lock:
+            backend.in_flight -= 1
+            if not ok:
+                backend.errors += 1
+                # Count a failure as twice the slowest answer seen so far
+                seconds = 2 * max(seconds, backend.latency or DEFAULT_LATENCY)
+            if backend.latency is None:
+                backend.latency = seconds
+            else:
+                backend.latency += LATENCY_SMOOTHING * (seconds - backend.latency)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Requests, errors and average latency of every backend, by name."""
+        with self._lock:
+            return {
+                backend.name: {
+                    "requests": backend.requests,
+                    "errors": backend.errors,
+                    "latency_seconds": backend.latency,
+                }
+                for backend in self.backends
+            }
+
+
+def make_pool(model: Any, rate_limiter: Optional[RateLimiter] = None) -> BackendPool:
+    """Build the pool of an agent from its `model` argument.
+
+    Args:
+        model: A model name or instance, a Backend, or a list of those
+        rate_limiter: Optional limiter for models not given as a Backend
+
+    Returns:
+        BackendPool over the given backends
+    """
+    entries: List[Any] = list(model) if isinstance(model, (list, tuple)) else [model]
+    return BackendPool(
+        [
+            entry
+            if isinstance(entry, Backend)
+            else Backend(entry, rate_limiter=rate_limiter)
+            for entry in entries
+        ]
+    )
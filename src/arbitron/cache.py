@@ -0,0 +1,196 @@
+"""Persistent on-disk cache of comparison results."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .models import TRUSTED, ComparisonResult, Item
+
+logger = logging.getLogger(__name__)
+
+
+def comparison_key(
+    system_prompt: str,
+    model: str,
+    contest_description: str,
+    item_a: Item,
+    item_b: Item,
+) -> str:
+    """Hash everything that determines the outcome of a comparison.
+
+    The pair is ordered: (A, B) and (B, A) are different prompts and get
+    different keys.
+
+    Args:
+        system_prompt: The agent's value system
+        model: Identifier of the model answering the comparison
+        contest_description: Description of what's being evaluated
+        item_a: First item, as shown to the agent
+        item_b: Second item, as shown to the agent
+
+    Returns:
+        Hex digest identifying the comparison
+    """
+    payload = json.dumps(
+        [
+            system_prompt,
+            model,
+            contest_description,
+            item_a.name,
+            item_a.description,
+            item_b.name,
+            item_b.description,
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ComparisonCache:
+    """SQLite-backed cache of ComparisonResults.
+
+    Entries expire after `ttl` seconds and, when `max_entries` is set, the
+    least recently used entries are evicted beyond that size.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "arbitron_cache.sqlite",
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        reuse: bool = True,
+    ):
+        """Open (or create) a comparison cache.
+
+        Args:
+            path: SQLite database file, or ":memory:"
+            ttl: Optional maximum age of an entry in seconds
+            max_entries: Optional maximum number of entries to keep
+            reuse: Whether to serve cached results. With False the cache is
+                only written to, which refreshes stale entries
+        """
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.reuse = reuse
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS comparisons (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS comparisons_accessed_at "
+            "ON comparisons (accessed_at)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def get(self, key: str) -> Optional[ComparisonResult]:
+        """Return the cached comparison for `key`, if any.
+
+        Args:
+            key: Key from `comparison_key`
+
+        Returns:
+            The cached ComparisonResult, or None on a miss
+        """
+        if not self.reuse:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM comparisons WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM comparisons WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE comparisons SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return ComparisonResult.model_validate_json(row[0], context=TRUSTED)
+
+    def put(self, key: str, comparison: ComparisonResult) -> None:
+        """Store a comparison under `key`.
+
+        Args:
+            key: Key from `comparison_key`
+            comparison: The comparison to store
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO comparisons VALUES (?, ?, ?, ?)",
+                (key, comparison.model_dump_json(), now, now),
+            )
+            self._conn.commit()
+        if self.max_entries is not None and len(self) > self.max_entries:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries and trim the cache to `max_entries`.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            if self.ttl is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM comparisons WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+                removed += cursor.rowcount
+            if self.max_entries is not None:
+                cursor = self._conn.execute(
+                    """
+                    DELETE FROM comparisons WHERE key IN (
+                        SELECT key FROM comparisons
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+                removed += cursor.rowcount
+            self._conn.commit()
+        if removed:
+            logger.debug(f"Evicted {removed} cached comparisons")
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM comparisons").fetchone()[0]
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters since the cache was opened."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,140 @@
+"""Append-only checkpoint log for resuming long contests."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .models import TRUSTED, ComparisonResult
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """JSONL log of completed comparisons.
+
+    The first line is a header with the settings needed to rebuild the
+    schedule (the random seed). Every completed comparison is appended as
+    its own line and flushed immediately, so a crash loses at most the
+    comparisons that were still in flight.
+    """
+
+    def __init__(self, path: Union[str, Path], fsync: bool = False):
+        """Create a checkpoint backed by `path`.
+
+        Args:
+            path: JSONL file to append to
+            fsync: Whether to fsync after every record, to survive power loss
+                and not just process crashes
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self.header: Optional[Dict[str, Any]] = None
+        self.completed: Dict[int, Dict[str, Any]] = {}
+
+        self._lock = threading.Lock()
+        self._file = None
+
+    def exists(self) -> bool:
+        """Whether the log already holds a header."""
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def load(self) -> None:
+        """Read the header and completed jobs from an existing log.
+
+        A truncated last line, left by a crash in the middle of a write, is
+        ignored.
+        """
+        self.header = None
+        self.completed = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        f"Ignoring unreadable line {line_number} of checkpoint "
+                        f"{self.path}"
+                    )
+                    continue
+                if record.get("type") == "header":
+                    self.header = record
+                elif record.get("type") == "comparison":
+                    self.completed[record["job"]] = record
+        logger.info(
+            f"Loaded {len(self.completed)} completed comparisons from {self.path}"
+        )
+
+    def start(self, header: Dict[str, Any]) -> None:
+        """Open the log for appending, writing `header` if it is new.
+
+        Args:
+            header: Settings needed to rebuild the schedule on resume
+        """
+        is_new = not self.exists()
+        if not is_new:
+            self._drop_torn_line()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if is_new:
+            self.header = {"type": "header", **header}
+            self._write(self.header)
+
+    def _drop_torn_line(self) -> None:
+        """Cut a partial last line left by a crash, so appended records start
+        on a line of their own."""
+        with open(self.path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                logger.warning(
+                    f"Dropping {end - position} bytes of a partial record at the "
+                    f"end of checkpoint {self.path}"
+                )
+                f.truncate(position)
+
+    def comparison(self, job: int) -> Optional[ComparisonResult]:
+        """Return the logged comparison for a job index, if completed."""
+        record = self.completed.get(job)
+        if record is None:
+            return None
+        return ComparisonResult.model_validate(record["comparison"], context=TRUSTED)
+
+    def record(self, job: int, comparison: ComparisonResult) -> None:
+        """Append a completed comparison.
+
+        Args:
+            job: Index of the job in the contest schedule
+            comparison: The completed comparison
+        """
+        record = {
+            "type": "comparison",
+            "job": job,
+            "comparison": comparison.model_dump(),
+        }
+        self.completed[job] = record
+        self._write(record)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -1,16 +1,126 @@
 """Main contest orchestration logic."""
 
+import asyncio
+import copy
 import logging
 import random
-from typing import List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from .agent import Agent
-from .models import Competition, Item, RankingResult
-from .ranking import calculate_bradley_terry_scores, rank_items
+from .cache import ComparisonCache
+from .checkpoint import Checkpoint
+from .engine import ComparisonEngine, Job, current_lane
+from .metrics import CallHook
+from .models import ComparisonResult, Competition, Item, RankingResult
+from .rankers import OnlineRanker, Ranker, get_ranker
+from .ranking import comparison_graph_components, rank_items
+from .retry import RetryPolicy
+from .samplers import RandomSampler, Sampler
+from .stopping import StoppingRule
+from .store import ComparisonLog
 
 logger = logging.getLogger(__name__)
 
 
+def _to_items(items: List[Union[str, Item]]) -> List[Item]:
+    """Convert strings to Item objects if needed."""
+    item_objects = []
+    for item in items:
+        if isinstance(item, str):
+            item_objects.append(Item(name=item))  # type: ignore
+        else:
+            item_objects.append(item)
+    return item_objects
+
+
+def _open_checkpoint(
+    checkpoint: Union[str, Path, Checkpoint, None],
+    resume: bool,
+    random_seed: Optional[int],
+) -> Tuple[Optional[Checkpoint], Optional[int]]:
+    """Open a checkpoint and settle the seed its schedule is built from.
+
+    Returns:
+        The Checkpoint (or None) and the random seed to use
+    """
+    if checkpoint is None:
+        return None, random_seed
+    if not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint(checkpoint)
+
+    if checkpoint.exists():
+        if not resume:
+            raise ValueError(
+                f"Checkpoint {checkpoint.path} already exists; pass resume=True "
+                f"to continue it or remove the file"
+            )
+        checkpoint.load()
+        logged_seed = (checkpoint.header or {}).get("random_seed")
+        if random_seed is not None and random_seed != logged_seed:
+            raise ValueError(
+                f"random_seed {random_seed} does not match the seed "
+                f"{logged_seed} recorded in checkpoint {checkpoint.path}"
+            )
+        return checkpoint, logged_seed
+
+    # The schedule must be reproducible to be resumable, so pin a seed
+    if random_seed is None:
+        random_seed = random.randrange(2**32)
+    return checkpoint, random_seed
+
+
+async def _run_schedule(
+    engine: ComparisonEngine,
+    schedule: List[Job],
+    contest_description: str,
+    checkpoint: Optional[Checkpoint],
+    offset: int = 0,
+) -> List[ComparisonResult]:
+    """Run a schedule, skipping and recording jobs in the checkpoint.
+
+    Jobs are numbered from `offset` in the checkpoint, so the rounds of a
+    multi-round contest share one log.
+    """
+    if checkpoint is None:
+        return await engine.run(schedule, contest_description)
+
+    results: List[Optional[ComparisonResult]] = [None] * len(schedule)
+    pending = []
+    for index, (agent, item_a, item_b) in enumerate(schedule):
+        comparison = checkpoint.comparison(offset + index)
+        if comparison is None:
+            pending.append(index)
+            continue
+        if comparison.agent_id != agent.agent_id or {
+            comparison.item_a,
+            comparison.item_b,
+        } != {item_a.name, item_b.name}:
+            raise ValueError(
+                f"Checkpoint {checkpoint.path} does not match this contest "
+                f"(job {offset + index} differs)"
+            )
+        results[index] = comparison
+
+    if len(pending) < len(schedule):
+        logger.info(
+            f"Resuming: {len(schedule) - len(pending)} comparisons restored, "
+            f"{len(pending)} remaining"
+        )
+
+    def on_result(k: int, comparison: ComparisonResult) -> None:
+        checkpoint.record(offset + pending[k], comparison)
+
+    completed = await engine.run(
+        [schedule[index] for index in pending], contest_description, on_result
+    )
+
+    for index, comparison in zip(pending, completed):
+        results[index] = comparison
+    return results  # type: ignore[return-value]
+
+
 def rank(
     items: List[Union[str, Item]],
     contest_description: str,
@@ -18,9 +128,23 @@ def rank(
     competition_name: Optional[str] = None,
     n_comparisons_per_agent: int = 10,
     random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    checkpoint: Union[str, Path, Checkpoint, None] = None,
+    resume: bool = False,
+    sampler: Optional[Sampler] = None,
+    batch_size: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    stopping: Optional[StoppingRule] = None,
+    ranker: Union[str, Ranker, None] = None,
 ) -> RankingResult:
     """Run a ranking contest with multiple agents.
 
+    This is a blocking wrapper around `rank_async`. It cannot be called from
+    inside a running event loop; use `await rank_async(...)` there instead.
+
     Args:
         items: List of items to rank (strings or Item objects)
         contest_description: Description of what's being evaluated
@@ -28,21 +152,120 @@ def rank(
         competition_name: Optional name for the competition
         n_comparisons_per_agent: Number of random pairwise comparisons per agent
         random_seed: Optional seed for reproducible random sampling
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        checkpoint: Optional JSONL file (or Checkpoint) that every completed
+            comparison is appended to as soon as it lands
+        resume: Continue the contest logged in an existing checkpoint,
+            skipping the comparisons it already holds
+        sampler: Pair selection strategy. Defaults to RandomSampler, which
+            draws `n_comparisons_per_agent` uniformly random pairs per agent;
+            AdaptiveSampler spends the same budget on informative pairs
+        batch_size: Number of comparisons of an agent to judge per request.
+            Defaults to the sampler's batch size (1 for pairwise samplers,
+            one group for GroupSampler)
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        stopping: Optional StoppingRule ending the contest early once the
+            ranking has converged or a call, token or time cap is reached
+        ranker: Method turning the comparisons into scores: a Ranker, or
+            the name of one in `rankers.RANKERS`, e.g. "elo" or
+            "consensus:bradley-terry". Defaults to Bradley-Terry
 
     Returns:
         RankingResult with final rankings, scores, and all comparisons
     """
-    # Set random seed if provided
-    if random_seed is not None:
-        random.seed(random_seed)
+    return asyncio.run(
+        rank_async(
+            items=items,
+            contest_description=contest_description,
+            agents=agents,
+            competition_name=competition_name,
+            n_comparisons_per_agent=n_comparisons_per_agent,
+            random_seed=random_seed,
+            max_concurrency=max_concurrency,
+            max_concurrency_per_agent=max_concurrency_per_agent,
+            cache=cache,
+            checkpoint=checkpoint,
+            resume=resume,
+            sampler=sampler,
+            batch_size=batch_size,
+            on_call=on_call,
+            retry=retry,
+            stopping=stopping,
+            ranker=ranker,
+        )
+    )
 
-    # Convert strings to Item objects if needed
-    item_objects = []
-    for item in items:
-        if isinstance(item, str):
-            item_objects.append(Item(name=item))  # type: ignore
-        else:
-            item_objects.append(item)
+
+async def rank_async(
+    items: List[Union[str, Item]],
+    contest_description: str,
+    agents: List[Agent],
+    competition_name: Optional[str] = None,
+    n_comparisons_per_agent: int = 10,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    checkpoint: Union[str, Path, Checkpoint, None] = None,
+    resume: bool = False,
+    sampler: Optional[Sampler] = None,
+    batch_size: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    stopping: Optional[StoppingRule] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> RankingResult:
+    """Run a ranking contest with multiple agents concurrently.
+
+    The sampler plans comparisons in rounds (a single round for the default
+    random sampler) from a seeded generator, so a given seed yields the same
+    schedule as a sequential run. Within a round, comparisons from different
+    agents and independent pairs of the same agent are sent in parallel.
+
+    Args:
+        items: List of items to rank (strings or Item objects)
+        contest_description: Description of what's being evaluated
+        agents: List of Agent objects with different evaluation criteria
+        competition_name: Optional name for the competition
+        n_comparisons_per_agent: Number of random pairwise comparisons per agent
+        random_seed: Optional seed for reproducible random sampling
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        checkpoint: Optional JSONL file (or Checkpoint) that every completed
+            comparison is appended to as soon as it lands
+        resume: Continue the contest logged in an existing checkpoint,
+            skipping the comparisons it already holds
+        sampler: Pair selection strategy. Defaults to RandomSampler, which
+            draws `n_comparisons_per_agent` uniformly random pairs per agent;
+            AdaptiveSampler spends the same budget on informative pairs
+        batch_size: Number of comparisons of an agent to judge per request.
+            Defaults to the sampler's batch size (1 for pairwise samplers,
+            one group for GroupSampler)
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        stopping: Optional StoppingRule ending the contest early once the
+            ranking has converged or a call, token or time cap is reached
+        ranker: Method turning the comparisons into scores: a Ranker, or
+            the name of one in `rankers.RANKERS`, e.g. "elo" or
+            "consensus:bradley-terry". Defaults to Bradley-Terry
+
+    Returns:
+        RankingResult with final rankings, scores, and all comparisons
+    """
+    checkpoint, random_seed = _open_checkpoint(checkpoint, resume, random_seed)
+    rng = random.Random(random_seed)
+
+    item_objects = _to_items(items)
 
     # Create Competition object
     competition = Competition(
@@ -56,56 +279,588 @@ def rank(
         f"and {len(agents)} agents"
     )
 
-    # Generate all possible pairs
-    all_pairs = []
-    for i in range(len(item_objects)):
-        for j in range(i + 1, len(item_objects)):
-            all_pairs.append((item_objects[i], item_objects[j]))
+    sampler = sampler or RandomSampler()
+    sampler.start(item_objects, agents, n_comparisons_per_agent, rng)
+    engine = ComparisonEngine(
+        max_concurrency,
+        max_concurrency_per_agent,
+        cache,
+        batch_size=batch_size or sampler.batch_size,
+        on_call=on_call,
+        retry=retry,
+    )
+
+    if checkpoint is not None:
+        checkpoint.start(
+            {
+                "competition_name": competition.name,
+                "n_items": len(item_objects),
+                "n_agents": len(agents),
+                "n_comparisons_per_agent": n_comparisons_per_agent,
+                "sampler": sampler.name,
+                "random_seed": random_seed,
+            }
+        )
+    item_names = [item.name for item in item_objects]
+    if stopping is not None:
+        stopping.start(item_names)
+    try:
+        all_comparisons, n_rounds = await _run_rounds(
+            engine, sampler, contest_description, checkpoint, stopping
+        )
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    logger.info(f"Collected {len(all_comparisons)} total comparisons")
+
+    scores, ranker_metadata = _solve(get_ranker(ranker), all_comparisons, item_names)
+
+    result = _ranking_result(
+        competition,
+        all_comparisons,
+        scores,
+        {
+            "n_agents": len(agents),
+            "n_comparisons_per_agent": n_comparisons_per_agent,
+            "total_comparisons": len(all_comparisons),
+            "random_seed": random_seed,
+            "sampler": sampler.name,
+            "n_rounds": n_rounds,
+            **ranker_metadata,
+            **sampler.metadata,
+            **(stopping.metadata if stopping is not None else {}),
+            **engine.metadata,
+        },
+    )
+
+    logger.info(f"Competition complete. Winner: {result.ranking[0]}")
+
+    return result
 
-    logger.debug(f"Total possible pairs: {len(all_pairs)}")
 
-    # Collect all comparisons
-    all_comparisons = []
+async def _run_rounds(
+    engine: ComparisonEngine,
+    sampler: Sampler,
+    contest_description: str,
+    checkpoint: Optional[Checkpoint] = None,
+    stopping: Optional[StoppingRule] = None,
+) -> Tuple[List[ComparisonResult], int]:
+    """Run the rounds a started sampler plans until it is done.
+
+    With a stopping rule, every planned round is further cut into the
+    rule's rounds, and the contest ends as soon as the rule says so.
 
-    for agent in agents:
-        # Sample random pairs for this agent
-        n_samples = min(n_comparisons_per_agent, len(all_pairs))
-        sampled_pairs = random.sample(all_pairs, n_samples)
+    Returns:
+        Every comparison in schedule order, and the number of rounds
+    """
+    all_comparisons: List[ComparisonResult] = []
+    n_rounds = 0
+    while schedule := sampler.next_round(all_comparisons):
+        chunks = [schedule]
+        if stopping is not None:
+            chunks = stopping.rounds(schedule, engine.batch_size)
+        for chunk in chunks:
+            if stopping is not None:
+                remaining = stopping.remaining_jobs(engine)
+                if remaining is not None:
+                    chunk = chunk[:remaining]
+            # Results come back in schedule order regardless of completion order
+            all_comparisons.extend(
+                await _run_schedule(
+                    engine,
+                    chunk,
+                    contest_description,
+                    checkpoint,
+                    offset=len(all_comparisons),
+                )
+            )
+            n_rounds += 1
+            if stopping is not None and stopping.update(all_comparisons, engine):
+                return all_comparisons, n_rounds
+    return all_comparisons, n_rounds
+
+
+def _ranking_result(
+    competition: Competition,
+    comparisons: List[ComparisonResult],
+    scores: Dict[str, float],
+    metadata: Dict[str, Any],
+) -> RankingResult:
+    """Assemble a RankingResult, adding the comparison graph connectivity."""
+    item_names = [item.name for item in competition.items]
+    return RankingResult(
+        competition=competition,
+        ranking=rank_items(scores),
+        scores=scores,
+        comparisons=comparisons,
+        metadata={
+            **metadata,
+            "n_graph_components": len(
+                comparison_graph_components(comparisons, item_names)
+            ),
+        },
+    )
 
-        logger.info(f"Agent {agent.agent_id} will perform {n_samples} comparisons")
 
-        # Perform comparisons
-        for item_a, item_b in sampled_pairs:
+def _solve(
+    ranker: Ranker, comparisons: Sequence[ComparisonResult], item_names: List[str]
+) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """Score a contest, run in a worker process by `rank_many`.
+
+    Returns:
+        The scores, and the ranker's name and details for the metadata
+    """
+    scores = ranker.fit(comparisons, item_names)
+    return scores, {"ranker": ranker.name, **ranker.metadata}
+
+
+def rank_many(
+    contests: List[Competition],
+    agents: List[Agent],
+    n_comparisons_per_agent: int = 10,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    sampler: Optional[Callable[[], Sampler]] = None,
+    batch_size: Optional[int] = None,
+    processes: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    stopping: Optional[StoppingRule] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> List[RankingResult]:
+    """Run several ranking contests over shared agents and workers.
+
+    This is a blocking wrapper around `rank_many_async`.
+
+    Args:
+        contests: Competitions to rank (name, description and items)
+        agents: Agents judging every contest
+        n_comparisons_per_agent: Number of pairwise comparisons per agent in
+            each contest
+        random_seed: Optional seed for reproducible sampling across contests
+        max_concurrency: Maximum number of comparisons in flight overall,
+            across all contests
+        max_concurrency_per_agent: Maximum number of comparisons in flight
+            per agent, across all contests
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        sampler: Optional factory returning a fresh Sampler for each
+            contest, RandomSampler by default
+        batch_size: Number of comparisons of an agent to judge per request,
+            the sampler's batch size by default
+        processes: Number of worker processes for the ranker solves.
+            None uses one per CPU and 0 solves in the calling process
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        stopping: Optional StoppingRule, applied to each contest on its
+            own. Its call, token and time caps count the whole batch
+        ranker: Method turning each contest's comparisons into scores, as
+            in `rank`. Defaults to Bradley-Terry
+
+    Returns:
+        One RankingResult per contest, in the same order as `contests`
+    """
+    return asyncio.run(
+        rank_many_async(
+            contests=contests,
+            agents=agents,
+            n_comparisons_per_agent=n_comparisons_per_agent,
+            random_seed=random_seed,
+            max_concurrency=max_concurrency,
+            max_concurrency_per_agent=max_concurrency_per_agent,
+            cache=cache,
+            sampler=sampler,
+            batch_size=batch_size,
+            processes=processes,
+            on_call=on_call,
+            retry=retry,
+            stopping=stopping,
+            ranker=ranker,
+        )
+    )
+
+
+async def rank_many_async(
+    contests: List[Competition],
+    agents: List[Agent],
+    n_comparisons_per_agent: int = 10,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    sampler: Optional[Callable[[], Sampler]] = None,
+    batch_size: Optional[int] = None,
+    processes: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    stopping: Optional[StoppingRule] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> List[RankingResult]:
+    """Run several ranking contests over shared agents and workers.
+
+    Every contest runs its rounds concurrently on one ComparisonEngine, so
+    all contests share the global and per-agent concurrency limits as well
+    as the per-model rate limiters. Free slots are handed to the contests in
+    turn, so a large contest doesn't starve the others. Each contest gets
+    its own seed, drawn from `random_seed` and recorded in its metadata, so
+    it can be reproduced on its own with `rank`. The ranker is solved in a
+    process pool as soon as a contest's comparisons are complete.
+
+    Args:
+        contests: Competitions to rank (name, description and items)
+        agents: Agents judging every contest
+        n_comparisons_per_agent: Number of pairwise comparisons per agent in
+            each contest
+        random_seed: Optional seed for reproducible sampling across contests
+        max_concurrency: Maximum number of comparisons in flight overall,
+            across all contests
+        max_concurrency_per_agent: Maximum number of comparisons in flight
+            per agent, across all contests
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        sampler: Optional factory returning a fresh Sampler for each
+            contest, RandomSampler by default
+        batch_size: Number of comparisons of an agent to judge per request,
+            the sampler's batch size by default
+        processes: Number of worker processes for the ranker solves.
+            None uses one per CPU and 0 solves in the calling process
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        stopping: Optional StoppingRule, applied to each contest on its
+            own. Its call, token and time caps count the whole batch
+        ranker: Method turning each contest's comparisons into scores, as
+            in `rank`. Defaults to Bradley-Terry
+
+    Returns:
+        One RankingResult per contest, in the same order as `contests`
+    """
+    if not contests:
+        return []
+
+    ranker = get_ranker(ranker)
+    seeds = random.Random(random_seed)
+    samplers = []
+    for competition in contests:
+        contest_sampler = sampler() if sampler is not None else RandomSampler()
+        contest_seed = seeds.randrange(2**32)
+        contest_sampler.start(
+            competition.items,
+            agents,
+            n_comparisons_per_agent,
+            random.Random(contest_seed),
+        )
+        contest_stopping = copy.deepcopy(stopping)
+        if contest_stopping is not None:
+            contest_stopping.start([item.name for item in competition.items])
+        samplers.append((contest_sampler, contest_seed, contest_stopping))
+
+    engine = ComparisonEngine(
+        max_concurrency,
+        max_concurrency_per_agent,
+        cache,
+        batch_size=batch_size or samplers[0][0].batch_size,
+        on_call=on_call,
+        retry=retry,
+    )
+    pool = ProcessPoolExecutor(processes) if processes != 0 else None
+    loop = asyncio.get_running_loop()
+
+    logger.info(f"Starting {len(contests)} competitions with {len(agents)} agents")
+
+    async def run_contest(index: int) -> RankingResult:
+        competition = contests[index]
+        contest_sampler, contest_seed, contest_stopping = samplers[index]
+        # Tasks spawned from here inherit the lane
+        current_lane.set(index)
+
+        comparisons, n_rounds = await _run_rounds(
+            engine, contest_sampler, competition.description, stopping=contest_stopping
+        )
+        item_names = [item.name for item in competition.items]
+        if pool is None:
+            scores, ranker_metadata = _solve(
+                copy.deepcopy(ranker), comparisons, item_names
+            )
+        else:
+            # Ship the outcomes as compact columns instead of pickled objects
+            outcomes = ComparisonLog.from_comparisons(
+                comparisons, item_names, keep_reasoning=False
+            )
+            scores, ranker_metadata = await loop.run_in_executor(
+                pool, _solve, ranker, outcomes, item_names
+            )
+
+        logger.info(f"Competition '{competition.name}' complete")
+        return _ranking_result(
+            competition,
+            comparisons,
+            scores,
+            {
+                "n_agents": len(agents),
+                "n_comparisons_per_agent": n_comparisons_per_agent,
+                "total_comparisons": len(comparisons),
+                "random_seed": contest_seed,
+                "sampler": contest_sampler.name,
+                "n_rounds": n_rounds,
+                **ranker_metadata,
+                **contest_sampler.metadata,
+                **(contest_stopping.metadata if contest_stopping else {}),
+            },
+        )
+
+    try:
+        results = list(
+            await asyncio.gather(*(run_contest(i) for i in range(len(contests))))
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Engine statistics cover the whole batch
+    for result in results:
+        result.metadata["n_contests"] = len(contests)
+        result.metadata.update(engine.metadata)
+    return results
+
+
+def _anchor_schedule(
+    new_items: List[Item],
+    ranked_items: List[Item],
+    agents: List[Agent],
+    n_comparisons_per_item: int,
+    rng: random.Random,
+) -> List[Job]:
+    """Pair each new item with anchors spread across the existing ranking.
+
+    The ranked items are split into `n_comparisons_per_item` equal strata
+    and one anchor is drawn from each, so every new item is compared against
+    strong, middling and weak items. When there are not enough ranked items,
+    the remaining opponents are other new items.
+    """
+    schedule: List[Job] = []
+    agent_offset = rng.randrange(len(agents))
+
+    for k, item in enumerate(new_items):
+        n_anchors = min(n_comparisons_per_item, len(ranked_items))
+        opponents = []
+        for s in range(n_anchors):
+            start = s * len(ranked_items) // n_anchors
+            stop = (s + 1) * len(ranked_items) // n_anchors
+            opponents.append(ranked_items[rng.randrange(start, stop)])
+
+        others = new_items[:k] + new_items[k + 1 :]
+        n_others = min(n_comparisons_per_item - n_anchors, len(others))
+        opponents.extend(rng.sample(others, n_others))
+
+        for opponent in opponents:
+            item_a, item_b = item, opponent
             # Randomly swap order to avoid position bias
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 item_a, item_b = item_b, item_a
 
-            comparison = agent.compare(item_a, item_b, contest_description)
-            all_comparisons.append(comparison)
+            agent = agents[(agent_offset + len(schedule)) % len(agents)]
+            schedule.append((agent, item_a, item_b))
 
-    logger.info(f"Collected {len(all_comparisons)} total comparisons")
+    return schedule
 
-    # Calculate Bradley-Terry scores
-    item_names = [item.name for item in item_objects]
-    scores = calculate_bradley_terry_scores(all_comparisons, item_names)
 
-    # Get final ranking
+def extend(
+    previous: RankingResult,
+    agents: List[Agent],
+    new_items: Optional[List[Union[str, Item]]] = None,
+    new_comparisons: Optional[List[ComparisonResult]] = None,
+    n_comparisons_per_item: int = 5,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    batch_size: int = 1,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> RankingResult:
+    """Extend an existing ranking with new items and/or comparisons.
+
+    This is a blocking wrapper around `extend_async`.
+
+    Args:
+        previous: Result of a previous `rank` or `extend` call
+        agents: Agents to judge the new comparisons
+        new_items: Items to add to the ranking (strings or Item objects)
+        new_comparisons: Already collected comparisons to merge in
+        n_comparisons_per_item: Number of comparisons to run for each new item
+        random_seed: Optional seed for reproducible anchor selection
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        batch_size: Number of comparisons of an agent to judge per request
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        ranker: Method turning the comparisons into scores, as in `rank`.
+            Defaults to the ranker of the previous result
+
+    Returns:
+        RankingResult covering the previous and the new items
+    """
+    return asyncio.run(
+        extend_async(
+            previous=previous,
+            agents=agents,
+            new_items=new_items,
+            new_comparisons=new_comparisons,
+            n_comparisons_per_item=n_comparisons_per_item,
+            random_seed=random_seed,
+            max_concurrency=max_concurrency,
+            max_concurrency_per_agent=max_concurrency_per_agent,
+            cache=cache,
+            batch_size=batch_size,
+            on_call=on_call,
+            retry=retry,
+            ranker=ranker,
+        )
+    )
+
+
+async def extend_async(
+    previous: RankingResult,
+    agents: List[Agent],
+    new_items: Optional[List[Union[str, Item]]] = None,
+    new_comparisons: Optional[List[ComparisonResult]] = None,
+    n_comparisons_per_item: int = 5,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    batch_size: int = 1,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> RankingResult:
+    """Extend an existing ranking with new items and/or comparisons.
+
+    Only pairs involving new items are scheduled: each new item is compared
+    against anchors spread across the previous ranking. The new comparisons
+    are merged with the previous ones and Bradley-Terry is warm-started from
+    the previous scores, so the cost scales with the size of the change.
+    Online rankers such as Elo resume from the state saved in the previous
+    result and only process the added comparisons.
+
+    Args:
+        previous: Result of a previous `rank` or `extend` call
+        agents: Agents to judge the new comparisons
+        new_items: Items to add to the ranking (strings or Item objects)
+        new_comparisons: Already collected comparisons to merge in
+        n_comparisons_per_item: Number of comparisons to run for each new item
+        random_seed: Optional seed for reproducible anchor selection
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        batch_size: Number of comparisons of an agent to judge per request
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        ranker: Method turning the comparisons into scores, as in `rank`.
+            Defaults to the ranker of the previous result
+
+    Returns:
+        RankingResult covering the previous and the new items
+    """
+    engine = ComparisonEngine(
+        max_concurrency,
+        max_concurrency_per_agent,
+        cache,
+        batch_size=batch_size,
+        on_call=on_call,
+        retry=retry,
+    )
+    rng = random.Random(random_seed)
+
+    competition = previous.competition
+    contest_description = competition.description
+
+    added_items = _to_items(new_items or [])
+    known_names = {item.name for item in competition.items}
+    duplicates = [item.name for item in added_items if item.name in known_names]
+    if duplicates:
+        raise ValueError(f"Items already in the ranking: {duplicates}")
+    if added_items and not agents:
+        raise ValueError("At least one agent is needed to compare new items")
+
+    logger.info(
+        f"Extending competition '{competition.name}' with {len(added_items)} new "
+        f"items and {len(new_comparisons or [])} new comparisons"
+    )
+
+    items_by_name = {item.name: item for item in competition.items}
+    ranked_items = [items_by_name[name] for name in previous.ranking]
+
+    schedule = []
+    if added_items:
+        schedule = _anchor_schedule(
+            added_items, ranked_items, agents, n_comparisons_per_item, rng
+        )
+    scheduled_comparisons = await engine.run(schedule, contest_description)
+
+    added_comparisons = list(new_comparisons or []) + scheduled_comparisons
+    all_comparisons = list(previous.comparisons) + added_comparisons
+
+    logger.info(
+        f"Collected {len(scheduled_comparisons)} new comparisons, "
+        f"{len(all_comparisons)} in total"
+    )
+
+    item_objects = list(competition.items) + added_items
+    item_names = [item.name for item in item_objects]
+    previous_ranker = previous.metadata.get("ranker", "bradley-terry")
+    ranker = get_ranker(ranker if ranker is not None else previous_ranker)
+    state = previous.metadata.get("ranker_state")
+    if ranker.name != previous_ranker:
+        scores, ranker_metadata = _solve(ranker, all_comparisons, item_names)
+    elif isinstance(ranker, OnlineRanker) and state is not None:
+        ranker.start(item_names, state)
+        for comparison in added_comparisons:
+            ranker.update(comparison)
+        scores, ranker_metadata = (
+            ranker.scores,
+            {"ranker": ranker.name, **ranker.metadata},
+        )
+    else:
+        scores = ranker.fit(all_comparisons, item_names, initial_scores=previous.scores)
+        ranker_metadata = {"ranker": ranker.name, **ranker.metadata}
     ranking = rank_items(scores)
 
-    # Create result
     result = RankingResult(
-        competition=competition,
+        competition=competition.model_copy(update={"items": item_objects}),
         ranking=ranking,
         scores=scores,
         comparisons=all_comparisons,
         metadata={
             "n_agents": len(agents),
-            "n_comparisons_per_agent": n_comparisons_per_agent,
+            "n_new_items": len(added_items),
+            "n_new_comparisons": len(added_comparisons),
+            "n_comparisons_per_item": n_comparisons_per_item,
             "total_comparisons": len(all_comparisons),
             "random_seed": random_seed,
+            "n_graph_components": len(
+                comparison_graph_components(all_comparisons, item_names)
+            ),
+            **ranker_metadata,
+            **engine.metadata,
         },
     )
 
-    logger.info(f"Competition complete. Winner: {ranking[0]}")
+    logger.info(f"Extension complete. Winner: {ranking[0]}")
 
     return result
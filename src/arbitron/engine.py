@@ -0,0 +1,454 @@
+"""Concurrent comparison engine."""
+
+import asyncio
+import contextvars
+import logging
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .agent import Agent, request_granted
+from .cache import ComparisonCache, comparison_key
+from .metrics import CallHook, CallRecord, MetricsCollector, percentile
+from .models import ComparisonResult, Item
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[Agent, Item, Item]
+R = TypeVar("R")
+
+# Number of recent request latencies per agent the hedge delay is taken from
+HEDGE_WINDOW = 200
+
+# Scheduling lane of the current task. Slots are handed out round-robin
+# across lanes, so contests sharing an engine interleave fairly.
+current_lane: contextvars.ContextVar[Hashable] = contextvars.ContextVar(
+    "arbitron_lane", default=None
+)
+
+
+class _FairSemaphore:
+    """Semaphore that hands free slots to waiting lanes in turn.
+
+    Waiters of the same lane are served in FIFO order, so with a single lane
+    it behaves like asyncio.Semaphore.
+    """
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: Dict[Hashable, Deque[asyncio.Future]] = {}
+        self._lanes: Deque[Hashable] = deque()
+
+    async def acquire(self) -> None:
+        if self._value > 0 and not self._lanes:
+            self._value -= 1
+            return
+
+        lane = current_lane.get()
+        future = asyncio.get_running_loop().create_future()
+        if lane not in self._waiters:
+            self._waiters[lane] = deque()
+            self._lanes.append(lane)
+        self._waiters[lane].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just before the cancellation is passed on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self._lanes:
+            lane = self._lanes.popleft()
+            waiters = self._waiters[lane]
+            future = waiters.popleft()
+            if waiters:
+                self._lanes.append(lane)
+            else:
+                del self._waiters[lane]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class ComparisonEngine:
+    """Runs comparisons concurrently under a global and a per-agent limit.
+
+    Cached comparisons are served without taking a slot. Agents wait for
+    their rate limiter inside `Agent.compare_async`. Failed requests are
+    retried, and slow ones optionally hedged, according to `retry`.
+
+    With `batch_size` above 1, consecutive jobs of the same agent are sent
+    `batch_size` at a time in a single request (`Agent.compare_batch_async`),
+    and a batch takes one slot.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        max_concurrency_per_agent: int = 4,
+        cache: Optional[ComparisonCache] = None,
+        batch_size: int = 1,
+        on_call: Optional[CallHook] = None,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        """Initialize the engine.
+
+        Args:
+            max_concurrency: Maximum number of comparisons in flight overall
+            max_concurrency_per_agent: Maximum number of comparisons in flight
+                per agent
+            cache: Optional ComparisonCache to read from and write to
+            batch_size: Number of comparisons of an agent to send per request
+            on_call: Optional callback receiving the CallRecord of every model
+                request
+            retry: Timeout, retry and hedging policy. Defaults to
+                RetryPolicy(): a 120 s timeout and 3 attempts, no hedging
+        """
+        if max_concurrency < 1 or max_concurrency_per_agent < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_agent = max_concurrency_per_agent
+        self.cache = cache
+        self.batch_size = batch_size
+        self.retry = retry or RetryPolicy()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batched_requests = 0
+        self.retries = 0
+        self.hedged_requests = 0
+        self.metrics = MetricsCollector([on_call] if on_call is not None else None)
+
+        # Recent successful request latencies per agent, for hedging
+        self._latencies: Dict[str, Deque[float]] = {}
+
+        self._global_semaphore = _FairSemaphore(max_concurrency)
+        self._agent_semaphores: Dict[int, _FairSemaphore] = {}
+
+    def _agent_semaphore(self, agent: Agent) -> _FairSemaphore:
+        semaphore = self._agent_semaphores.get(id(agent))
+        if semaphore is None:
+            semaphore = _FairSemaphore(self.max_concurrency_per_agent)
+            self._agent_semaphores[id(agent)] = semaphore
+        return semaphore
+
+    def _observe(self, record: CallRecord) -> None:
+        """Call hook feeding the metrics and the hedging latencies."""
+        if record.error is None:
+            latencies = self._latencies.setdefault(
+                record.agent_id, deque(maxlen=HEDGE_WINDOW)
+            )
+            latencies.append(record.request_seconds)
+        self.metrics.record(record)
+
+    def _hedge_delay(self, agent: Agent) -> Optional[float]:
+        """Seconds after which a request of this agent is hedged."""
+        if not self.retry.hedge:
+            return None
+        latencies = self._latencies.get(agent.agent_id, ())
+        if len(latencies) < self.retry.hedge_min_samples:
+            return None
+        return percentile(list(latencies), self.retry.hedge_percentile)
+
+    async def _hedged(self, agent: Agent, request: Callable[[], Awaitable[R]]) -> R:
+        """Await `request`, racing a duplicate once it runs past the hedge
+        delay, and return the first answer.
+
+        The delay is a percentile of request times, which exclude the wait
+        for the rate limiter, so it is counted from when the limiter lets
+        the request through.
+        """
+        delay = self._hedge_delay(agent)
+        if delay is None:
+            return await request()
+
+        granted = asyncio.Event()
+        token = request_granted.set(granted)
+        try:
+            # The task copies the context, and with it the event
+            first = asyncio.ensure_future(request())
+        finally:
+            request_granted.reset(token)
+
+        waiter = asyncio.ensure_future(granted.wait())
+        try:
+            await asyncio.wait({first, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if not first.done():
+                await asyncio.wait({first}, timeout=delay)
+        except BaseException:
+            first.cancel()
+            raise
+        finally:
+            waiter.cancel()
+        if first.done():
+            return first.result()
+
+        self.hedged_requests += 1
+        logger.debug(f"Hedging a request of agent {agent.agent_id} after {delay:.2f}s")
+        tasks = {first, asyncio.ensure_future(request())}
+        try:
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _call(self, agent: Agent, request: Callable[[], Awaitable[R]]) -> R:
+        """Run a request in the agent's slots, retrying failed attempts.
+
+        Slots are released while backing off, so other jobs can use them.
+        """
+        attempt = 1
+        while True:
+            try:
+                # Take the agent slot first so queued jobs don't hold global slots
+                async with self._agent_semaphore(agent):
+                    async with self._global_semaphore:
+                        return await self._hedged(agent, request)
+            except Exception as error:
+                if not self.retry.should_retry(error, attempt):
+                    raise
+                delay = self.retry.delay(error, attempt)
+                logger.warning(
+                    f"Agent {agent.agent_id} request failed ({type(error).__name__}: "
+                    f"{error}); retrying in {delay:.1f}s "
+                    f"(attempt {attempt + 1}/{self.retry.max_attempts})"
+                )
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def compare(
+        self, agent: Agent, item_a: Item, item_b: Item, contest_description: str
+    ) -> ComparisonResult:
+        """Run a single comparison, or serve it from the cache.
+
+        Args:
+            agent: Agent judging the pair
+            item_a: First item, as shown to the agent
+            item_b: Second item, as shown to the agent
+            contest_description: Description of what's being evaluated
+
+        Returns:
+            The agent's ComparisonResult
+        """
+        key = None
+        if self.cache is not None:
+            key = comparison_key(
+                agent.system_prompt,
+                agent.model_key,
+                contest_description,
+                item_a,
+                item_b,
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached.model_copy(update={"agent_id": agent.agent_id})
+            self.cache_misses += 1
+
+        comparison = await self._call(
+            agent,
+            lambda: agent.compare_async(
+                item_a, item_b, contest_description, self._observe, self.retry.timeout
+            ),
+        )
+
+        if self.cache is not None:
+            self.cache.put(key, comparison)
+        return comparison
+
+    async def compare_batch(
+        self, agent: Agent, pairs: List[Tuple[Item, Item]], contest_description: str
+    ) -> List[ComparisonResult]:
+        """Run several comparisons of one agent in a single request.
+
+        Cached pairs are served from the cache and only the rest are sent.
+
+        Args:
+            agent: Agent judging the pairs
+            pairs: (item_a, item_b) pairs, as shown to the agent
+            contest_description: Description of what's being evaluated
+
+        Returns:
+            The agent's ComparisonResults, in the same order as `pairs`
+        """
+        results: List[Optional[ComparisonResult]] = [None] * len(pairs)
+        keys: List[Optional[str]] = [None] * len(pairs)
+        pending = []
+        for index, (item_a, item_b) in enumerate(pairs):
+            if self.cache is not None:
+                keys[index] = comparison_key(
+                    agent.system_prompt,
+                    agent.model_key,
+                    contest_description,
+                    item_a,
+                    item_b,
+                )
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    self.cache_hits += 1
+                    results[index] = cached.model_copy(
+                        update={"agent_id": agent.agent_id}
+                    )
+                    continue
+                self.cache_misses += 1
+            pending.append(index)
+
+        if pending:
+            completed = await self._call(
+                agent,
+                lambda: agent.compare_batch_async(
+                    [pairs[index] for index in pending],
+                    contest_description,
+                    self._observe,
+                    self.retry.timeout,
+                ),
+            )
+            self.batched_requests += 1
+
+            for index, comparison in zip(pending, completed):
+                results[index] = comparison
+                if self.cache is not None:
+                    self.cache.put(keys[index], comparison)
+        return results  # type: ignore[return-value]
+
+    def _batches(self, jobs: List[Job]) -> List[List[int]]:
+        """Group job indices into per-agent batches of `batch_size`."""
+        if self.batch_size == 1:
+            return [[index] for index in range(len(jobs))]
+
+        by_agent: Dict[int, List[int]] = {}
+        for index, (agent, _, _) in enumerate(jobs):
+            by_agent.setdefault(id(agent), []).append(index)
+        return [
+            indices[start : start + self.batch_size]
+            for indices in by_agent.values()
+            for start in range(0, len(indices), self.batch_size)
+        ]
+
+    async def _run_batch(
+        self, jobs: List[Job], batch: List[int], contest_description: str
+    ) -> List[Tuple[int, ComparisonResult]]:
+        if len(batch) == 1:
+            agent, item_a, item_b = jobs[batch[0]]
+            comparison = await self.compare(agent, item_a, item_b, contest_description)
+            return [(batch[0], comparison)]
+
+        agent = jobs[batch[0]][0]
+        pairs = [(jobs[index][1], jobs[index][2]) for index in batch]
+        comparisons = await self.compare_batch(agent, pairs, contest_description)
+        return list(zip(batch, comparisons))
+
+    async def run(
+        self,
+        jobs: List[Job],
+        contest_description: str,
+        on_result: Optional[Callable[[int, ComparisonResult], None]] = None,
+    ) -> List[ComparisonResult]:
+        """Run a batch of comparisons concurrently.
+
+        Args:
+            jobs: (agent, item_a, item_b) tuples
+            contest_description: Description of what's being evaluated
+            on_result: Optional callback receiving the index of each job and
+                its ComparisonResult as soon as it completes
+
+        Returns:
+            ComparisonResults in the same order as `jobs`
+        """
+        results: List[Optional[ComparisonResult]] = [None] * len(jobs)
+
+        async def run_batch(batch: List[int]) -> None:
+            for index, comparison in await self._run_batch(
+                jobs, batch, contest_description
+            ):
+                results[index] = comparison
+                if on_result is not None:
+                    on_result(index, comparison)
+
+        await asyncio.gather(*(run_batch(batch) for batch in self._batches(jobs)))
+        return results  # type: ignore[return-value]
+
+    async def stream(
+        self, jobs: List[Job], contest_description: str
+    ) -> AsyncIterator[Tuple[int, ComparisonResult]]:
+        """Run comparisons concurrently and yield them as they complete.
+
+        Closing the iterator early cancels the comparisons still pending.
+
+        Args:
+            jobs: (agent, item_a, item_b) tuples
+            contest_description: Description of what's being evaluated
+
+        Yields:
+            (index of the job, ComparisonResult) in completion order
+        """
+        tasks = [
+            asyncio.ensure_future(self._run_batch(jobs, batch, contest_description))
+            for batch in self._batches(jobs)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for result in await next_done:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Engine statistics to record in RankingResult.metadata."""
+        metadata: Dict[str, Any] = {}
+        if self.metrics.n_calls:
+            metrics = self.metrics.summary()
+            metadata["token_usage"] = {
+                key: metrics[key]
+                for key in ("input_tokens", "output_tokens", "cached_tokens")
+            }
+            metadata["metrics"] = metrics
+        if self.retries:
+            metadata["retries"] = self.retries
+        if self.hedged_requests:
+            metadata["hedged_requests"] = self.hedged_requests
+        if self.batch_size > 1:
+            metadata["batch_size"] = self.batch_size
+            metadata["batched_requests"] = self.batched_requests
+        if self.cache is not None:
+            metadata["cache_hits"] = self.cache_hits
+            metadata["cache_misses"] = self.cache_misses
+        return metadata
@@ -0,0 +1,145 @@
+"""Per-call instrumentation of model requests."""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+PERCENTILES = (50, 95, 99)
+
+
+class CallRecord(BaseModel):
+    """Measurements of a single model request made by an agent."""
+
+    agent_id: str = Field(..., description="Agent that made the request")
+    model: str = Field(..., description="Model key the request was sent to")
+    task: str = Field(..., description='"pair", "batch" or "group"')
+    n_comparisons: int = Field(0, description="Comparisons the request produced")
+    wait_seconds: float = Field(0.0, description="Time waiting on the rate limiter")
+    request_seconds: float = Field(0.0, description="Time spent in the request")
+    input_tokens: int = Field(0, description="Prompt tokens")
+    output_tokens: int = Field(0, description="Completion tokens")
+    cached_tokens: int = Field(0, description="Prompt tokens served from cache")
+    retries: int = Field(0, description="Extra requests made for this call")
+    corrections: int = Field(
+        0, description="Item names fuzzily corrected in the answer"
+    )
+    error: Optional[str] = Field(None, description="Exception type, if it failed")
+
+
+CallHook = Callable[[CallRecord], None]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile of `values` (0 <= q <= 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class _Stats:
+    """Running totals and request latencies of one agent or model."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.totals = {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "corrections": 0,
+            "comparisons": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cached_tokens": 0,
+            "wait_seconds": 0.0,
+            "request_seconds": 0.0,
+        }
+
+    def add(self, record: CallRecord) -> None:
+        self.latencies.append(record.request_seconds)
+        totals = self.totals
+        totals["calls"] += 1
+        totals["errors"] += record.error is not None
+        totals["retries"] += record.retries
+        totals["corrections"] += record.corrections
+        totals["comparisons"] += record.n_comparisons
+        totals["input_tokens"] += record.input_tokens
+        totals["output_tokens"] += record.output_tokens
+        totals["cached_tokens"] += record.cached_tokens
+        totals["wait_seconds"] += record.wait_seconds
+        totals["request_seconds"] += record.request_seconds
+
+    def summary(self) -> Dict[str, Any]:
+        latency = {f"p{q}": percentile(self.latencies, q) for q in PERCENTILES}
+        latency["max"] = max(self.latencies, default=0.0)
+        return {**self.totals, "latency_seconds": latency}
+
+
+class MetricsCollector:
+    """Aggregates CallRecords per agent and per model.
+
+    Instances are callable, so a collector can be passed anywhere a call
+    hook is accepted.
+    """
+
+    def __init__(self, hooks: Optional[List[CallHook]] = None):
+        """Create an empty collector.
+
+        Args:
+            hooks: Optional callbacks to forward every record to
+        """
+        self.hooks = list(hooks or [])
+        self._lock = threading.Lock()
+        self._total = _Stats()
+        self._agents: Dict[str, _Stats] = {}
+        self._models: Dict[str, _Stats] = {}
+
+    def __call__(self, record: CallRecord) -> None:
+        self.record(record)
+
+    def record(self, record: CallRecord) -> None:
+        """Add a call and forward it to the hooks.
+
+        Args:
+            record: Measurements of the call
+        """
+        with self._lock:
+            self._total.add(record)
+            self._agents.setdefault(record.agent_id, _Stats()).add(record)
+            self._models.setdefault(record.model, _Stats()).add(record)
+        for hook in self.hooks:
+            hook(record)
+
+    @property
+    def n_calls(self) -> int:
+        """Number of calls recorded."""
+        return self._total.totals["calls"]
+
+    @property
+    def n_tokens(self) -> int:
+        """Prompt and completion tokens of all recorded calls."""
+        totals = self._total.totals
+        return totals["input_tokens"] + totals["output_tokens"]
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, plus a breakdown per agent and per model.
+
+        Each entry holds call, error, retry and correction counts, token
+        totals, time waiting on the rate limiter versus time in requests, and
+        request latency percentiles.
+        """
+        with self._lock:
+            return {
+                **self._total.summary(),
+                "agents": {
+                    agent_id: stats.summary()
+                    for agent_id, stats in self._agents.items()
+                },
+                "models": {
+                    model: stats.summary() for model, stats in self._models.items()
+                },
+            }
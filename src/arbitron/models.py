@@ -1,8 +1,66 @@
 """Pydantic models for Arbitron."""
 
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel, Field, model_validator
+import difflib
+import functools
+import logging
+import threading
+from typing import Annotated, Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field, PrivateAttr, ValidationInfo, model_validator
+from pydantic.json_schema import SkipJsonSchema
+from pydantic_core import core_schema
+
+logger = logging.getLogger(__name__)
+
+# Validation context for data arbitron wrote itself, e.g. caches and saved
+# results: the winner is known to be valid, so it is not checked or repaired
+TRUSTED = {"trusted": True}
+
+# Similarity a misspelled winner needs to be corrected to an item name
+WINNER_CUTOFF = 0.6
+
+
+class _PairMatcher:
+    """Fuzzy matcher of answers against the two items of a pair.
+
+    Gives the same result as difflib.get_close_matches(answer, [item_a,
+    item_b], n=1), but is built once per pair and remembers the answers it
+    has already matched, since agents tend to repeat the same misspelling.
+    """
+
+    def __init__(self, item_a: str, item_b: str):
+        self._names = (item_a, item_b)
+        self._matcher = difflib.SequenceMatcher()
+        self._matches: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def closest(self, answer: str) -> Optional[str]:
+        """The item name most similar to `answer`, if similar enough."""
+        with self._lock:
+            if answer in self._matches:
+                return self._matches[answer]
+            matcher = self._matcher
+            matcher.set_seq2(answer)
+            best = None
+            for name in self._names:
+                matcher.set_seq1(name)
+                if (
+                    matcher.real_quick_ratio() >= WINNER_CUTOFF
+                    and matcher.quick_ratio() >= WINNER_CUTOFF
+                ):
+                    ratio = matcher.ratio()
+                    if ratio >= WINNER_CUTOFF and (
+                        best is None or (ratio, name) > best
+                    ):
+                        best = (ratio, name)
+            match = best[1] if best is not None else None
+            self._matches[answer] = match
+        return match
+
+
+@functools.lru_cache(maxsize=4096)
+def _pair_matcher(item_a: str, item_b: str) -> _PairMatcher:
+    return _PairMatcher(item_a, item_b)
 
 
 class Item(BaseModel):
@@ -32,34 +90,108 @@ class ComparisonResult(BaseModel):
     agent_id: str = Field(
         ..., description="Identifier of the agent making the decision"
     )
+    # Filled in by the agent, so it is left out of the schema the LLM sees
+    backend: SkipJsonSchema[Optional[str]] = Field(
+        None, description="Backend of the agent that answered"
+    )
+
+    _corrected_from: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def corrected_from(self) -> Optional[str]:
+        """The winner as answered, if it was corrected to the closest item."""
+        return self._corrected_from
 
     @model_validator(mode="after")
-    def validate_winner(self) -> "ComparisonResult":
-        """Ensure winner is exactly one of the two items being compared."""
-        if self.winner not in [self.item_a, self.item_b]:
-            # Try to find the closest match
-            import difflib
-
-            possible_matches = [self.item_a, self.item_b]
-            closest_match = difflib.get_close_matches(
-                self.winner, possible_matches, n=1, cutoff=0.6
+    def validate_winner(self, info: ValidationInfo) -> "ComparisonResult":
+        """Ensure winner is exactly one of the two items being compared.
+
+        A winner that is not exactly one of the items, as LLMs sometimes
+        answer, is corrected to the closest item name. Validation with the
+        TRUSTED context skips the check.
+        """
+        if info.context and info.context.get("trusted"):
+            return self
+        if self.winner == self.item_a or self.winner == self.item_b:
+            return self
+
+        corrected_winner = _pair_matcher(self.item_a, self.item_b).closest(self.winner)
+        if corrected_winner is None:
+            raise ValueError(
+                f"Winner '{self.winner}' must be exactly one of: "
+                f"'{self.item_a}' or '{self.item_b}'"
             )
+        logger.warning(
+            f"Winner '{self.winner}' corrected to '{corrected_winner}' "
+            f"(closest match from [{self.item_a}, {self.item_b}])"
+        )
+        self._corrected_from = self.winner
+        self.winner = corrected_winner
+        return self
 
-            if closest_match:
-                corrected_winner = closest_match[0]
-                import logging
 
-                logging.warning(
-                    f"Winner '{self.winner}' corrected to '{corrected_winner}' "
-                    f"(closest match from [{self.item_a}, {self.item_b}])"
-                )
-                self.winner = corrected_winner
-            else:
-                raise ValueError(
-                    f"Winner '{self.winner}' must be exactly one of: "
-                    f"'{self.item_a}' or '{self.item_b}'"
+class GroupRanking(BaseModel):
+    """An agent's ranking of a group of items, judged in a single call."""
+
+    ranking: List[str] = Field(
+        ..., description="Names of all the items, from best to worst"
+    )
+    reasoning: str = Field(..., description="Agent's reasoning for the order")
+
+
+class BootstrapResult(BaseModel):
+    """Uncertainty of Bradley-Terry scores and ranks from a bootstrap."""
+
+    scores: Dict[str, float] = Field(
+        ..., description="Bradley-Terry point estimate for each item"
+    )
+    score_intervals: Dict[str, Tuple[float, float]] = Field(
+        ..., description="Percentile interval of each item's score"
+    )
+    rank_intervals: Dict[str, Tuple[int, int]] = Field(
+        ..., description="Percentile interval of each item's rank (1 is best)"
+    )
+    log_score_std: Dict[str, float] = Field(
+        ..., description="Standard deviation of each item's log-score"
+    )
+    n_replicates: int = Field(..., description="Number of bootstrap replicates")
+    confidence: float = Field(..., description="Coverage of the intervals")
+
+    def tied(self, item_a: str, item_b: str) -> bool:
+        """Whether the rank intervals of two items overlap."""
+        low_a, high_a = self.rank_intervals[item_a]
+        low_b, high_b = self.rank_intervals[item_b]
+        return low_a <= high_b and low_b <= high_a
+
+
+class _ComparisonsSchema:
+    """Schema of RankingResult.comparisons: a list of ComparisonResults, or
+    a ComparisonLog kept as it is. Both serialize as a list of comparisons.
+    ComparisonLog uses it as its own schema too.
+
+    store depends on this module, so ComparisonLog is only imported when a
+    value is validated.
+    """
+
+    def __get_pydantic_core_schema__(self, source: Any, handler: Any) -> Any:
+        comparisons = handler.generate_schema(List[ComparisonResult])
+
+        def validate(value: Any, validate_list: Any) -> Any:
+            from .store import ComparisonLog
+
+            if isinstance(value, ComparisonLog):
+                return value
+            return validate_list(value)
+
+        return core_schema.no_info_wrap_validator_function(
+            validate,
+            comparisons,
+            serialization=core_schema.wrap_serializer_function_ser_schema(
+                lambda value, serialize: serialize(
+                    value if isinstance(value, list) else list(value)
                 )
-        return self
+            ),
+        )
 
 
 class RankingResult(BaseModel):
@@ -68,11 +200,51 @@ class RankingResult(BaseModel):
     competition: Competition = Field(..., description="The competition that was run")
     ranking: List[str] = Field(..., description="Items in ranked order (best to worst)")
     scores: Dict[str, float] = Field(
-        ..., description="Bradley-Terry scores for each item"
+        ...,
+        description="Scores for each item, Bradley-Terry unless another ranker was used",
     )
-    comparisons: List[ComparisonResult] = Field(
-        ..., description="All pairwise comparisons made"
+    comparisons: Annotated[Sequence[ComparisonResult], _ComparisonsSchema()] = Field(
+        ...,
+        description="All pairwise comparisons made, as a list or a ComparisonLog",
     )
     metadata: Dict[str, Any] = Field(
         default_factory=dict, description="Additional metadata"
     )
+
+    def compact(self, keep_reasoning: bool = True) -> "RankingResult":
+        """Return a copy storing its comparisons in a ComparisonLog.
+
+        Args:
+            keep_reasoning: Whether to keep the agents' reasoning
+
+        Returns:
+            RankingResult whose comparisons are array-backed
+        """
+        from .store import ComparisonLog
+
+        log = ComparisonLog.from_comparisons(
+            self.comparisons,
+            [item.name for item in self.competition.items],
+            keep_reasoning=keep_reasoning,
+        )
+        return self.model_copy(update={"comparisons": log})
+
+    def bootstrap(self, **kwargs: Any) -> "BootstrapResult":
+        """Bootstrap the uncertainty of this result's scores and ranks.
+
+        The point estimate is this result's scores when they come from
+        Bradley-Terry, and a fresh Bradley-Terry solve otherwise.
+
+        Args:
+            **kwargs: Options of `arbitron.uncertainty.bootstrap`
+
+        Returns:
+            BootstrapResult with score and rank intervals
+        """
+        from .uncertainty import bootstrap
+
+        if self.metadata.get("ranker", "bradley-terry") == "bradley-terry":
+            kwargs.setdefault("scores", self.scores)
+        return bootstrap(
+            self.comparisons, [item.name for item in self.competition.items], **kwargs
+        )
@@ -0,0 +1,766 @@
+"""Ranking methods that turn pairwise comparisons into scores."""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .models import ComparisonResult
+from .ranking import (
+    MIN_RATIO,
+    _bradley_terry_batch,
+    _index_outcomes,
+    _Outcomes,
+    calculate_bradley_terry_scores,
+    rank_items,
+)
+from .store import ComparisonLog
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def _agent_groups(
+    comparisons: Sequence[ComparisonResult],
+) -> Tuple[List[str], List[int]]:
+    """Agent ids in order of appearance and the agent index of every comparison."""
+    if isinstance(comparisons, ComparisonLog):
+        if np is not None:
+            return list(comparisons.agents), comparisons.arrays()["agent"]
+        return list(comparisons.agents), list(comparisons._agent)
+
+    agent_ids: List[str] = []
+    index: Dict[str, int] = {}
+    agents = []
+    for comparison in comparisons:
+        k = index.get(comparison.agent_id)
+        if k is None:
+            k = index[comparison.agent_id] = len(agent_ids)
+            agent_ids.append(comparison.agent_id)
+        agents.append(k)
+    return agent_ids, agents
+
+
+def _judged_items(
+    comparisons: Sequence[ComparisonResult], items: List[str]
+) -> Dict[str, Set[str]]:
+    """Items each agent compared at least once, by agent id."""
+    agent_ids, agents = _agent_groups(comparisons)
+    winners, losers = _index_outcomes(
+        comparisons, {item: i for i, item in enumerate(items)}
+    )
+    if np is not None and isinstance(winners, np.ndarray):
+        agents, winners, losers = (
+            np.asarray(agents).tolist(),
+            winners.tolist(),
+            losers.tolist(),
+        )
+    judged: List[Set[int]] = [set() for _ in agent_ids]
+    for agent, winner, loser in zip(agents, winners, losers):
+        judged[agent].update((winner, loser))
+    return {
+        agent_id: {items[i] for i in indices}
+        for agent_id, indices in zip(agent_ids, judged)
+    }
+
+
+class Ranker(ABC):
+    """Turns pairwise comparisons into a score per item.
+
+    Higher scores are better. `fit` solves from scratch; rankers that can
+    also take comparisons one at a time derive from OnlineRanker.
+    """
+
+    # Whether scores are multiplicative (averaged in log space) or additive
+    log_scale = False
+
+    @abstractmethod
+    def fit(
+        self,
+        comparisons: Sequence[ComparisonResult],
+        items: List[str],
+        initial_scores: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        """Score items from their comparisons.
+
+        Args:
+            comparisons: Pairwise comparison results, as a list or a
+                ComparisonLog
+            items: List of all item names
+            initial_scores: Optional scores of a previous solve to start from,
+                used by iterative rankers
+
+        Returns:
+            Dictionary mapping item names to scores
+        """
+
+    def fit_per_agent(
+        self, comparisons: Sequence[ComparisonResult], items: List[str]
+    ) -> Dict[str, Dict[str, float]]:
+        """Score items separately from the comparisons of each agent.
+
+        Args:
+            comparisons: Pairwise comparison results
+            items: List of all item names
+
+        Returns:
+            Scores of every item, by agent id
+        """
+        agent_ids, agents = _agent_groups(comparisons)
+        groups: List[List[ComparisonResult]] = [[] for _ in agent_ids]
+        for agent, comparison in zip(agents, comparisons):
+            groups[agent].append(comparison)
+        return {
+            agent_id: self.fit(group, items)
+            for agent_id, group in zip(agent_ids, groups)
+        }
+
+    @property
+    def name(self) -> str:
+        """Name recorded in RankingResult.metadata."""
+        return type(self).__name__
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Extra details of the last fit to record in RankingResult.metadata."""
+        return {}
+
+
+class BradleyTerryRanker(Ranker):
+    """Bradley-Terry maximum likelihood, the default ranker."""
+
+    log_scale = True
+
+    def __init__(self, engine: str = "auto", prior: float = 0.0):
+        """Initialize the ranker.
+
+        Args:
+            engine: Solver of `calculate_bradley_terry_scores`
+            prior: Strength of the regularizing prior, as a number of virtual
+                wins and losses of every item against an average item
+        """
+        self.engine = engine
+        self.prior = prior
+
+    def fit(
+        self,
+        comparisons: Sequence[ComparisonResult],
+        items: List[str],
+        initial_scores: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        return calculate_bradley_terry_scores(
+            comparisons,
+            items,
+            engine=self.engine,
+            prior=self.prior,
+            initial_scores=initial_scores,
+        )
+
+    def fit_per_agent(
+        self, comparisons: Sequence[ComparisonResult], items: List[str]
+    ) -> Dict[str, Dict[str, float]]:
+        """Solve every agent's Bradley-Terry problem in one batch of arrays."""
+        if np is None or self.engine == "python" or not len(comparisons):
+            return super().fit_per_agent(comparisons, items)
+
+        n = len(items)
+        agent_ids, agents = _agent_groups(comparisons)
+        item_to_idx = {item: i for i, item in enumerate(items)}
+        winners, losers = _index_outcomes(comparisons, item_to_idx)
+        outcomes = _Outcomes(
+            np.asarray(winners, dtype=np.int64), np.asarray(losers, dtype=np.int64), n
+        )
+
+        # Each agent is a column of counts over the shared outcomes
+        n_agents = len(agent_ids)
+        counts = np.bincount(
+            outcomes.outcome_of_comparison * n_agents + np.asarray(agents),
+            minlength=len(outcomes.winner) * n_agents,
+        )
+        counts = counts.reshape(-1, n_agents).astype(float)
+        log_strengths = _bradley_terry_batch(
+            outcomes, counts, self.prior, np.zeros((n, n_agents))
+        )
+        strengths = np.exp(log_strengths)
+        return {
+            agent_id: {item: float(strengths[i, a]) for i, item in enumerate(items)}
+            for a, agent_id in enumerate(agent_ids)
+        }
+
+    @property
+    def name(self) -> str:
+        return "bradley-terry"
+
+
+class RankCentralityRanker(Ranker):
+    """Rank Centrality: the stationary distribution of a random walk.
+
+    The walk moves from an item to an opponent in proportion to how often
+    the opponent beat it, so mass accumulates on items that win. Pairs are
+    kept as an edge list and the stationary distribution is found by power
+    iteration, so each iteration is O(#pairs). Scores are normalized to a
+    mean of 1.
+    """
+
+    log_scale = True
+
+    def __init__(
+        self,
+        regularization: float = 1.0,
+        max_iterations: int = 10000,
+        tolerance: float = 1e-10,
+    ):
+        """Initialize the ranker.
+
+        Args:
+            regularization: Virtual wins added to both sides of every
+                compared pair, so an item that never won keeps some mass
+            max_iterations: Maximum number of power iterations
+            tolerance: Largest change of any item's mass at convergence
+        """
+        if regularization < 0:
+            raise ValueError("regularization must be non-negative")
+        self.regularization = regularization
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def _edges(self, comparisons, items):
+        """Per-pair rates of moving from the lower item to the higher one
+        and back, as (low, high, forward, backward) lists."""
+        n = len(items)
+        item_to_idx = {item: i for i, item in enumerate(items)}
+        winners, losers = _index_outcomes(comparisons, item_to_idx)
+
+        # Wins of the higher-indexed item and games, by pair
+        pairs: Dict[int, List[float]] = {}
+        for winner, loser in zip(winners, losers):
+            low, high = (winner, loser) if winner < loser else (loser, winner)
+            record = pairs.setdefault(int(low) * n + int(high), [0.0, 0.0])
+            record[0] += winner == high
+            record[1] += 1
+
+        degree = [0] * n
+        for key in pairs:
+            degree[key // n] += 1
+            degree[key % n] += 1
+        max_degree = max(degree, default=0) or 1
+
+        low, high, forward, backward = [], [], [], []
+        r = self.regularization
+        for key, (high_wins, games) in pairs.items():
+            low.append(key // n)
+            high.append(key % n)
+            forward.append((high_wins + r) / (games + 2 * r) / max_degree)
+            backward.append((games - high_wins + r) / (games + 2 * r) / max_degree)
+        return low, high, forward, backward
+
+    def _stationary(self, low, high, forward, backward, mass):
+        """Power iteration of the walk, from the distribution `mass`."""
+        n = len(mass)
+        if np is not None:
+            low, high = np.asarray(low, dtype=np.intp), np.asarray(high, dtype=np.intp)
+            forward, backward = np.asarray(forward), np.asarray(backward)
+            mass = np.asarray(mass, dtype=float)
+            for iteration in range(self.max_iterations):
+                flow = mass[low] * forward - mass[high] * backward
+                new = (
+                    mass
+                    - np.bincount(low, weights=flow, minlength=n)
+                    + np.bincount(high, weights=flow, minlength=n)
+                )
+                if np.abs(new - mass).max() < self.tolerance:
+                    mass = new
+                    logger.debug(
+                        f"Rank Centrality converged in {iteration + 1} iterations"
+                    )
+                    break
+                mass = new
+            return mass.tolist()
+
+        mass = list(mass)
+        for iteration in range(self.max_iterations):
+            new = mass[:]
+            for i, j, f, b in zip(low, high, forward, backward):
+                flow = mass[i] * f - mass[j] * b
+                new[i] -= flow
+                new[j] += flow
+            change = max(abs(x - y) for x, y in zip(new, mass))
+            mass = new
+            if change < self.tolerance:
+                logger.debug(f"Rank Centrality converged in {iteration + 1} iterations")
+                break
+        return mass
+
+    def fit(
+        self,
+        comparisons: Sequence[ComparisonResult],
+        items: List[str],
+        initial_scores: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        n = len(items)
+        mass = [1.0 / n] * n
+        if initial_scores is not None:
+            start = [max(initial_scores.get(item, 1.0), 0.0) for item in items]
+            total = sum(start)
+            if total > 0:
+                mass = [value / total for value in start]
+
+        mass = self._stationary(*self._edges(comparisons, items), mass)
+        return {item: float(mass[i] * n) for i, item in enumerate(items)}
+
+    @property
+    def name(self) -> str:
+        return "rank-centrality"
+
+
+class OnlineRanker(Ranker):
+    """Ranker updated in O(1) per comparison.
+
+    Streaming contests feed every comparison as it lands, and `extend`
+    resumes from the state stored in the previous result instead of
+    replaying the whole log. Scores depend on the order of the comparisons.
+    """
+
+    @abstractmethod
+    def start(
+        self, items: List[str], state: Optional[Dict[str, List[float]]] = None
+    ) -> None:
+        """Reset the ranker, optionally resuming from a saved state.
+
+        Args:
+            items: Names of the items being ranked
+            state: State of a previous run, as returned by `state`; items
+                missing from it start fresh
+        """
+
+    @abstractmethod
+    def add_items(self, items: List[str]) -> None:
+        """Start tracking new items."""
+
+    @abstractmethod
+    def update(self, comparison: ComparisonResult) -> None:
+        """Account for one comparison."""
+
+    @property
+    @abstractmethod
+    def scores(self) -> Dict[str, float]:
+        """Current score of every item."""
+
+    @property
+    @abstractmethod
+    def state(self) -> Dict[str, List[float]]:
+        """Per-item state, enough to resume the ranker later."""
+
+    def fit(
+        self,
+        comparisons: Sequence[ComparisonResult],
+        items: List[str],
+        initial_scores: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        self.start(items)
+        for comparison in comparisons:
+            self.update(comparison)
+        return self.scores
+
+    def fit_per_agent(
+        self, comparisons: Sequence[ComparisonResult], items: List[str]
+    ) -> Dict[str, Dict[str, float]]:
+        """Run one ranker per agent in a single pass over the comparisons."""
+        rankers: Dict[str, OnlineRanker] = {}
+        for comparison in comparisons:
+            ranker = rankers.get(comparison.agent_id)
+            if ranker is None:
+                ranker = rankers[comparison.agent_id] = type(self).__new__(type(self))
+                ranker.__dict__.update(self.__dict__)
+                ranker.start(items)
+            ranker.update(comparison)
+        return {agent_id: ranker.scores for agent_id, ranker in rankers.items()}
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {"ranker_state": self.state}
+
+
+def _loser(comparison: ComparisonResult) -> str:
+    """The item that did not win a comparison."""
+    if comparison.winner == comparison.item_a:
+        return comparison.item_b
+    return comparison.item_a
+
+
+class EloRanker(OnlineRanker):
+    """Elo ratings, updated after every comparison."""
+
+    def __init__(self, k: float = 32.0, initial: float = 1500.0, scale: float = 400.0):
+        """Initialize the ranker.
+
+        Args:
+            k: Maximum rating change per comparison
+            initial: Rating of a new item
+            scale: Rating difference at which the stronger item is expected
+                to win ten times as often
+        """
+        self.k = k
+        self.initial = initial
+        self.scale = scale
+        self.ratings: Dict[str, float] = {}
+
+    def start(
+        self, items: List[str], state: Optional[Dict[str, List[float]]] = None
+    ) -> None:
+        state = state or {}
+        self.ratings = {}
+        for item in items:
+            self.ratings[item] = state[item][0] if item in state else self.initial
+
+    def add_items(self, items: List[str]) -> None:
+        for item in items:
+            self.ratings.setdefault(item, self.initial)
+
+    def update(self, comparison: ComparisonResult) -> None:
+        winner, loser = comparison.winner, _loser(comparison)
+        difference = self.ratings[loser] - self.ratings[winner]
+        change = self.k * (1.0 - 1.0 / (1.0 + 10 ** (difference / self.scale)))
+        self.ratings[winner] += change
+        self.ratings[loser] -= change
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        return dict(self.ratings)
+
+    @property
+    def state(self) -> Dict[str, List[float]]:
+        return {item: [rating] for item, rating in self.ratings.items()}
+
+    @property
+    def name(self) -> str:
+        return "elo"
+
+
+# Glicko's conversion between rating points and the logistic scale
+_GLICKO_Q = math.log(10) / 400
+
+
+class GlickoRanker(OnlineRanker):
+    """Glicko ratings: Elo with a rating deviation per item.
+
+    Every comparison is treated as a rating period of its own. Items with a
+    large deviation, i.e. few comparisons so far, move more, and the
+    deviation shrinks as evidence accumulates, down to `min_deviation`.
+    """
+
+    def __init__(
+        self,
+        initial: float = 1500.0,
+        deviation: float = 350.0,
+        min_deviation: float = 30.0,
+    ):
+        """Initialize the ranker.
+
+        Args:
+            initial: Rating of a new item
+            deviation: Rating deviation of a new item
+            min_deviation: Lower bound of the deviation, which keeps ratings
+                responsive in long contests
+        """
+        self.initial = initial
+        self.deviation = deviation
+        self.min_deviation = min_deviation
+        self.ratings: Dict[str, List[float]] = {}
+
+    def start(
+        self, items: List[str], state: Optional[Dict[str, List[float]]] = None
+    ) -> None:
+        state = state or {}
+        self.ratings = {}
+        for item in items:
+            self.ratings[item] = (
+                list(state[item]) if item in state else [self.initial, self.deviation]
+            )
+
+    def add_items(self, items: List[str]) -> None:
+        for item in items:
+            self.ratings.setdefault(item, [self.initial, self.deviation])
+
+    @staticmethod
+    def _g(deviation: float) -> float:
+        return 1.0 / math.sqrt(1.0 + 3.0 * (_GLICKO_Q * deviation / math.pi) ** 2)
+
+    def _rate(self, player: List[float], opponent: List[float], score: float):
+        rating, deviation = player
+        g = self._g(opponent[1])
+        expected = 1.0 / (1.0 + 10 ** (-g * (rating - opponent[0]) / 400))
+        d_squared = 1.0 / (_GLICKO_Q**2 * g**2 * expected * (1.0 - expected))
+        precision = 1.0 / deviation**2 + 1.0 / d_squared
+        rating += _GLICKO_Q / precision * g * (score - expected)
+        return [rating, max(self.min_deviation, math.sqrt(1.0 / precision))]
+
+    def update(self, comparison: ComparisonResult) -> None:
+        winner, loser = comparison.winner, _loser(comparison)
+        winner_rating, loser_rating = self.ratings[winner], self.ratings[loser]
+        self.ratings[winner] = self._rate(winner_rating, loser_rating, 1.0)
+        self.ratings[loser] = self._rate(loser_rating, winner_rating, 0.0)
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        return {item: rating for item, (rating, _) in self.ratings.items()}
+
+    @property
+    def state(self) -> Dict[str, List[float]]:
+        return {item: list(rating) for item, rating in self.ratings.items()}
+
+    @property
+    def name(self) -> str:
+        return "glicko"
+
+
+def _normal_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+
+class TrueSkillRanker(OnlineRanker):
+    """TrueSkill-style Bayesian ratings for one-on-one comparisons.
+
+    Every item has a Gaussian belief (mu, sigma) about its skill. A
+    comparison is an observation that the winner performed better, and
+    both beliefs are updated with the moment-matched posterior. Scores are
+    mu, or mu - 3 sigma with `conservative`, which keeps items with little
+    evidence out of the top spots.
+    """
+
+    def __init__(
+        self,
+        mu: float = 25.0,
+        sigma: float = 25.0 / 3,
+        beta: float = 25.0 / 6,
+        tau: float = 25.0 / 300,
+        conservative: bool = False,
+    ):
+        """Initialize the ranker.
+
+        Args:
+            mu: Mean skill of a new item
+            sigma: Skill uncertainty of a new item
+            beta: Performance noise of a single comparison
+            tau: Uncertainty added before every comparison, so beliefs never
+                freeze completely
+            conservative: Score items by mu - 3 sigma instead of mu
+        """
+        self.mu = mu
+        self.sigma = sigma
+        self.beta = beta
+        self.tau = tau
+        self.conservative = conservative
+        self.ratings: Dict[str, List[float]] = {}
+
+    def start(
+        self, items: List[str], state: Optional[Dict[str, List[float]]] = None
+    ) -> None:
+        state = state or {}
+        self.ratings = {}
+        for item in items:
+            self.ratings[item] = (
+                list(state[item]) if item in state else [self.mu, self.sigma]
+            )
+
+    def add_items(self, items: List[str]) -> None:
+        for item in items:
+            self.ratings.setdefault(item, [self.mu, self.sigma])
+
+    def update(self, comparison: ComparisonResult) -> None:
+        winner, loser = (
+            self.ratings[comparison.winner],
+            self.ratings[_loser(comparison)],
+        )
+        winner_variance = winner[1] ** 2 + self.tau**2
+        loser_variance = loser[1] ** 2 + self.tau**2
+        c = math.sqrt(2 * self.beta**2 + winner_variance + loser_variance)
+
+        t = (winner[0] - loser[0]) / c
+        cdf = _normal_cdf(t)
+        # For very surprising outcomes the ratio tends to -t
+        v = _normal_pdf(t) / cdf if cdf > 1e-12 else -t
+        w = v * (v + t)
+
+        winner[0] += winner_variance / c * v
+        loser[0] -= loser_variance / c * v
+        winner[1] = math.sqrt(
+            winner_variance * max(1 - winner_variance / c**2 * w, 1e-6)
+        )
+        loser[1] = math.sqrt(loser_variance * max(1 - loser_variance / c**2 * w, 1e-6))
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        if self.conservative:
+            return {item: mu - 3 * sigma for item, (mu, sigma) in self.ratings.items()}
+        return {item: mu for item, (mu, _) in self.ratings.items()}
+
+    @property
+    def state(self) -> Dict[str, List[float]]:
+        return {item: list(rating) for item, rating in self.ratings.items()}
+
+    @property
+    def name(self) -> str:
+        return "trueskill"
+
+
+class ConsensusRanker(Ranker):
+    """Ranks with each agent's comparisons separately, then combines them.
+
+    Agents judging by different criteria can disagree systematically; a
+    joint solve lets the agent with the most comparisons dominate, while a
+    consensus gives every agent the same say. Per-agent solves of the base
+    ranker run in one pass: one batched solve for Bradley-Terry, one walk
+    over the log for online rankers.
+
+    Methods:
+        "mean": average of the agents' scores, in log space for
+            multiplicative scores (Bradley-Terry, Rank Centrality)
+        "borda": the number of items ranked below, averaged over agents
+
+    Each item is averaged over the agents that compared it, so an agent
+    that never saw an item does not pull it towards its default score.
+    """
+
+    METHODS = ("mean", "borda")
+
+    def __init__(self, ranker: Union[str, Ranker, None] = None, method: str = "mean"):
+        """Initialize the ranker.
+
+        Args:
+            ranker: Ranker run per agent, Bradley-Terry by default
+            method: How to combine the agents' scores, "mean" or "borda"
+        """
+        if method not in self.METHODS:
+            raise ValueError(
+                f"Unknown method '{method}', expected one of {self.METHODS}"
+            )
+        self.ranker = get_ranker(ranker)
+        self.method = method
+        self.agent_scores: Dict[str, Dict[str, float]] = {}
+
+    def fit(
+        self,
+        comparisons: Sequence[ComparisonResult],
+        items: List[str],
+        initial_scores: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, float]:
+        self.agent_scores = self.ranker.fit_per_agent(comparisons, items)
+        if not self.agent_scores:
+            return self.ranker.fit(comparisons, items)
+
+        judged = _judged_items(comparisons, items)
+        points = {
+            agent_id: self._points(scores, judged[agent_id], len(items))
+            for agent_id, scores in self.agent_scores.items()
+        }
+        combined = {}
+        everyone = None
+        for item in items:
+            values = [
+                agent_points[item]
+                for agent_points in points.values()
+                if item in agent_points
+            ]
+            if not values:
+                # No agent compared the item; average what all of them give it
+                if everyone is None:
+                    everyone = [
+                        self._points(scores, items, len(items))
+                        for scores in self.agent_scores.values()
+                    ]
+                values = [agent_points[item] for agent_points in everyone]
+            combined[item] = sum(values) / len(values)
+
+        if self.method == "mean" and self.ranker.log_scale:
+            return {item: math.exp(value) for item, value in combined.items()}
+        return combined
+
+    def _points(
+        self, scores: Dict[str, float], items: Iterable[str], n_items: int
+    ) -> Dict[str, float]:
+        """One agent's contribution to the average for each of `items`."""
+        if self.method == "borda":
+            # Positions among the items the agent judged, on the full scale
+            ranking = rank_items({item: scores[item] for item in items})
+            scale = (n_items - 1) / max(len(ranking) - 1, 1)
+            return {
+                item: (len(ranking) - 1 - position) * scale
+                for position, item in enumerate(ranking)
+            }
+        if self.ranker.log_scale:
+            return {item: math.log(max(scores[item], MIN_RATIO)) for item in items}
+        return {item: scores[item] for item in items}
+
+    @property
+    def name(self) -> str:
+        return f"consensus:{self.ranker.name}"
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {"consensus_method": self.method, "agent_scores": self.agent_scores}
+
+
+RANKERS: Dict[str, Callable[[], Ranker]] = {
+    "bradley-terry": BradleyTerryRanker,
+    "rank-centrality": RankCentralityRanker,
+    "elo": EloRanker,
+    "glicko": GlickoRanker,
+    "trueskill": TrueSkillRanker,
+    "consensus": ConsensusRanker,
+}
+
+
+def register_ranker(name: str, factory: Callable[[], Ranker]) -> None:
+    """Make a ranker available by name to `ranker=` arguments.
+
+    Args:
+        name: Name to register, e.g. "my-ranker"
+        factory: Callable returning a new Ranker
+    """
+    RANKERS[name] = factory
+
+
+def get_ranker(ranker: Union[str, Ranker, None] = None) -> Ranker:
+    """Resolve a `ranker=` argument.
+
+    Args:
+        ranker: A Ranker, the name of a registered one, "consensus:<name>"
+            for a per-agent consensus of a registered ranker, or None for
+            Bradley-Terry
+
+    Returns:
+        The Ranker to use
+    """
+    if ranker is None:
+        return BradleyTerryRanker()
+    if isinstance(ranker, Ranker):
+        return ranker
+
+    name, _, base = ranker.partition(":")
+    if name == "consensus" and base:
+        return ConsensusRanker(base)
+    if ranker not in RANKERS:
+        raise ValueError(
+            f"Unknown ranker '{ranker}', expected one of {sorted(RANKERS)}"
+        )
+    return RANKERS[ranker]()
@@ -2,44 +2,115 @@
 
 import logging
 import math
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .models import ComparisonResult
+from .store import ComparisonLog
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 logger = logging.getLogger(__name__)
 
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
 
-def calculate_bradley_terry_scores(
-    comparisons: List[ComparisonResult], items: List[str]
-) -> Dict[str, float]:
-    """Calculate Bradley-Terry scores from pairwise comparisons.
+# Bounds on the per-iteration strength ratio, to avoid extreme values
+MIN_RATIO = 1e-10
+MAX_RATIO = 1e10
 
-    The Bradley-Terry model estimates the "strength" of each item based on
-    win/loss records. Higher scores indicate stronger items.
+ENGINES = ("auto", "python", "numpy", "sparse")
+
+# Above this many items "auto" prefers the sparse engine over the dense one
+DENSE_MAX_ITEMS = 500
+
+
+def _index_outcomes(
+    comparisons: Sequence[ComparisonResult], item_to_idx: Dict[str, int]
+) -> Tuple[List[int], List[int]]:
+    """Translate comparisons into parallel winner/loser index lists.
+
+    A ComparisonLog is read column-wise, as NumPy arrays when available.
+    """
+    if isinstance(comparisons, ComparisonLog):
+        return comparisons.outcomes(item_to_idx)
+    winners = []
+    losers = []
+    for comp in comparisons:
+        if comp.winner == comp.item_a:
+            winners.append(item_to_idx[comp.item_a])
+            losers.append(item_to_idx[comp.item_b])
+        else:
+            winners.append(item_to_idx[comp.item_b])
+            losers.append(item_to_idx[comp.item_a])
+    return winners, losers
+
+
+def _connected_components(
+    winners: List[int], losers: List[int], n: int
+) -> List[List[int]]:
+    """Group item indices into connected components of the comparison graph."""
+    if np is not None and isinstance(winners, np.ndarray):
+        # Python ints are much faster to loop over than NumPy scalars
+        winners, losers = winners.tolist(), losers.tolist()
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for winner_idx, loser_idx in zip(winners, losers):
+        root_w, root_l = find(winner_idx), find(loser_idx)
+        if root_w != root_l:
+            parent[root_w] = root_l
+
+    components: Dict[int, List[int]] = {}
+    for i in range(n):
+        components.setdefault(find(i), []).append(i)
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def comparison_graph_components(
+    comparisons: Sequence[ComparisonResult], items: List[str]
+) -> List[List[str]]:
+    """Find the connected components of the comparison graph.
+
+    Bradley-Terry scores are only comparable within a component: with more
+    than one component, the relative strength of the groups is not
+    identifiable from the data.
 
     Args:
         comparisons: List of pairwise comparison results
         items: List of all item names
 
     Returns:
-        Dictionary mapping item names to Bradley-Terry scores
+        Lists of item names, one per component, largest first
     """
-    # Initialize win matrix
-    n = len(items)
     item_to_idx = {item: i for i, item in enumerate(items)}
+    winners, losers = _index_outcomes(comparisons, item_to_idx)
+    return [
+        [items[i] for i in component]
+        for component in _connected_components(winners, losers, len(items))
+    ]
+
 
+def _bradley_terry_python(
+    winners: List[int],
+    losers: List[int],
+    n: int,
+    prior: float = 0.0,
+    initial: Optional[List[float]] = None,
+) -> List[float]:
+    """Estimate log-strengths with a pure-Python dense iteration."""
     # Create win matrix as list of lists
     win_matrix = [[0.0 for _ in range(n)] for _ in range(n)]
 
     # Count wins for each pair
-    for comp in comparisons:
-        if comp.winner == comp.item_a:
-            winner_idx = item_to_idx[comp.item_a]
-            loser_idx = item_to_idx[comp.item_b]
-        else:
-            winner_idx = item_to_idx[comp.item_b]
-            loser_idx = item_to_idx[comp.item_a]
-
+    for winner_idx, loser_idx in zip(winners, losers):
         win_matrix[winner_idx][loser_idx] += 1
 
     # Calculate total games for each pair
@@ -48,13 +119,9 @@ def calculate_bradley_terry_scores(
     ]
 
     # Initialize Bradley-Terry parameters (log-scale for stability)
-    log_strengths = [0.0 for _ in range(n)]
+    log_strengths = list(initial) if initial is not None else [0.0 for _ in range(n)]
 
-    # Iterative algorithm to estimate strengths
-    max_iterations = 100
-    tolerance = 1e-6
-
-    for iteration in range(max_iterations):
+    for iteration in range(MAX_ITERATIONS):
         old_log_strengths = log_strengths[:]
 
         for i in range(n):
@@ -75,15 +142,21 @@ def calculate_bradley_terry_scores(
                     numerator += wins_i
                     denominator += total_ij * (strength_ratio / (1 + strength_ratio))
 
+            if prior > 0:
+                # Virtual win and loss against an average (log-strength 0) item
+                strength_ratio = math.exp(old_log_strengths[i])
+                numerator += prior
+                denominator += 2 * prior * (strength_ratio / (1 + strength_ratio))
+
             # Update log strength
             if denominator > 0 and numerator > 0:
                 ratio = numerator / denominator
                 # Clamp ratio to avoid extreme values
-                ratio = max(1e-10, min(ratio, 1e10))
+                ratio = max(MIN_RATIO, min(ratio, MAX_RATIO))
                 log_strengths[i] = math.log(ratio)
             elif denominator > 0:
                 # Handle case where numerator is 0 (item never won)
-                log_strengths[i] = math.log(1e-10)  # Very small value instead of 0
+                log_strengths[i] = math.log(MIN_RATIO)  # Very small value instead of 0
 
         # Normalize (set geometric mean to 1)
         mean_log_strength = sum(log_strengths) / n
@@ -91,10 +164,327 @@ def calculate_bradley_terry_scores(
 
         # Check convergence
         max_diff = max(abs(log_strengths[i] - old_log_strengths[i]) for i in range(n))
-        if max_diff < tolerance:
+        if max_diff < TOLERANCE:
+            logger.debug(f"Bradley-Terry converged in {iteration + 1} iterations")
+            break
+
+    return log_strengths
+
+
+def _win_probability(diff):
+    """P(i beats j) for log-strength differences, written with tanh so large
+    differences cannot overflow."""
+    return 0.5 * (1.0 + np.tanh(0.5 * diff))
+
+
+def _bradley_terry_numpy(
+    winners: List[int],
+    losers: List[int],
+    n: int,
+    prior: float = 0.0,
+    initial: Optional[List[float]] = None,
+) -> List[float]:
+    """Estimate log-strengths with the same iteration as dense NumPy arrays."""
+    win_matrix = np.zeros((n, n))
+    np.add.at(win_matrix, (np.asarray(winners, dtype=np.intp), losers), 1.0)
+    total_games = win_matrix + win_matrix.T
+
+    wins = win_matrix.sum(axis=1) + prior
+    played = (total_games.sum(axis=1) > 0) | (prior > 0)
+    won = played & (wins > 0)
+    never_won = played & ~won
+
+    log_strengths = np.zeros(n) if initial is None else np.array(initial, dtype=float)
+
+    for iteration in range(MAX_ITERATIONS):
+        old_log_strengths = log_strengths
+
+        diff = old_log_strengths[:, None] - old_log_strengths[None, :]
+        denominator = (total_games * _win_probability(diff)).sum(axis=1)
+        if prior > 0:
+            denominator += 2 * prior * _win_probability(old_log_strengths)
+
+        log_strengths = old_log_strengths.copy()
+        log_strengths[won] = np.log(
+            np.clip(wins[won] / denominator[won], MIN_RATIO, MAX_RATIO)
+        )
+        log_strengths[never_won] = math.log(MIN_RATIO)
+
+        # Normalize (set geometric mean to 1)
+        log_strengths -= log_strengths.mean()
+
+        # Check convergence
+        if np.abs(log_strengths - old_log_strengths).max() < TOLERANCE:
+            logger.debug(f"Bradley-Terry converged in {iteration + 1} iterations")
+            break
+
+    return log_strengths.tolist()
+
+
+def _bradley_terry_sparse(
+    winners: List[int],
+    losers: List[int],
+    n: int,
+    prior: float = 0.0,
+    initial: Optional[List[float]] = None,
+) -> List[float]:
+    """Estimate log-strengths iterating only over the observed pairs.
+
+    Outcomes are aggregated into an edge list with one entry per distinct
+    pair, so memory and time per iteration are O(#pairs) instead of O(n^2).
+    """
+    winners_arr = np.asarray(winners, dtype=np.int64)
+    losers_arr = np.asarray(losers, dtype=np.int64)
+
+    # One edge per unordered pair (low, high) with its number of games
+    low = np.minimum(winners_arr, losers_arr)
+    high = np.maximum(winners_arr, losers_arr)
+    pair_keys, games = np.unique(low * n + high, return_counts=True)
+    edge_low = pair_keys // n
+    edge_high = pair_keys % n
+    games = games.astype(float)
+
+    wins = np.bincount(winners_arr, minlength=n).astype(float) + prior
+    played = (np.bincount(np.concatenate([low, high]), minlength=n) > 0) | (prior > 0)
+    won = played & (wins > 0)
+    never_won = played & ~won
+
+    log_strengths = np.zeros(n) if initial is None else np.array(initial, dtype=float)
+
+    for iteration in range(MAX_ITERATIONS):
+        old_log_strengths = log_strengths
+
+        low_wins = _win_probability(
+            old_log_strengths[edge_low] - old_log_strengths[edge_high]
+        )
+        denominator = np.bincount(
+            edge_low, weights=games * low_wins, minlength=n
+        ) + np.bincount(edge_high, weights=games * (1.0 - low_wins), minlength=n)
+        if prior > 0:
+            denominator += 2 * prior * _win_probability(old_log_strengths)
+
+        log_strengths = old_log_strengths.copy()
+        log_strengths[won] = np.log(
+            np.clip(wins[won] / denominator[won], MIN_RATIO, MAX_RATIO)
+        )
+        log_strengths[never_won] = math.log(MIN_RATIO)
+
+        # Normalize (set geometric mean to 1)
+        log_strengths -= log_strengths.mean()
+
+        # Check convergence
+        if np.abs(log_strengths - old_log_strengths).max() < TOLERANCE:
             logger.debug(f"Bradley-Terry converged in {iteration + 1} iterations")
             break
 
+    return log_strengths.tolist()
+
+
+class _Outcomes:
+    """Distinct outcomes of a comparison log, and the pairs they belong to.
+
+    Edges are the distinct pairs, sorted by their lower item, with the
+    layout needed to sum per-edge values into per-item totals.
+    """
+
+    def __init__(self, winners, losers, n: int):
+        self.n = n
+        self.n_comparisons = len(winners)
+
+        keys, self.outcome_of_comparison, counts = np.unique(
+            winners * n + losers, return_inverse=True, return_counts=True
+        )
+        self.probabilities = counts / max(self.n_comparisons, 1)
+        self.winner = keys // n
+        loser = keys % n
+        pair_keys, self.edge = np.unique(
+            np.minimum(self.winner, loser) * n + np.maximum(self.winner, loser),
+            return_inverse=True,
+        )
+        self.low = pair_keys // n
+        self.high = pair_keys % n
+
+        # Outcomes are sorted by winner; grouping them by pair needs an order
+        self.winner_items, self.winner_starts = np.unique(
+            self.winner, return_index=True
+        )
+        self.edge_order = np.argsort(self.edge, kind="stable")
+        self.edge_starts = np.flatnonzero(
+            np.diff(self.edge[self.edge_order], prepend=-1)
+        )
+
+        self.low_items, self.low_starts = np.unique(self.low, return_index=True)
+        self.high_order = np.argsort(self.high, kind="stable")
+        self.high_items, self.high_starts = np.unique(
+            self.high[self.high_order], return_index=True
+        )
+
+    def item_sums(self, low_values, high_values):
+        """Sum per-edge rows into per-item rows, crediting each edge's
+        `low_values` to its lower item and `high_values` to its higher one."""
+        sums = np.zeros((self.n, low_values.shape[1]))
+        sums[self.low_items] = np.add.reduceat(low_values, self.low_starts, axis=0)
+        sums[self.high_items] += np.add.reduceat(
+            high_values[self.high_order], self.high_starts, axis=0
+        )
+        return sums
+
+
+def _center(log_strengths, played):
+    """Shift every column to a mean of 0 over its played items and set the
+    other items to 0."""
+    n_played = np.maximum(played.sum(axis=0), 1)
+    mean = np.where(played, log_strengths, 0.0).sum(axis=0) / n_played
+    return np.where(played, log_strengths - mean, 0.0)
+
+
+def _solve_batch(outcomes: _Outcomes, games, wins, played, never_won, prior, initial):
+    """Solve for the sparse engine's scores, one problem per column.
+
+    The engine replaces every log-strength by its update outright, which
+    overshoots and oscillates around the solution. Here each item moves
+    towards its update by 1 / (1 + d), where d is how strongly the update
+    reacts to the item's own strength (a Jacobi step). That has the same
+    fixed point but reaches it in a fraction of the iterations. Problems
+    drop out of the batch once they converge.
+
+    Items without a game in a problem have nothing to estimate from. They
+    are pinned at a log-strength of 0 and left out of the normalization,
+    so they do not drift with the other items.
+    """
+    low, high = outcomes.low, outcomes.high
+    won = played & ~never_won
+    log_strengths = _center(initial, played)
+    active = np.arange(initial.shape[1])
+    for _ in range(MAX_ITERATIONS):
+        old = log_strengths[:, active]
+        active_games = games[:, active]
+
+        low_wins = _win_probability(old[low] - old[high])
+        low_games = active_games * low_wins
+        expected = outcomes.item_sums(low_games, active_games - low_games)
+        variance = low_games * (1.0 - low_wins)
+        curvature = outcomes.item_sums(variance, variance)
+        if prior > 0:
+            prior_wins = _win_probability(old)
+            expected += 2 * prior * prior_wins
+            curvature += 2 * prior * prior_wins * (1.0 - prior_wins)
+
+        # The engine's update, normalized
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.clip(wins[:, active] / expected, MIN_RATIO, MAX_RATIO)
+            slope = np.where(expected > 0, curvature / expected, 0.0)
+        update = np.where(won[:, active], np.log(ratio), old)
+        update[never_won[:, active]] = math.log(MIN_RATIO)
+        update = _center(update, played[:, active])
+
+        new = _center(old + (update - old) / (1.0 + slope), played[:, active])
+        log_strengths[:, active] = new
+
+        active = active[np.abs(new - old).max(axis=0) >= TOLERANCE]
+        if not active.size:
+            break
+    return log_strengths
+
+
+def _bradley_terry_batch(outcomes: _Outcomes, counts, prior: float, initial):
+    """Solve Bradley-Terry for several weightings of the same outcomes.
+
+    Args:
+        outcomes: Distinct outcomes of a comparison log
+        counts: Outcomes x problems array with the number of times each
+            outcome occurs in each problem, e.g. per agent or per replicate
+        prior: Strength of the regularizing prior
+        initial: Items x problems array of log-strengths to start from
+
+    Returns:
+        Items x problems array of log-strengths
+    """
+    n_problems = counts.shape[1]
+    games = np.add.reduceat(counts[outcomes.edge_order], outcomes.edge_starts, axis=0)
+    wins = np.full((outcomes.n, n_problems), float(prior))
+    wins[outcomes.winner_items] += np.add.reduceat(
+        counts, outcomes.winner_starts, axis=0
+    )
+    played = (outcomes.item_sums(games, games) > 0) | (prior > 0)
+    never_won = played & (wins <= 0)
+    return _solve_batch(outcomes, games, wins, played, never_won, prior, initial)
+
+
+def calculate_bradley_terry_scores(
+    comparisons: Sequence[ComparisonResult],
+    items: List[str],
+    engine: str = "auto",
+    prior: float = 0.0,
+    initial_scores: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Calculate Bradley-Terry scores from pairwise comparisons.
+
+    The Bradley-Terry model estimates the "strength" of each item based on
+    win/loss records. Higher scores indicate stronger items.
+
+    Args:
+        comparisons: Pairwise comparison results, as a list or a
+            ComparisonLog
+        items: List of all item names
+        engine: Solver to use: "numpy" (dense, vectorized), "sparse" (edge
+            list of observed pairs, for large item sets), "python" (pure
+            Python), or "auto" to pick a NumPy engine when it is installed
+        prior: Strength of a regularizing prior, as a number of virtual wins
+            and losses of every item against an average item. Keeps items
+            that never won away from the minimum clamp and ties together
+            disconnected comparison graphs
+        initial_scores: Optional scores to warm-start from, e.g. those of a
+            previous run. Items without a score start at the average
+
+    Returns:
+        Dictionary mapping item names to Bradley-Terry scores
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+    if prior < 0:
+        raise ValueError("prior must be non-negative")
+
+    n = len(items)
+    if engine == "auto":
+        if np is None:
+            engine = "python"
+        else:
+            engine = "numpy" if n <= DENSE_MAX_ITEMS else "sparse"
+    if engine in ("numpy", "sparse") and np is None:
+        raise ImportError(f"The {engine} engine requires numpy: pip install numpy")
+
+    item_to_idx = {item: i for i, item in enumerate(items)}
+    winners, losers = _index_outcomes(comparisons, item_to_idx)
+
+    if prior == 0:
+        components = _connected_components(winners, losers, n)
+        if len(components) > 1:
+            sizes = [len(c) for c in components[:10]]
+            logger.warning(
+                f"Comparison graph has {len(components)} disconnected components "
+                f"(largest sizes {sizes}); scores are not comparable across "
+                f"components. Add comparisons or set a prior."
+            )
+
+    initial = None
+    if initial_scores is not None:
+        initial = [
+            math.log(initial_scores[item]) if initial_scores.get(item, 0) > 0 else 0.0
+            for item in items
+        ]
+        mean_initial = sum(initial) / n
+        initial = [ls - mean_initial for ls in initial]
+
+    if engine == "sparse":
+        log_strengths = _bradley_terry_sparse(winners, losers, n, prior, initial)
+    elif engine == "numpy":
+        log_strengths = _bradley_terry_numpy(winners, losers, n, prior, initial)
+    else:
+        if np is not None and isinstance(winners, np.ndarray):
+            winners, losers = winners.tolist(), losers.tolist()
+        log_strengths = _bradley_terry_python(winners, losers, n, prior, initial)
+
     # Convert to actual strengths
     strengths = [math.exp(ls) for ls in log_strengths]
 
@@ -115,3 +505,45 @@ def rank_items(scores: Dict[str, float]) -> List[str]:
         List of items in descending order of score
     """
     return sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
+
+
+def kendall_tau(ranking: Sequence[str], reference: Sequence[str]) -> float:
+    """Kendall rank correlation between two orderings of the same items.
+
+    Args:
+        ranking: Items from best to worst
+        reference: The same items in the reference order
+
+    Returns:
+        1.0 for identical orders, -1.0 for reversed ones
+    """
+    position = {name: k for k, name in enumerate(reference)}
+    ranks = [position[name] for name in ranking]
+    n = len(ranks)
+    if n < 2:
+        return 1.0
+
+    # Count discordant pairs by merge sort, O(n log n)
+    def sort_count(values: List[int]) -> Tuple[List[int], int]:
+        if len(values) < 2:
+            return values, 0
+        middle = len(values) // 2
+        left, left_count = sort_count(values[:middle])
+        right, right_count = sort_count(values[middle:])
+        merged, count = [], left_count + right_count
+        i = j = 0
+        while i < len(left) and j < len(right):
+            if left[i] <= right[j]:
+                merged.append(left[i])
+                i += 1
+            else:
+                merged.append(right[j])
+                count += len(left) - i
+                j += 1
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+        return merged, count
+
+    _, discordant = sort_count(ranks)
+    n_pairs = n * (n - 1) // 2
+    return 1.0 - 2.0 * discordant / n_pairs
@@ -0,0 +1,218 @@
+"""Token-bucket rate limiting shared across agents."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket limiting requests and tokens per minute.
+
+    Callers reserve capacity while holding a lock and wait outside it, so the
+    bucket may briefly go negative: every reservation pushes the next caller
+    further back instead of blocking other threads or the event loop. The
+    same limiter can be used from threads (`acquire`) and from asyncio
+    (`acquire_async`) at the same time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 15,
+        tokens_per_minute: Optional[float] = None,
+        burst: int = 1,
+    ):
+        """Initialize a rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate
+            tokens_per_minute: Optional sustained token rate
+            burst: Number of requests that can be sent back-to-back
+        """
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._request_level = float(burst)
+        self._token_level = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+
+        # Statistics
+        self.n_acquired = 0
+        self.n_waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add the capacity accrued since the last update."""
+        elapsed = now - self._updated
+        self._updated = now
+        self._request_level = min(
+            float(self.burst),
+            self._request_level + elapsed * self.requests_per_minute / 60,
+        )
+        if self.tokens_per_minute is not None:
+            self._token_level = min(
+                self.tokens_per_minute,
+                self._token_level + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens and return the wait time."""
+        with self._lock:
+            self._refill(time.monotonic())
+
+            self._request_level -= 1
+            wait = max(0.0, -self._request_level * 60 / self.requests_per_minute)
+
+            if self.tokens_per_minute is not None and tokens:
+                self._token_level -= tokens
+                wait = max(wait, -self._token_level * 60 / self.tokens_per_minute)
+
+            self.n_acquired += 1
+            if wait > 0:
+                self.n_waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+        return wait
+
+    def _refund(self, tokens: int) -> None:
+        """Return a reservation whose request was never sent."""
+        with self._lock:
+            self._request_level += 1
+            if self.tokens_per_minute is not None and tokens:
+                self._token_level += tokens
+            self.n_acquired -= 1
+
+    def estimate_wait(self, tokens: int = 0) -> float:
+        """Seconds a request acquired now would wait, without reserving it.
+
+        Args:
+            tokens: Estimated number of tokens the request would use
+
+        Returns:
+            Seconds the request would wait
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (1 - self._request_level) * 60 / self.requests_per_minute)
+            if self.tokens_per_minute is not None and tokens:
+                wait = max(
+                    wait,
+                    (tokens - self._token_level) * 60 / self.tokens_per_minute,
+                )
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block the current thread until a request may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f} seconds to maintain rate limit")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f} seconds to maintain rate limit")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # The request is never sent; give its slot to the next one
+                self._refund(tokens)
+                raise
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the token bucket once the real usage of a request is known.
+
+        Args:
+            estimated_tokens: Tokens reserved when the request was acquired
+            actual_tokens: Tokens the provider reported, if any
+        """
+        if self.tokens_per_minute is None or actual_tokens is None:
+            return
+        with self._lock:
+            self._token_level -= actual_tokens - estimated_tokens
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of how often and how long callers waited."""
+        with self._lock:
+            return {
+                "requests": self.n_acquired,
+                "requests_waited": self.n_waited,
+                "total_wait_seconds": self.total_wait,
+                "max_wait_seconds": self.max_wait,
+            }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    key: str,
+    requests_per_minute: float = 15,
+    tokens_per_minute: Optional[float] = None,
+    burst: int = 1,
+) -> RateLimiter:
+    """Return the shared limiter for a model or provider key.
+
+    The limiter is created with the given settings the first time a key is
+    seen; later calls return the same instance. Use `set_rate_limiter` to
+    replace the limiter for a key.
+
+    Args:
+        key: Model or provider identifier, e.g. "google-gla:gemini-2.0-flash-lite"
+        requests_per_minute: Sustained request rate for a new limiter
+        tokens_per_minute: Optional sustained token rate for a new limiter
+        burst: Burst size for a new limiter
+
+    Returns:
+        The RateLimiter shared by everything using this key
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute, burst)
+            _limiters[key] = limiter
+        return limiter
+
+
+def set_rate_limiter(key: str, limiter: RateLimiter) -> None:
+    """Register a limiter to be shared by everything using `key`.
+
+    Args:
+        key: Model or provider identifier
+        limiter: The limiter to share
+    """
+    with _limiters_lock:
+        _limiters[key] = limiter
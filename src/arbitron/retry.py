@@ -0,0 +1,151 @@
+"""Timeouts, retries with backoff, and hedging of model requests."""
+
+import email.utils
+import random
+import re
+import time
+from typing import Optional
+
+# HTTP statuses worth retrying besides 5xx
+RETRY_STATUSES = (408, 409, 425, 429)
+
+# Gemini sends the delay in the error body instead of a header
+_RETRY_DELAY = re.compile(r'"retryDelay"\s*:\s*"(\d+(?:\.\d+)?)s"')
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait before retrying, if it said.
+
+    Looks for a `Retry-After` header (in seconds or as an HTTP date) on the
+    error and the exceptions it was raised from, and for Gemini's
+    `retryDelay` in the error body.
+
+    Args:
+        error: Exception raised by a model request
+
+    Returns:
+        Seconds to wait, or None if the provider gave no hint
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+
+        response = getattr(current, "response", None)
+        headers = getattr(response, "headers", None) or getattr(
+            current, "headers", None
+        )
+        value = headers.get("retry-after") if headers is not None else None
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    date = email.utils.parsedate_to_datetime(value)
+                except (TypeError, ValueError):
+                    date = None
+                if date is not None:
+                    return max(0.0, date.timestamp() - time.time())
+
+        match = _RETRY_DELAY.search(str(getattr(current, "body", "") or ""))
+        if match:
+            return float(match.group(1))
+
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying.
+
+    Timeouts, connection problems, rate limiting, server errors and invalid
+    answers (such as a winner that matches neither item) are retried; other
+    client errors, like a bad API key, are not.
+    """
+    # Imported here so that importing arbitron doesn't load the HTTP stack
+    import httpx
+    from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
+
+    from .agent import InvalidAnswerError
+
+    if isinstance(error, ModelHTTPError):
+        return error.status_code in RETRY_STATUSES or error.status_code >= 500
+    return isinstance(
+        error,
+        (
+            TimeoutError,
+            ConnectionError,
+            httpx.TransportError,
+            UnexpectedModelBehavior,
+            InvalidAnswerError,
+        ),
+    )
+
+
+class RetryPolicy:
+    """How the engine times out, retries and hedges model requests.
+
+    Failed attempts are retried after an exponential backoff with full
+    jitter, or after the delay the provider asked for with a 429 if that is
+    longer. With hedging on, a request still running once it passes the
+    `hedge_percentile` latency of its agent gets a duplicate, and whichever
+    answer arrives first is used. A duplicate is a real request and counts
+    against the rate limit; for an agent with several backends it is
+    usually routed to another one.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = 120.0,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 20,
+    ):
+        """Initialize the policy.
+
+        Args:
+            timeout: Seconds a single request may take, or None for no limit.
+                Time spent waiting on the rate limiter doesn't count
+            max_attempts: Attempts per comparison, including the first
+            backoff: Base delay in seconds, doubled after every attempt
+            max_backoff: Upper bound of the backoff delay
+            hedge: Whether to send a duplicate of slow requests
+            hedge_percentile: Latency percentile of the agent after which a
+                request is hedged
+            hedge_min_samples: Completed requests of an agent needed before
+                its requests are hedged
+        """
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("backoff delays must not be negative")
+        if not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
+
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+        self._rng = random.Random()
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether to retry after `attempt` (1-based) failed with `error`."""
+        return attempt < self.max_attempts and is_retryable(error)
+
+    def delay(self, error: BaseException, attempt: int) -> float:
+        """Seconds to wait before the attempt after `attempt` (1-based)."""
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, ceiling)
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, requested)
+        return delay
@@ -0,0 +1,813 @@
+"""Pair selection strategies for ranking contests."""
+
+import logging
+import math
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .agent import Agent
+from .engine import Job
+from .models import ComparisonResult, Item
+from .ranking import calculate_bradley_terry_scores
+
+logger = logging.getLogger(__name__)
+
+
+class Sampler(ABC):
+    """Decides which pairs each agent compares.
+
+    A sampler plans a contest in rounds. `start` is called once before the
+    contest and `next_round` is called with every comparison collected so
+    far until it returns an empty list. Samplers must draw all randomness
+    from the `rng` they are given, so a seeded contest (and its checkpoint)
+    can be replayed.
+    """
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        """Prepare a new contest.
+
+        Args:
+            items: Items being ranked
+            agents: Agents available to judge
+            n_comparisons_per_agent: Comparison budget of each agent
+            rng: Random number generator to draw from
+        """
+        self.items = items
+        self.agents = agents
+        self.n_comparisons_per_agent = n_comparisons_per_agent
+        self.rng = rng
+
+    @abstractmethod
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        """Plan the next round of comparisons.
+
+        Args:
+            comparisons: Every comparison collected so far, in order
+
+        Returns:
+            (agent, item_a, item_b) jobs to run, or an empty list when done
+        """
+
+    @property
+    def name(self) -> str:
+        """Name recorded in RankingResult.metadata."""
+        return type(self).__name__
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Extra sampler details to record in RankingResult.metadata."""
+        return {}
+
+    @property
+    def batch_size(self) -> int:
+        """Consecutive jobs of an agent to send per request by default."""
+        return 1
+
+
+def _n_pairs(n: int) -> int:
+    """Number of unordered pairs of `n` items."""
+    return n * (n - 1) // 2
+
+
+def _decode_pair(k: int, n: int) -> Tuple[int, int]:
+    """Map an index in [0, n(n-1)/2) to the k-th pair (i, j), i < j.
+
+    Pairs are numbered in lexicographic order, (0, 1), (0, 2), ..., (1, 2),
+    ..., so sampling indices is equivalent to sampling from the full list of
+    pairs without building it.
+    """
+    # Count from the end, where row sizes are 1, 2, 3, ...
+    r = _n_pairs(n) - 1 - k
+    t = (math.isqrt(8 * r + 1) - 1) // 2
+    i = n - 2 - t
+    j = k - (_n_pairs(n) - _n_pairs(n - i)) + i + 1
+    return i, j
+
+
+class RandomSampler(Sampler):
+    """Uniformly random pairs for each agent, in a single round.
+
+    Pairs are drawn as random indices into the space of all n(n-1)/2 pairs
+    and decoded on the fly, so memory and setup time are O(samples) rather
+    than O(n^2).
+
+    Strategies:
+        "independent": each agent samples without replacement on its own
+            (the default). Different agents may judge the same pair.
+        "disjoint": pairs are sampled without replacement across all agents,
+            so no pair is judged twice until every pair has been judged.
+        "stratified": each agent's pairs come from random perfect matchings
+            of the items, so every item appears about equally often.
+    """
+
+    STRATEGIES = ("independent", "disjoint", "stratified")
+
+    def __init__(self, strategy: str = "independent"):
+        """Initialize the sampler.
+
+        Args:
+            strategy: One of "independent", "disjoint" or "stratified"
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy '{strategy}', expected one of {self.STRATEGIES}"
+            )
+        self.strategy = strategy
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        super().start(items, agents, n_comparisons_per_agent, rng)
+        self._done = False
+
+    def _disjoint_indices(self, n_samples: int) -> List[List[int]]:
+        """Pair indices per agent, without replacement across agents."""
+        total_pairs = _n_pairs(len(self.items))
+        needed = n_samples * len(self.agents)
+        indices: List[int] = []
+        while len(indices) < needed:
+            indices.extend(
+                self.rng.sample(range(total_pairs), min(total_pairs, needed))
+            )
+        return [
+            indices[a * n_samples : (a + 1) * n_samples]
+            for a in range(len(self.agents))
+        ]
+
+    def _stratified_pairs(self, n_samples: int) -> List[Tuple[int, int]]:
+        """Distinct pairs taken from successive random perfect matchings."""
+        n = len(self.items)
+        if n_samples > _n_pairs(n) // 2:
+            # Dense enough that plain sampling already covers items evenly
+            return [
+                _decode_pair(k, n)
+                for k in self.rng.sample(range(_n_pairs(n)), n_samples)
+            ]
+
+        pairs: List[Tuple[int, int]] = []
+        seen = set()
+        order = list(range(n))
+        while len(pairs) < n_samples:
+            self.rng.shuffle(order)
+            for k in range(0, n - 1, 2):
+                pair = (min(order[k], order[k + 1]), max(order[k], order[k + 1]))
+                if pair not in seen:
+                    seen.add(pair)
+                    pairs.append(pair)
+                    if len(pairs) == n_samples:
+                        break
+        return pairs
+
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        if self._done:
+            return []
+        self._done = True
+
+        n = len(self.items)
+        total_pairs = _n_pairs(n)
+        logger.debug(f"Total possible pairs: {total_pairs}")
+
+        n_samples = min(self.n_comparisons_per_agent, total_pairs)
+        if self.strategy == "disjoint":
+            disjoint = self._disjoint_indices(n_samples)
+
+        schedule: List[Job] = []
+
+        for a, agent in enumerate(self.agents):
+            # Sample random pairs for this agent
+            if self.strategy == "stratified":
+                sampled_pairs = self._stratified_pairs(n_samples)
+            else:
+                if self.strategy == "disjoint":
+                    indices = disjoint[a]
+                else:
+                    indices = self.rng.sample(range(total_pairs), n_samples)
+                sampled_pairs = [_decode_pair(k, n) for k in indices]
+
+            logger.info(f"Agent {agent.agent_id} will perform {n_samples} comparisons")
+
+            for i, j in sampled_pairs:
+                item_a, item_b = self.items[i], self.items[j]
+                # Randomly swap order to avoid position bias
+                if self.rng.random() < 0.5:
+                    item_a, item_b = item_b, item_a
+
+                schedule.append((agent, item_a, item_b))
+
+        return schedule
+
+    @property
+    def name(self) -> str:
+        if self.strategy == "independent":
+            return "RandomSampler"
+        return f"RandomSampler({self.strategy})"
+
+
+class BalancedSampler(Sampler):
+    """A budgeted design planned up front, in a single round.
+
+    The total budget, `n_comparisons_per_agent` times the number of agents,
+    is split into distinct pairs each judged by `judges_per_pair` different
+    agents. The pairs are mostly the edges of a union of random Hamiltonian
+    cycles over the items, topped up with pairs of the least covered items:
+    every item appears in about the same number of pairs, the first cycle
+    keeps the comparison graph connected, and a union of random cycles is an
+    expander with high probability, so scores are well determined for the
+    budget. Pairs are dealt round-robin over the agents,
+    which keeps their loads equal, and oriented so every item is shown as
+    option A about as often as option B, with the judges of a pair seeing
+    it in alternating order.
+    """
+
+    def __init__(self, judges_per_pair: int = 1):
+        """Initialize the sampler.
+
+        Args:
+            judges_per_pair: Number of distinct agents judging each pair
+        """
+        if judges_per_pair < 1:
+            raise ValueError("judges_per_pair must be at least 1")
+        self.judges_per_pair = judges_per_pair
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        super().start(items, agents, n_comparisons_per_agent, rng)
+        self._done = False
+        self._judges = min(self.judges_per_pair, len(agents))
+        if self._judges < self.judges_per_pair:
+            logger.warning(
+                f"Only {len(agents)} agents for {self.judges_per_pair} judges "
+                f"per pair; each pair gets {self._judges}"
+            )
+        self._degrees: List[int] = []
+
+    def _sparse_pairs(self, n_pairs: int) -> List[Tuple[int, int]]:
+        """At most half of all pairs, spread evenly over the items.
+
+        As many random Hamiltonian cycles as fit are laid down (or a
+        Hamiltonian path, to connect the items on a small budget), and the
+        rest goes to pairs of the items with the fewest pairs so far, which
+        also makes up for cycle edges that were already taken.
+        """
+        n = len(self.items)
+        pairs: List[Tuple[int, int]] = []
+        seen: Set[Tuple[int, int]] = set()
+        degree = [0] * n
+
+        def add(i: int, j: int) -> bool:
+            pair = (min(i, j), max(i, j))
+            if i == j or pair in seen:
+                return False
+            seen.add(pair)
+            pairs.append(pair)
+            degree[i] += 1
+            degree[j] += 1
+            return True
+
+        order = list(range(n))
+        for _ in range(n_pairs // n):
+            self.rng.shuffle(order)
+            for k in range(n):
+                add(order[k], order[(k + 1) % n])
+        if not pairs and n_pairs >= n - 1:
+            self.rng.shuffle(order)
+            for k in range(n - 1):
+                add(order[k], order[k + 1])
+
+        # Pairs per item if they were spread perfectly
+        target = math.ceil(2 * n_pairs / n)
+        while len(pairs) < n_pairs:
+            # Match up the items with the fewest pairs, lowest first
+            order.sort(key=lambda i: (degree[i], self.rng.random()))
+            matched: Set[int] = set()
+            added = False
+            for x, i in enumerate(order):
+                if i in matched or degree[i] >= target:
+                    continue
+                for y in range(x + 1, n):
+                    j = order[y]
+                    if j not in matched and degree[j] < target and add(i, j):
+                        matched.update((i, j))
+                        added = True
+                        break
+                if len(pairs) == n_pairs:
+                    break
+            if not added:
+                break
+        while len(pairs) < n_pairs:
+            add(*self.rng.sample(range(n), 2))
+        return pairs
+
+    def _pairs(self, n_pairs: int) -> List[Tuple[int, int]]:
+        """`n_pairs` distinct pairs, spread evenly over the items."""
+        n = len(self.items)
+        if n_pairs <= _n_pairs(n) // 2:
+            return self._sparse_pairs(n_pairs)
+        # Dense design: every pair except an even sparse set of them
+        excluded = set(self._sparse_pairs(_n_pairs(n) - n_pairs))
+        return [
+            (i, j) for i in range(n) for j in range(i + 1, n) if (i, j) not in excluded
+        ]
+
+    def _orient(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Order each pair so items are shown first about half the time.
+
+        Judges of a pair see it in alternating order, so only a pair with an
+        odd number of judges shifts how often its items are shown first.
+        """
+        balance = [0] * len(self.items)
+        oriented = []
+        for i, j in pairs:
+            if balance[i] > balance[j] or (
+                balance[i] == balance[j] and self.rng.random() < 0.5
+            ):
+                i, j = j, i
+            if self._judges % 2:
+                balance[i] += 1
+                balance[j] -= 1
+            oriented.append((i, j))
+        return oriented
+
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        n = len(self.items)
+        if self._done or n < 2 or not self.agents:
+            return []
+        self._done = True
+
+        budget = self.n_comparisons_per_agent * len(self.agents)
+        n_pairs = min(budget // self._judges, _n_pairs(n))
+        if n_pairs < n - 1:
+            logger.warning(
+                f"{n_pairs} pairs cannot connect {n} items; scores of "
+                f"different components will not be comparable"
+            )
+
+        pairs = self._pairs(n_pairs)
+        self.rng.shuffle(pairs)
+        pairs = self._orient(pairs)
+
+        self._degrees = [0] * n
+        for i, j in pairs:
+            self._degrees[i] += 1
+            self._degrees[j] += 1
+
+        schedule: List[Job] = []
+        next_agent = 0
+        for i, j in pairs:
+            for judge in range(self._judges):
+                agent = self.agents[next_agent]
+                next_agent = (next_agent + 1) % len(self.agents)
+                # Alternate the order between the judges of a pair
+                if judge % 2 == 0:
+                    schedule.append((agent, self.items[i], self.items[j]))
+                else:
+                    schedule.append((agent, self.items[j], self.items[i]))
+
+        logger.info(
+            f"Balanced design: {len(pairs)} pairs x {self._judges} judges, "
+            f"{min(self._degrees)}-{max(self._degrees)} pairs per item"
+        )
+        return schedule
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Size and coverage of the design."""
+        return {
+            "judges_per_pair": self._judges,
+            "n_pairs": sum(self._degrees) // 2,
+            "pairs_per_item": [
+                min(self._degrees, default=0),
+                max(self._degrees, default=0),
+            ],
+        }
+
+
+class GroupSampler(Sampler):
+    """Random groups of items, each ranked by an agent in a single call.
+
+    Each agent gets enough groups of `group_size` items to cover
+    `n_comparisons_per_agent` pairs. The groups of an agent are cut from
+    random permutations of the items, so items appear about equally often.
+    Every group is emitted as all of its pairs in a row and `batch_size`
+    matches the number of pairs per group, so the engine sends each group
+    as one k-way ranking request.
+    """
+
+    def __init__(self, group_size: int = 4):
+        """Initialize the sampler.
+
+        Args:
+            group_size: Number of items ranked per call (at least 3)
+        """
+        if group_size < 3:
+            raise ValueError("group_size must be at least 3")
+        self.group_size = group_size
+        self._k = group_size
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        super().start(items, agents, n_comparisons_per_agent, rng)
+        self._k = min(self.group_size, len(items))
+        self._done = False
+
+    def _groups(self, n_groups: int) -> List[List[Item]]:
+        groups: List[List[Item]] = []
+        order = list(self.items)
+        while len(groups) < n_groups:
+            self.rng.shuffle(order)
+            for start in range(0, len(order) - self._k + 1, self._k):
+                groups.append(order[start : start + self._k])
+                if len(groups) == n_groups:
+                    break
+        return groups
+
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        if self._done or self._k < 2:
+            return []
+        self._done = True
+
+        pairs_per_group = _n_pairs(self._k)
+        n_groups = -(-self.n_comparisons_per_agent // pairs_per_group)
+
+        schedule: List[Job] = []
+        for agent in self.agents:
+            logger.info(
+                f"Agent {agent.agent_id} will rank {n_groups} groups of {self._k}"
+            )
+            for group in self._groups(n_groups):
+                for i in range(self._k):
+                    for j in range(i + 1, self._k):
+                        schedule.append((agent, group[i], group[j]))
+        return schedule
+
+    @property
+    def batch_size(self) -> int:
+        return _n_pairs(self._k)
+
+
+def _sigmoid(x: float) -> float:
+    return 0.5 * (1.0 + math.tanh(0.5 * x))
+
+
+class AdaptiveSampler(Sampler):
+    """Active pair selection from the current Bradley-Terry estimates.
+
+    The first round compares every item along a random cycle so that all
+    items are connected. Each later round re-estimates the scores (with a
+    small prior, warm-started from the previous round) and their variance
+    from the Fisher information, then picks the pairs with the highest
+    expected information: p(1 - p) * (var_i + var_j), discounted by how often
+    the pair was already judged. Candidates are each item's neighbours in
+    the current ranking plus a few random opponents, so planning a round
+    costs O(n * window) rather than O(n^2). Pairs whose outcome is already
+    near-certain are skipped, which is where the savings come from.
+
+    The total budget is the same as for random sampling:
+    `n_comparisons_per_agent` per agent.
+    """
+
+    def __init__(
+        self,
+        n_rounds: int = 10,
+        round_size: Optional[int] = None,
+        window: int = 3,
+        n_random_candidates: int = 2,
+        prior: float = 0.5,
+    ):
+        """Initialize the sampler.
+
+        Args:
+            n_rounds: Number of rounds to split the budget into, when
+                `round_size` is not given
+            round_size: Number of comparisons per round
+            window: Number of ranking neighbours on each side considered as
+                opponents for every item
+            n_random_candidates: Number of random opponents considered for
+                every item, so the estimates can recover from early mistakes
+            prior: Prior strength used for the interim estimates
+        """
+        if n_rounds < 1:
+            raise ValueError("n_rounds must be at least 1")
+        self.n_rounds = n_rounds
+        self.round_size = round_size
+        self.window = window
+        self.n_random_candidates = n_random_candidates
+        self.prior = prior
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        super().start(items, agents, n_comparisons_per_agent, rng)
+        self._remaining = {id(agent): n_comparisons_per_agent for agent in agents}
+        self._total = n_comparisons_per_agent * len(agents)
+        self._round_size = self.round_size or max(
+            len(agents), math.ceil(self._total / self.n_rounds)
+        )
+        self._scores: Optional[Dict[str, float]] = None
+        self._round = 0
+
+    def _assign(self, pairs: List[Tuple[Item, Item]]) -> List[Job]:
+        """Give each pair to the agent with the most budget left."""
+        jobs: List[Job] = []
+        for item_a, item_b in pairs:
+            agent = max(self.agents, key=lambda a: self._remaining[id(a)])
+            if self._remaining[id(agent)] <= 0:
+                break
+            self._remaining[id(agent)] -= 1
+
+            # Randomly swap order to avoid position bias
+            if self.rng.random() < 0.5:
+                item_a, item_b = item_b, item_a
+            jobs.append((agent, item_a, item_b))
+        return jobs
+
+    def _warmup_pairs(self, size: int) -> List[Tuple[Item, Item]]:
+        """Pairs along a random cycle through all items."""
+        order = list(self.items)
+        self.rng.shuffle(order)
+        n = len(order)
+        if n < 2:
+            return []
+        n_pairs = n if n > 2 else 1
+        return [(order[k], order[(k + 1) % n]) for k in range(min(size, n_pairs))]
+
+    def _informative_pairs(
+        self, comparisons: List[ComparisonResult], size: int
+    ) -> List[Tuple[Item, Item]]:
+        """Pairs with the highest expected information under current scores."""
+        names = [item.name for item in self.items]
+        index = {name: i for i, name in enumerate(names)}
+
+        self._scores = calculate_bradley_terry_scores(
+            comparisons, names, prior=self.prior, initial_scores=self._scores
+        )
+        log_scores = [math.log(self._scores[name]) for name in names]
+
+        # Fisher information of each item's log-strength, and pair counts
+        info = [2 * self.prior * _sigmoid(s) * (1 - _sigmoid(s)) for s in log_scores]
+        judged: Dict[Tuple[int, int], int] = {}
+        for comp in comparisons:
+            i, j = index[comp.item_a], index[comp.item_b]
+            p = _sigmoid(log_scores[i] - log_scores[j])
+            info[i] += p * (1 - p)
+            info[j] += p * (1 - p)
+            key = (min(i, j), max(i, j))
+            judged[key] = judged.get(key, 0) + 1
+        variance = [1.0 / max(x, 1e-9) for x in info]
+
+        # Candidate opponents: ranking neighbours plus a few random items
+        n = len(names)
+        order = sorted(range(n), key=lambda i: log_scores[i], reverse=True)
+        candidates = set()
+        for position, i in enumerate(order):
+            for offset in range(1, self.window + 1):
+                if position + offset < n:
+                    j = order[position + offset]
+                    candidates.add((min(i, j), max(i, j)))
+            for _ in range(self.n_random_candidates):
+                j = self.rng.randrange(n)
+                if j != i:
+                    candidates.add((min(i, j), max(i, j)))
+
+        def information(pair: Tuple[int, int]) -> float:
+            i, j = pair
+            p = _sigmoid(log_scores[i] - log_scores[j])
+            return p * (1 - p) * (variance[i] + variance[j]) / (1 + judged.get(pair, 0))
+
+        ranked_candidates = sorted(candidates, key=information, reverse=True)
+
+        # Spread the round over many items before doubling up on any of them
+        cap = max(1, math.ceil(2 * size / n))
+        uses = [0] * n
+        chosen: List[Tuple[int, int]] = []
+        for i, j in ranked_candidates:
+            if len(chosen) >= size:
+                break
+            if uses[i] < cap and uses[j] < cap:
+                chosen.append((i, j))
+                uses[i] += 1
+                uses[j] += 1
+        if len(chosen) < size:
+            taken = set(chosen)
+            chosen.extend(
+                [pair for pair in ranked_candidates if pair not in taken][
+                    : size - len(chosen)
+                ]
+            )
+
+        return [(self.items[i], self.items[j]) for i, j in chosen]
+
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        remaining = sum(self._remaining.values())
+        if remaining <= 0 or len(self.items) < 2:
+            return []
+
+        size = min(self._round_size, remaining)
+        if self._round == 0:
+            pairs = self._warmup_pairs(min(remaining, max(size, len(self.items))))
+        else:
+            pairs = self._informative_pairs(comparisons, size)
+        self._round += 1
+
+        jobs = self._assign(pairs)
+        logger.info(f"Adaptive round {self._round}: {len(jobs)} comparisons")
+        return jobs
+
+
+class _Partition:
+    """One quicksort partition step: every member against a pivot."""
+
+    def __init__(self, key: Tuple[int, ...], pivot: Item, members: List[Item]):
+        self.key = key
+        self.pivot = pivot
+        self.members = members
+        self.wins = [0] * len(members)
+        self.losses = [0] * len(members)
+        self.voters: List[Set[str]] = [set() for _ in members]
+
+
+class SortSampler(Sampler):
+    """Noisy quicksort with the agents as comparators.
+
+    Each round partitions every open segment around a random pivot, running
+    all member-vs-pivot comparisons of all segments in parallel, so a full
+    ordering takes O(n log n) comparisons in O(log n) rounds instead of
+    sampling from the O(n^2) pairs. Each member-vs-pivot decision is a
+    majority of up to `votes` judgements by distinct agents; only as many
+    votes as needed for a majority are requested, and a tie-break vote is
+    added in the next round when they disagree. All collected outcomes feed
+    Bradley-Terry as usual.
+
+    The number of comparisons is set by the sort, not by
+    `n_comparisons_per_agent`; work is spread evenly over the agents.
+    """
+
+    def __init__(self, votes: int = 1):
+        """Initialize the sampler.
+
+        Args:
+            votes: Maximum number of judgements per decision. Use an odd
+                number, e.g. 3 for a best-of-three majority
+        """
+        if votes < 1:
+            raise ValueError("votes must be at least 1")
+        self.votes = votes
+
+    def start(
+        self,
+        items: List[Item],
+        agents: List[Agent],
+        n_comparisons_per_agent: int,
+        rng: random.Random,
+    ) -> None:
+        super().start(items, agents, n_comparisons_per_agent, rng)
+        # Decisions asked about last round, by job, and how many comparisons
+        # had come back before it
+        self._issued: Dict[Tuple[str, str, str], List[Tuple[_Partition, int]]] = {}
+        self._n_seen = 0
+        self._assigned = {agent.agent_id: 0 for agent in agents}
+        self._round = 0
+        # Position of every item in the sorted order, as a path in the
+        # quicksort tree: (0,) above a pivot, (1,) the pivot, (2,) below it
+        self._keys: Dict[str, Tuple[int, ...]] = {item.name: () for item in items}
+        self._partitions = self._open_segment((), list(items))
+
+    def _open_segment(
+        self, key: Tuple[int, ...], segment: List[Item]
+    ) -> List[_Partition]:
+        """Start partitioning a segment around a random pivot, if needed."""
+        for item in segment:
+            self._keys[item.name] = key
+        if len(segment) < 2:
+            return []
+        pivot_index = self.rng.randrange(len(segment))
+        members = segment[:pivot_index] + segment[pivot_index + 1 :]
+        self._keys[segment[pivot_index].name] = key + (1,)
+        return [_Partition(key, segment[pivot_index], members)]
+
+    def _majority(self) -> int:
+        return self.votes // 2 + 1
+
+    def _decided(self, partition: _Partition, k: int) -> bool:
+        majority = min(self._majority(), len(self.agents))
+        return (
+            max(partition.wins[k], partition.losses[k]) >= majority
+            or partition.wins[k] + partition.losses[k] >= self.votes
+        )
+
+    def _pick_agent(self, voters: Set[str]) -> Agent:
+        """Least-loaded agent that has not voted on this decision yet."""
+        fresh = [agent for agent in self.agents if agent.agent_id not in voters]
+        return min(fresh or self.agents, key=lambda a: self._assigned[a.agent_id])
+
+    def next_round(self, comparisons: List[ComparisonResult]) -> List[Job]:
+        if not self.agents:
+            return []
+
+        # Tally the previous round, which is the tail of `comparisons`. Its
+        # order can differ from the order the jobs were planned in, e.g. when
+        # a stopping rule interleaves agents, so outcomes are matched by job.
+        # It may also be shorter, e.g. when a call cap cut it off
+        recent = comparisons[self._n_seen :]
+        self._n_seen = len(comparisons)
+        for comp in recent:
+            decisions = self._issued.get((comp.agent_id, comp.item_a, comp.item_b))
+            if not decisions:
+                continue
+            partition, k = decisions.pop(0)
+            if comp.winner == partition.members[k].name:
+                partition.wins[k] += 1
+            else:
+                partition.losses[k] += 1
+            partition.voters[k].add(comp.agent_id)
+        # Jobs that never ran don't count towards their agent's load; their
+        # decisions are still open and are asked again below
+        for (agent_id, _, _), decisions in self._issued.items():
+            self._assigned[agent_id] -= len(decisions)
+
+        # Split finished partitions into the segments above and below the pivot
+        open_partitions: List[_Partition] = []
+        for partition in self._partitions:
+            if not all(
+                self._decided(partition, k) for k in range(len(partition.members))
+            ):
+                open_partitions.append(partition)
+                continue
+            above = [
+                item
+                for k, item in enumerate(partition.members)
+                if partition.wins[k] > partition.losses[k]
+            ]
+            below = [
+                item
+                for k, item in enumerate(partition.members)
+                if partition.wins[k] <= partition.losses[k]
+            ]
+            open_partitions.extend(self._open_segment(partition.key + (0,), above))
+            open_partitions.extend(self._open_segment(partition.key + (2,), below))
+        self._partitions = open_partitions
+
+        jobs: List[Job] = []
+        self._issued = {}
+        majority = min(self._majority(), len(self.agents))
+        for partition in self._partitions:
+            for k, member in enumerate(partition.members):
+                if self._decided(partition, k):
+                    continue
+                needed = majority - max(partition.wins[k], partition.losses[k])
+                voters = set(partition.voters[k])
+                for _ in range(needed):
+                    agent = self._pick_agent(voters)
+                    voters.add(agent.agent_id)
+                    self._assigned[agent.agent_id] += 1
+
+                    item_a, item_b = member, partition.pivot
+                    # Randomly swap order to avoid position bias
+                    if self.rng.random() < 0.5:
+                        item_a, item_b = item_b, item_a
+                    jobs.append((agent, item_a, item_b))
+                    self._issued.setdefault(
+                        (agent.agent_id, item_a.name, item_b.name), []
+                    ).append((partition, k))
+
+        if jobs:
+            self._round += 1
+            logger.info(
+                f"Sort round {self._round}: {len(self._partitions)} partitions, "
+                f"{len(jobs)} comparisons"
+            )
+        return jobs
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The order found by the sort itself, best first.
+
+        Bradley-Terry scores are computed from the same outcomes, but the
+        raw sort order is kept as well since it uses the majority decisions.
+        """
+        return {"sort_order": sorted(self._keys, key=self._keys.__getitem__)}
@@ -0,0 +1,211 @@
+"""Simulated agents for offline benchmarks and tests.
+
+A `SimulatedJudge` answers arbitron's prompts through PydanticAI's
+`FunctionModel`, deciding every pair from hidden latent strengths instead
+of calling an LLM. Outcomes follow the Bradley-Terry model the rankings are
+fitted with, optionally with a bias towards the option shown first and a
+simulated response latency.
+"""
+
+import asyncio
+import math
+import random
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelResponse,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import Usage
+
+from .agent import Agent
+from .rate_limit import RateLimiter
+
+_OPTION_A = re.compile(r"^Option A: (.*)$", re.MULTILINE)
+_OPTION_B = re.compile(r"^Option B: (.*)$", re.MULTILINE)
+_OPTION = re.compile(r"^Option: (.*)$", re.MULTILINE)
+
+
+class SimulatedJudge:
+    """Answers comparisons from latent strengths, without any API calls.
+
+    Option A beats option B with probability
+    sigmoid((s_a - s_b) / noise + position_bias). Groups are ranked by
+    strength plus Gumbel noise, which is the listwise equivalent
+    (Plackett-Luce) of the same model.
+    """
+
+    def __init__(
+        self,
+        strengths: Dict[str, float],
+        noise: float = 1.0,
+        position_bias: float = 0.0,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize the judge.
+
+        Args:
+            strengths: Latent strength of every item, by name
+            noise: Scale of the decision noise; 0 always picks the stronger
+                item
+            position_bias: Log-odds bonus of the option shown first
+            latency: Seconds each response takes, or a (min, max) range to
+                draw from uniformly
+            seed: Optional seed for reproducible decisions
+        """
+        if noise < 0:
+            raise ValueError("noise must not be negative")
+
+        self.strengths = strengths
+        self.noise = noise
+        self.position_bias = position_bias
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+        self.calls = 0
+        self.decisions = 0
+
+    def p_first_wins(self, name_a: str, name_b: str) -> float:
+        """Probability that `name_a`, shown first, beats `name_b`."""
+        diff = self.strengths[name_a] - self.strengths[name_b]
+        if self.noise == 0 and diff != 0:
+            return 1.0 if diff > 0 else 0.0
+        logit = (diff / self.noise if self.noise else 0.0) + self.position_bias
+        return 0.5 * (1.0 + math.tanh(0.5 * logit))
+
+    def choose(self, name_a: str, name_b: str) -> str:
+        """Draw the winner of a pair."""
+        self.decisions += 1
+        if self.rng.random() < self.p_first_wins(name_a, name_b):
+            return name_a
+        return name_b
+
+    def order(self, names: List[str]) -> List[str]:
+        """Draw a best-to-worst ranking of a group."""
+        self.decisions += len(names) * (len(names) - 1) // 2
+
+        def perturbed(name: str) -> float:
+            if self.noise == 0:
+                return self.strengths[name]
+            gumbel = -math.log(-math.log(self.rng.random() or 1e-300))
+            return self.strengths[name] + self.noise * gumbel
+
+        return sorted(names, key=perturbed, reverse=True)
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            return self.rng.uniform(*self.latency)
+        return self.latency
+
+    async def respond(
+        self, messages: List[ModelMessage], info: AgentInfo
+    ) -> ModelResponse:
+        """FunctionModel callback answering a single arbitron request."""
+        self.calls += 1
+        delay = self._delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        request = messages[-1]
+        prompt = "\n".join(
+            part.content
+            for part in request.parts
+            if isinstance(part, UserPromptPart) and isinstance(part.content, str)
+        )
+        tool = info.output_tools[0]
+        properties = tool.parameters_json_schema.get("properties", {})
+
+        if "ranking" in properties:
+            args = {
+                "ranking": self.order(_OPTION.findall(prompt)),
+                "reasoning": "Ordered by simulated strength.",
+            }
+        else:
+            comparisons = [
+                {
+                    "item_a": name_a,
+                    "item_b": name_b,
+                    "winner": self.choose(name_a, name_b),
+                    "reasoning": "Chosen by simulated strength.",
+                    "agent_id": "simulated",
+                }
+                for name_a, name_b in zip(
+                    _OPTION_A.findall(prompt), _OPTION_B.findall(prompt)
+                )
+            ]
+            # Batched requests are wrapped by PydanticAI in a "response" field
+            args = (
+                comparisons[0] if "winner" in properties else {"response": comparisons}
+            )
+
+        # Report a plausible token count so token limits can be exercised
+        request_tokens = (
+            sum(len(getattr(part, "content", "")) for part in request.parts) // 4
+        )
+        return ModelResponse(
+            parts=[ToolCallPart(tool.name, args)],
+            usage=Usage(
+                requests=1,
+                request_tokens=request_tokens,
+                response_tokens=20,
+                total_tokens=request_tokens + 20,
+            ),
+        )
+
+    def model(self) -> FunctionModel:
+        """A PydanticAI model backed by this judge."""
+        return FunctionModel(self.respond, model_name="simulated-judge")
+
+
+def simulated_agents(
+    strengths: Dict[str, float],
+    n_agents: int = 3,
+    noise: float = 1.0,
+    position_bias: float = 0.0,
+    latency: Union[float, Tuple[float, float]] = 0.0,
+    requests_per_minute: float = 1e9,
+    seed: Optional[int] = None,
+) -> List[Agent]:
+    """Create agents that judge from latent strengths instead of an LLM.
+
+    Every agent has its own `SimulatedJudge` and all of them share one rate
+    limiter. `agent.usage["requests"]` counts the simulated calls.
+
+    Args:
+        strengths: Latent strength of every item, by name
+        n_agents: Number of agents
+        noise: Scale of the decision noise; 0 always picks the stronger item
+        position_bias: Log-odds bonus of the option shown first
+        latency: Seconds each response takes, or a (min, max) range
+        requests_per_minute: Rate limit shared by the agents
+        seed: Optional seed for reproducible decisions
+
+    Returns:
+        List of Agents
+    """
+    seeds = random.Random(seed)
+    rate_limiter = RateLimiter(requests_per_minute=requests_per_minute)
+
+    agents = []
+    for k in range(n_agents):
+        judge = SimulatedJudge(
+            strengths,
+            noise=noise,
+            position_bias=position_bias,
+            latency=latency,
+            seed=seeds.randrange(2**32),
+        )
+        agents.append(
+            Agent(
+                "Pick the stronger item.",
+                agent_id=f"simulated_{k}",
+                model=judge.model(),
+                rate_limiter=rate_limiter,
+            )
+        )
+    return agents
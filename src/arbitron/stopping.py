@@ -0,0 +1,231 @@
+"""Convergence-based early stopping and hard budgets for contests."""
+
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+from .engine import ComparisonEngine, Job
+from .models import ComparisonResult
+from .ranking import calculate_bradley_terry_scores, kendall_tau, rank_items
+
+logger = logging.getLogger(__name__)
+
+# Virtual wins and losses per item in the interim estimates, so that early
+# rounds with a disconnected comparison graph still give comparable scores
+INTERIM_PRIOR = 0.1
+
+
+class StoppingRule:
+    """Runs a contest in rounds and stops it once the ranking is stable.
+
+    The planned schedule is cut into rounds of `round_size` comparisons,
+    interleaved across agents. After each round Bradley-Terry is re-solved,
+    warm-started from the previous round, and the contest stops early when
+    any of the configured criteria has held for `patience` rounds in a row:
+    the top `top_k` unchanged, Kendall tau against the previous ranking of
+    at least `min_tau`, or every log-score moving less than
+    `score_tolerance`. Independently, it stops as soon as a hard cap on
+    model calls, tokens or wall-clock time is reached. Calls are capped
+    exactly; tokens and time are checked between rounds, so they can be
+    exceeded by up to one round.
+
+    `n_comparisons_per_agent` stays the upper bound of the spend. The
+    reason and the number of rounds are recorded in
+    RankingResult.metadata.
+    """
+
+    def __init__(
+        self,
+        round_size: Optional[int] = None,
+        n_rounds: int = 10,
+        min_rounds: int = 2,
+        patience: int = 1,
+        top_k: Optional[int] = None,
+        min_tau: Optional[float] = None,
+        score_tolerance: Optional[float] = None,
+        max_calls: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+    ):
+        """Initialize the rule.
+
+        Args:
+            round_size: Comparisons per round. Defaults to splitting each
+                planned schedule into `n_rounds` rounds
+            n_rounds: Number of rounds, when `round_size` is not given
+            min_rounds: Rounds to run before convergence is checked
+            patience: Consecutive stable rounds needed to stop
+            top_k: Stop when the top k items, in order, are unchanged
+            min_tau: Stop when Kendall tau between consecutive rankings
+                reaches this value
+            score_tolerance: Stop when no log-score moves by more than this
+            max_calls: Hard cap on model requests
+            max_tokens: Hard cap on prompt plus completion tokens
+            max_seconds: Hard cap on wall-clock time
+        """
+        if round_size is not None and round_size < 1:
+            raise ValueError("round_size must be at least 1")
+        if n_rounds < 1:
+            raise ValueError("n_rounds must be at least 1")
+        if patience < 1:
+            raise ValueError("patience must be at least 1")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be at least 1")
+
+        self.round_size = round_size
+        self.n_rounds = n_rounds
+        self.min_rounds = min_rounds
+        self.patience = patience
+        self.top_k = top_k
+        self.min_tau = min_tau
+        self.score_tolerance = score_tolerance
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+
+        self.start([])
+
+    def start(self, item_names: List[str]) -> None:
+        """Reset the rule for a new contest.
+
+        Args:
+            item_names: Names of the items being ranked
+        """
+        self.item_names = item_names
+        self.scores: Optional[Dict[str, float]] = None
+        self.ranking: Optional[List[str]] = None
+        self.reason: Optional[str] = None
+        self.n_rounds_run = 0
+        self.history: List[Dict[str, float]] = []
+        self._stable = 0
+        self._started = time.monotonic()
+
+    def rounds(self, schedule: List[Job], batch_size: int = 1) -> List[List[Job]]:
+        """Cut a planned schedule into rounds.
+
+        Jobs are dealt round-robin across agents in blocks of `batch_size`,
+        so every round keeps all agents busy and batches stay whole.
+
+        Args:
+            schedule: Jobs planned by the sampler
+            batch_size: Consecutive jobs of an agent sent per request
+
+        Returns:
+            The jobs of every round, in order
+        """
+        blocks: Dict[int, List[List[Job]]] = {}
+        for job in schedule:
+            agent_blocks = blocks.setdefault(id(job[0]), [[]])
+            if len(agent_blocks[-1]) == batch_size:
+                agent_blocks.append([])
+            agent_blocks[-1].append(job)
+
+        interleaved: List[List[Job]] = []
+        queues = list(blocks.values())
+        for k in range(max((len(queue) for queue in queues), default=0)):
+            interleaved.extend(queue[k] for queue in queues if k < len(queue))
+
+        size = self.round_size or math.ceil(len(schedule) / self.n_rounds)
+        rounds: List[List[Job]] = [[]]
+        for block in interleaved:
+            if rounds[-1] and len(rounds[-1]) + len(block) > size:
+                rounds.append([])
+            rounds[-1].extend(block)
+        return [jobs for jobs in rounds if jobs]
+
+    def remaining_jobs(self, engine: ComparisonEngine) -> Optional[int]:
+        """Jobs that still fit under the call cap, or None without one."""
+        if self.max_calls is None:
+            return None
+        return max(0, self.max_calls - engine.metrics.n_calls) * engine.batch_size
+
+    def _over_budget(self, engine: ComparisonEngine) -> Optional[str]:
+        if self.max_calls is not None and engine.metrics.n_calls >= self.max_calls:
+            return "max_calls"
+        if self.max_tokens is not None and engine.metrics.n_tokens >= self.max_tokens:
+            return "max_tokens"
+        if (
+            self.max_seconds is not None
+            and time.monotonic() - self._started >= self.max_seconds
+        ):
+            return "max_seconds"
+        return None
+
+    def _converged(self, previous: List[str], previous_scores: Dict[str, float]):
+        """Name of the first configured criterion that holds this round."""
+        if (
+            self.top_k is not None
+            and previous[: self.top_k] == self.ranking[: self.top_k]
+        ):
+            return "top_k"
+        if self.min_tau is not None and self.history[-1]["kendall_tau"] >= self.min_tau:
+            return "kendall_tau"
+        if (
+            self.score_tolerance is not None
+            and self.history[-1]["max_score_delta"] < self.score_tolerance
+        ):
+            return "score_delta"
+        return None
+
+    def update(
+        self, comparisons: List[ComparisonResult], engine: ComparisonEngine
+    ) -> Optional[str]:
+        """Re-estimate the ranking after a round and decide whether to stop.
+
+        Args:
+            comparisons: Every comparison collected so far
+            engine: Engine running the contest, for its call and token counts
+
+        Returns:
+            The stopping reason, or None to continue
+        """
+        self.n_rounds_run += 1
+        previous, previous_scores = self.ranking, self.scores
+        self.scores = calculate_bradley_terry_scores(
+            comparisons,
+            self.item_names,
+            prior=INTERIM_PRIOR,
+            initial_scores=previous_scores,
+        )
+        self.ranking = rank_items(self.scores)
+
+        if previous is not None:
+            self.history.append(
+                {
+                    "kendall_tau": kendall_tau(self.ranking, previous),
+                    "max_score_delta": max(
+                        abs(
+                            math.log(self.scores[name])
+                            - math.log(previous_scores[name])
+                        )
+                        for name in self.item_names
+                    ),
+                }
+            )
+            criterion = self._converged(previous, previous_scores)
+            self._stable = self._stable + 1 if criterion else 0
+            if (
+                criterion is not None
+                and self._stable >= self.patience
+                and self.n_rounds_run >= self.min_rounds
+            ):
+                self.reason = criterion
+                logger.info(
+                    f"Ranking converged ({criterion}) after {self.n_rounds_run} rounds"
+                )
+                return self.reason
+
+        self.reason = self._over_budget(engine)
+        if self.reason is not None:
+            logger.info(f"Stopping after {self.n_rounds_run} rounds: {self.reason}")
+        return self.reason
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Stopping details to record in RankingResult.metadata."""
+        return {
+            "stopping_reason": self.reason or "budget_exhausted",
+            "stopping_rounds": self.n_rounds_run,
+            "convergence": self.history,
+        }
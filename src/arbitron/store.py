@@ -0,0 +1,644 @@
+"""Compact columnar storage of comparison results."""
+
+import json
+import logging
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pydantic_core import from_json, to_json
+
+from .models import (
+    ComparisonResult,
+    Competition,
+    RankingResult,
+    _ComparisonsSchema,
+)
+
+logger = logging.getLogger(__name__)
+
+_new_comparison = ComparisonResult.__new__
+_set = object.__setattr__
+
+# Characters read from a result file at a time when streaming it
+CHUNK_SIZE = 1 << 20
+
+# array typecode of a 32-bit signed integer on this platform
+INT32 = next(code for code in "ihl" if array(code).itemsize == 4)
+
+
+def _numpy() -> Any:
+    """Import numpy on first use, so loading results doesn't pay for it.
+
+    Returns:
+        The numpy module, or None if it isn't installed
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - numpy is optional
+        return None
+    return numpy
+
+
+def _pyarrow() -> Any:
+    """Import pyarrow, which is only needed for Arrow and Parquet I/O."""
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Arrow and Parquet support requires pyarrow: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _trusted_comparison(data: Dict[str, Any]) -> ComparisonResult:
+    """Build a ComparisonResult from trusted data without validating it.
+
+    Equivalent to ComparisonResult.model_construct(**data), without its
+    per-field bookkeeping, which dominates the time to load large results.
+    `data` must hold every required field and is used as the instance dict.
+    """
+    comparison = _new_comparison(ComparisonResult)
+    data.setdefault("backend", None)
+    _set(comparison, "__dict__", data)
+    _set(comparison, "__pydantic_fields_set__", set(data))
+    _set(comparison, "__pydantic_extra__", None)
+    _set(comparison, "__pydantic_private__", {"_corrected_from": None})
+    return comparison
+
+
+def _to_array(typecode: str, values: Any) -> array:
+    """Copy a null-free Arrow array of fixed-width integers into an array."""
+    result = array(typecode)
+    width = result.itemsize
+    if len(values):
+        data = memoryview(values.buffers()[1])
+        result.frombytes(
+            data[values.offset * width : (values.offset + len(values)) * width]
+        )
+    return result
+
+
+class ComparisonLog(Sequence):
+    """Array-backed log of comparisons.
+
+    Item names, agent ids and backend names are stored once and every
+    comparison as int32 indices into them plus one byte telling whether
+    item A won, so a million comparisons take about 17 MB instead of
+    gigabytes of pydantic objects. Reasoning is kept in a separate column,
+    or dropped with `keep_reasoning=False`.
+
+    The log is a sequence of ComparisonResults: indexing and iterating build
+    them on demand. Solvers read the columns directly, through `outcomes` or
+    the zero-copy NumPy views of `arrays`.
+    """
+
+    def __init__(
+        self,
+        items: Optional[Iterable[str]] = None,
+        agents: Optional[Iterable[str]] = None,
+        keep_reasoning: bool = True,
+    ):
+        """Create an empty log.
+
+        Args:
+            items: Optional item names to index first, in this order
+            agents: Optional agent ids to index first, in this order
+            keep_reasoning: Whether to store the agents' reasoning
+        """
+        self.items: List[str] = []
+        self.agents: List[str] = []
+        self.backends: List[str] = []
+        self._item_index: Dict[str, int] = {}
+        self._agent_index: Dict[str, int] = {}
+        self._backend_index: Dict[str, int] = {}
+        for name in items or ():
+            self._intern(self.items, self._item_index, name)
+        for agent_id in agents or ():
+            self._intern(self.agents, self._agent_index, agent_id)
+
+        self._item_a = array(INT32)
+        self._item_b = array(INT32)
+        self._agent = array(INT32)
+        # -1 for comparisons without a backend, e.g. from older logs
+        self._backend = array(INT32)
+        self._a_won = array("B")
+        self.reasoning: Optional[List[str]] = [] if keep_reasoning else None
+
+    @staticmethod
+    def _intern(names: List[str], index: Dict[str, int], name: str) -> int:
+        position = index.get(name)
+        if position is None:
+            position = index[name] = len(names)
+            names.append(name)
+        return position
+
+    @classmethod
+    def from_comparisons(
+        cls,
+        comparisons: Iterable[ComparisonResult],
+        items: Optional[Iterable[str]] = None,
+        keep_reasoning: bool = True,
+    ) -> "ComparisonLog":
+        """Build a log from ComparisonResults.
+
+        Args:
+            comparisons: The comparisons, in order
+            items: Optional item names to index first, e.g. the contest's
+            keep_reasoning: Whether to store the agents' reasoning
+
+        Returns:
+            ComparisonLog holding the comparisons
+        """
+        log = cls(items, keep_reasoning=keep_reasoning)
+        log.extend(comparisons)
+        return log
+
+    def append(self, comparison: ComparisonResult) -> None:
+        """Add a comparison at the end of the log."""
+        self._append(
+            comparison.item_a,
+            comparison.item_b,
+            comparison.winner,
+            comparison.reasoning,
+            comparison.agent_id,
+            comparison.backend,
+        )
+
+    def _append(
+        self,
+        item_a: str,
+        item_b: str,
+        winner: str,
+        reasoning: str,
+        agent_id: str,
+        backend: Optional[str] = None,
+    ) -> None:
+        self._item_a.append(self._intern(self.items, self._item_index, item_a))
+        self._item_b.append(self._intern(self.items, self._item_index, item_b))
+        self._agent.append(self._intern(self.agents, self._agent_index, agent_id))
+        self._backend.append(
+            -1
+            if backend is None
+            else self._intern(self.backends, self._backend_index, backend)
+        )
+        self._a_won.append(winner == item_a)
+        if self.reasoning is not None:
+            self.reasoning.append(reasoning)
+
+    def extend(self, comparisons: Iterable[ComparisonResult]) -> None:
+        """Add comparisons at the end of the log."""
+        for comparison in comparisons:
+            self.append(comparison)
+
+    def __len__(self) -> int:
+        return len(self._a_won)
+
+    def _build(self, k: int) -> ComparisonResult:
+        item_a = self.items[self._item_a[k]]
+        item_b = self.items[self._item_b[k]]
+        backend = self._backend[k]
+        # The log only holds valid comparisons, so validation is skipped
+        return _trusted_comparison(
+            {
+                "item_a": item_a,
+                "item_b": item_b,
+                "winner": item_a if self._a_won[k] else item_b,
+                "reasoning": self.reasoning[k] if self.reasoning is not None else "",
+                "agent_id": self.agents[self._agent[k]],
+                "backend": self.backends[backend] if backend >= 0 else None,
+            }
+        )
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ComparisonResult, List[ComparisonResult]]:
+        if isinstance(index, slice):
+            return [self._build(k) for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("comparison index out of range")
+        return self._build(index)
+
+    def __iter__(self) -> Iterator[ComparisonResult]:
+        for k in range(len(self)):
+            yield self._build(k)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ComparisonLog):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"ComparisonLog({len(self)} comparisons, {len(self.items)} items, "
+            f"{len(self.agents)} agents)"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index and winner columns, in bytes."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (
+                self._item_a,
+                self._item_b,
+                self._agent,
+                self._backend,
+                self._a_won,
+            )
+        )
+
+    def arrays(self) -> Dict[str, Any]:
+        """Zero-copy NumPy views of the columns.
+
+        The log cannot grow while a view is alive: appending raises
+        BufferError until the views are released.
+
+        Returns:
+            Dictionary with int32 "item_a", "item_b", "agent" and "backend"
+            index arrays (-1 for no backend) and a boolean "a_won" array
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError("NumPy views require numpy: pip install numpy")
+        return {
+            "item_a": np.frombuffer(self._item_a, dtype=np.int32),
+            "item_b": np.frombuffer(self._item_b, dtype=np.int32),
+            "agent": np.frombuffer(self._agent, dtype=np.int32),
+            "backend": np.frombuffer(self._backend, dtype=np.int32),
+            "a_won": np.frombuffer(self._a_won, dtype=np.bool_),
+        }
+
+    def outcomes(self, item_to_idx: Dict[str, int]) -> Tuple[Any, Any]:
+        """Winner and loser indices of every comparison.
+
+        Args:
+            item_to_idx: Index of every item name in the caller's item list
+
+        Returns:
+            Parallel winner and loser index sequences, as NumPy arrays when
+            numpy is installed
+        """
+        remap = [item_to_idx[name] for name in self.items]
+        np = _numpy()
+        if np is None:
+            winners, losers = [], []
+            for a, b, a_won in zip(self._item_a, self._item_b, self._a_won):
+                winners.append(remap[a] if a_won else remap[b])
+                losers.append(remap[b] if a_won else remap[a])
+            return winners, losers
+
+        columns = self.arrays()
+        a_won = columns["a_won"]
+        remap_arr = np.asarray(remap, dtype=np.intp)
+        a = remap_arr[columns["item_a"]]
+        b = remap_arr[columns["item_b"]]
+        return np.where(a_won, a, b), np.where(a_won, b, a)
+
+    def to_comparisons(self) -> List[ComparisonResult]:
+        """Build every comparison as a ComparisonResult."""
+        return list(self)
+
+    def to_arrow(self) -> Any:
+        """Convert the log to an Arrow table.
+
+        Item and agent columns are dictionary-encoded over the log's names,
+        sharing its index buffers without copying.
+
+        Returns:
+            pyarrow.Table with columns item_a, item_b, agent_id, backend,
+            a_won and, if kept, reasoning
+        """
+        pa = _pyarrow()
+        n = len(self)
+
+        def indices(column: array) -> Any:
+            return pa.Array.from_buffers(pa.int32(), n, [None, pa.py_buffer(column)])
+
+        items = pa.array(self.items, pa.string())
+        agents = pa.array(self.agents, pa.string())
+        backend_indices = indices(self._backend)
+        backend_indices = pa.compute.if_else(
+            pa.compute.equal(backend_indices, -1),
+            pa.scalar(None, pa.int32()),
+            backend_indices,
+        )
+        columns = {
+            "item_a": pa.DictionaryArray.from_arrays(indices(self._item_a), items),
+            "item_b": pa.DictionaryArray.from_arrays(indices(self._item_b), items),
+            "agent_id": pa.DictionaryArray.from_arrays(indices(self._agent), agents),
+            "backend": pa.DictionaryArray.from_arrays(
+                backend_indices, pa.array(self.backends, pa.string())
+            ),
+            "a_won": pa.Array.from_buffers(
+                pa.uint8(), n, [None, pa.py_buffer(self._a_won)]
+            ).cast(pa.bool_()),
+        }
+        if self.reasoning is not None:
+            columns["reasoning"] = pa.array(self.reasoning, pa.string())
+        return pa.table(columns)
+
+    @classmethod
+    def from_arrow(cls, table: Any, keep_reasoning: bool = True) -> "ComparisonLog":
+        """Load a log from an Arrow table written by `to_arrow`.
+
+        Plain string columns are accepted too and dictionary-encoded.
+
+        Args:
+            table: pyarrow.Table with columns item_a, item_b, agent_id, a_won
+                and optionally backend and reasoning
+            keep_reasoning: Whether to load the reasoning column
+
+        Returns:
+            ComparisonLog holding the table's comparisons
+        """
+        pa = _pyarrow()
+        pc = pa.compute
+
+        def encoded(name: str) -> Any:
+            column = table.column(name).combine_chunks()
+            if not pa.types.is_dictionary(column.type):
+                column = pc.dictionary_encode(column)
+            return column
+
+        def column_indices(
+            column: Any, names: List[str], index: Dict[str, int]
+        ) -> array:
+            positions = [
+                cls._intern(names, index, name)
+                for name in column.dictionary.to_pylist()
+            ]
+            values = column.indices
+            if positions != list(range(len(positions))):
+                values = pc.take(pa.array(positions, pa.int32()), values)
+            # Missing names, i.e. no backend, are stored as -1
+            values = pc.fill_null(values.cast(pa.int32()), -1)
+            return _to_array(INT32, values)
+
+        log = cls(keep_reasoning=keep_reasoning)
+        log._item_a = column_indices(encoded("item_a"), log.items, log._item_index)
+        log._item_b = column_indices(encoded("item_b"), log.items, log._item_index)
+        log._agent = column_indices(encoded("agent_id"), log.agents, log._agent_index)
+        if "backend" in table.column_names:
+            log._backend = column_indices(
+                encoded("backend"), log.backends, log._backend_index
+            )
+        else:
+            log._backend = array(INT32, [-1]) * table.num_rows
+        log._a_won = _to_array(
+            "B", table.column("a_won").combine_chunks().cast(pa.uint8())
+        )
+        if keep_reasoning:
+            if "reasoning" in table.column_names:
+                log.reasoning = table.column("reasoning").to_pylist()
+            else:
+                log.reasoning = [""] * len(log)
+        return log
+
+    def write_parquet(self, path: Union[str, Path], **kwargs: Any) -> None:
+        """Write the log to a Parquet file.
+
+        Args:
+            path: Destination file
+            **kwargs: Passed on to pyarrow.parquet.write_table
+        """
+        pa = _pyarrow()
+        pa.parquet.write_table(self.to_arrow(), str(path), **kwargs)
+        logger.info(f"Wrote {len(self)} comparisons to {path}")
+
+    @classmethod
+    def read_parquet(
+        cls, path: Union[str, Path], keep_reasoning: bool = True
+    ) -> "ComparisonLog":
+        """Read a log written by `write_parquet`.
+
+        Args:
+            path: Parquet file
+            keep_reasoning: Whether to read the reasoning column
+
+        Returns:
+            ComparisonLog holding the file's comparisons
+        """
+        pa = _pyarrow()
+        schema = pa.parquet.read_schema(str(path))
+        columns = ["item_a", "item_b", "agent_id", "a_won"]
+        if "backend" in schema.names:
+            columns.append("backend")
+        if keep_reasoning and "reasoning" in schema.names:
+            columns.append("reasoning")
+        table = pa.parquet.read_table(str(path), columns=columns)
+        return cls.from_arrow(table, keep_reasoning=keep_reasoning)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> Any:
+        """Validate and serialize logs like RankingResult.comparisons."""
+        return _ComparisonsSchema().__get_pydantic_core_schema__(source, handler)
+
+
+class _JsonStream:
+    """Incremental reader of the JSON values in a file, one at a time."""
+
+    def __init__(self, file: Any, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read another chunk; False at the end of the file."""
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON file")
+
+    def expect(self, characters: str) -> str:
+        """Consume the next character, which must be one of `characters`."""
+        character = self.peek()
+        if character not in characters:
+            raise ValueError(f"Expected one of {characters!r}, got {character!r}")
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A value touching the end of the buffer may continue in the
+            # next chunk (e.g. a number)
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+
+def _parse_result(
+    path: Union[str, Path], chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """Stream a saved RankingResult as (field, value) pairs.
+
+    Every element of "comparisons" is yielded on its own, as
+    ("comparison", dict), so the list never has to fit in memory.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "comparisons":
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.expect("]")
+                else:
+                    while True:
+                        yield "comparison", stream.value()
+                        if stream.expect(",]") == "]":
+                            break
+            else:
+                yield key, stream.value()
+            if stream.expect(",}") == "}":
+                return
+
+
+def iter_comparisons(
+    path: Union[str, Path], chunk_size: int = CHUNK_SIZE
+) -> Iterator[ComparisonResult]:
+    """Stream the comparisons of a saved RankingResult without loading it.
+
+    The file is trusted: comparisons are built without validation.
+
+    Args:
+        path: JSON file written by `save_result` or `model_dump_json`
+        chunk_size: Characters to read at a time
+
+    Yields:
+        ComparisonResults, in order
+    """
+    for key, value in _parse_result(path, chunk_size):
+        if key == "comparison":
+            yield _trusted_comparison(value)
+
+
+def load_result(
+    path: Union[str, Path],
+    compact: bool = False,
+    keep_reasoning: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> RankingResult:
+    """Load a saved RankingResult from a trusted file.
+
+    The comparisons are built without validation or winner repair, which
+    makes loading about twice as fast as `RankingResult.model_validate_json`.
+    With `compact=True` the file is parsed incrementally and streamed
+    straight into a ComparisonLog, so results far larger than memory as
+    objects can be loaded.
+
+    Args:
+        path: JSON file written by `save_result` or `model_dump_json`
+        compact: Whether to store the comparisons in a ComparisonLog
+        keep_reasoning: Whether to keep the agents' reasoning
+        chunk_size: Characters to read at a time when streaming
+
+    Returns:
+        The RankingResult
+    """
+    comparisons: Union[ComparisonLog, List[ComparisonResult]]
+    if not compact:
+        with open(path, "rb") as f:
+            fields = from_json(f.read())
+        comparisons = []
+        for data in fields["comparisons"]:
+            if not keep_reasoning:
+                data["reasoning"] = ""
+            comparisons.append(_trusted_comparison(data))
+    else:
+        fields = {}
+        log: Optional[ComparisonLog] = None
+        for key, value in _parse_result(path, chunk_size):
+            if key != "comparison":
+                fields[key] = value
+                continue
+            if log is None:
+                # Index the contest's items first, as RankingResult.compact does
+                competition = fields.get("competition", {})
+                log = ComparisonLog(
+                    [item["name"] for item in competition.get("items", [])],
+                    keep_reasoning=keep_reasoning,
+                )
+            log._append(
+                value["item_a"],
+                value["item_b"],
+                value["winner"],
+                value["reasoning"],
+                value["agent_id"],
+                value.get("backend"),
+            )
+        comparisons = log or ComparisonLog(keep_reasoning=keep_reasoning)
+
+    logger.info(f"Loaded {len(comparisons)} comparisons from {path}")
+    return RankingResult.model_construct(
+        competition=Competition.model_validate(fields["competition"]),
+        ranking=fields["ranking"],
+        scores=fields["scores"],
+        comparisons=comparisons,
+        metadata=fields.get("metadata", {}),
+    )
+
+
+def save_result(result: RankingResult, path: Union[str, Path]) -> None:
+    """Write a RankingResult as JSON, one comparison at a time.
+
+    The output is the same as `result.model_dump_json()` but is never held
+    in memory as a whole, so compact results of any size can be saved.
+
+    Args:
+        result: The result to save
+        path: Destination JSON file
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"competition":')
+        f.write(result.competition.model_dump_json())
+        f.write(',"ranking":')
+        f.write(to_json(result.ranking).decode())
+        f.write(',"scores":')
+        f.write(to_json(result.scores).decode())
+        f.write(',"comparisons":[')
+        for k, comparison in enumerate(result.comparisons):
+            if k:
+                f.write(",")
+            f.write(comparison.model_dump_json())
+        f.write('],"metadata":')
+        f.write(to_json(result.metadata).decode())
+        f.write("}")
+    logger.info(f"Saved {len(result.comparisons)} comparisons to {path}")
@@ -0,0 +1,264 @@
+"""Streaming contests that yield comparisons and interim rankings."""
+
+import asyncio
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Union
+
+from .agent import Agent
+from .cache import ComparisonCache
+from .contest import _to_items
+from .engine import ComparisonEngine
+from .metrics import CallHook
+from .models import ComparisonResult, Competition, Item, RankingResult
+from .rankers import OnlineRanker, Ranker, get_ranker
+from .ranking import comparison_graph_components, rank_items
+from .retry import RetryPolicy
+from .samplers import RandomSampler, Sampler
+
+logger = logging.getLogger(__name__)
+
+
+def _interim_result(
+    competition: Competition,
+    comparisons: List[ComparisonResult],
+    ranker: Ranker,
+    previous_scores: Optional[Dict[str, float]],
+    metadata: Dict[str, Any],
+) -> RankingResult:
+    """Score the comparisons so far.
+
+    Online rankers have already been updated with every comparison; other
+    rankers are re-solved warm-started from the previous interim scores.
+    """
+    item_names = [item.name for item in competition.items]
+    if isinstance(ranker, OnlineRanker):
+        scores = ranker.scores
+    else:
+        scores = ranker.fit(comparisons, item_names, initial_scores=previous_scores)
+    return RankingResult(
+        competition=competition,
+        ranking=rank_items(scores),
+        scores=scores,
+        comparisons=list(comparisons),
+        metadata={
+            **metadata,
+            "total_comparisons": len(comparisons),
+            "ranker": ranker.name,
+            **ranker.metadata,
+            "n_graph_components": len(
+                comparison_graph_components(comparisons, item_names)
+            ),
+        },
+    )
+
+
+async def rank_iter_async(
+    items: List[Union[str, Item]],
+    contest_description: str,
+    agents: List[Agent],
+    competition_name: Optional[str] = None,
+    n_comparisons_per_agent: int = 10,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    interim_every: int = 10,
+    sampler: Optional[Sampler] = None,
+    batch_size: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> AsyncIterator[Union[ComparisonResult, RankingResult]]:
+    """Run a ranking contest, yielding results as they land.
+
+    Every ComparisonResult is yielded as soon as it completes. After every
+    `interim_every` comparisons an interim RankingResult is yielded, with
+    Bradley-Terry warm-started from the previous interim scores, and the
+    final RankingResult is yielded last. Closing the iterator early cancels
+    the comparisons still pending.
+
+    Online rankers such as Elo are updated as every comparison lands, so an
+    interim ranking costs nothing to produce; their scores follow the
+    completion order of the comparisons.
+
+    Args:
+        items: List of items to rank (strings or Item objects)
+        contest_description: Description of what's being evaluated
+        agents: List of Agent objects with different evaluation criteria
+        competition_name: Optional name for the competition
+        n_comparisons_per_agent: Number of random pairwise comparisons per agent
+        random_seed: Optional seed for reproducible random sampling
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        interim_every: Number of comparisons between interim rankings
+        sampler: Pair selection strategy, RandomSampler by default
+        batch_size: Number of comparisons of an agent to judge per request,
+            the sampler's batch size by default
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        ranker: Method turning the comparisons into scores, as in `rank`.
+            Defaults to Bradley-Terry
+
+    Yields:
+        ComparisonResults in completion order, interleaved with interim
+        RankingResults, and the final RankingResult last
+    """
+    if interim_every < 1:
+        raise ValueError("interim_every must be at least 1")
+
+    rng = random.Random(random_seed)
+
+    item_objects = _to_items(items)
+    competition = Competition(
+        name=competition_name or "Arbitron Competition",
+        description=contest_description,
+        items=item_objects,
+    )
+
+    logger.info(
+        f"Starting streaming competition '{competition.name}' with "
+        f"{len(item_objects)} items and {len(agents)} agents"
+    )
+
+    sampler = sampler or RandomSampler()
+    sampler.start(item_objects, agents, n_comparisons_per_agent, rng)
+    engine = ComparisonEngine(
+        max_concurrency,
+        max_concurrency_per_agent,
+        cache,
+        batch_size=batch_size or sampler.batch_size,
+        on_call=on_call,
+        retry=retry,
+    )
+    metadata = {
+        "n_agents": len(agents),
+        "n_comparisons_per_agent": n_comparisons_per_agent,
+        "random_seed": random_seed,
+        "sampler": sampler.name,
+    }
+
+    ranker = get_ranker(ranker)
+    online = isinstance(ranker, OnlineRanker)
+    if online:
+        ranker.start([item.name for item in item_objects])
+
+    comparisons: List[ComparisonResult] = []
+    scores: Optional[Dict[str, float]] = None
+
+    while schedule := sampler.next_round(comparisons):
+        # Comparisons of a round land in completion order; the sampler sees
+        # them all before planning the next round
+        stream = engine.stream(schedule, contest_description)
+        try:
+            async for _, comparison in stream:
+                comparisons.append(comparison)
+                if online:
+                    ranker.update(comparison)
+                yield comparison
+
+                if len(comparisons) % interim_every == 0:
+                    interim = _interim_result(
+                        competition,
+                        comparisons,
+                        ranker,
+                        scores,
+                        {**metadata, "interim": True, **engine.metadata},
+                    )
+                    scores = interim.scores
+                    yield interim
+        finally:
+            # Cancel the pending comparisons if the caller stopped iterating
+            await stream.aclose()
+
+    result = _interim_result(
+        competition,
+        comparisons,
+        ranker,
+        scores,
+        {**metadata, **sampler.metadata, **engine.metadata},
+    )
+    logger.info(f"Competition complete. Winner: {result.ranking[0]}")
+    yield result
+
+
+def rank_iter(
+    items: List[Union[str, Item]],
+    contest_description: str,
+    agents: List[Agent],
+    competition_name: Optional[str] = None,
+    n_comparisons_per_agent: int = 10,
+    random_seed: Optional[int] = None,
+    max_concurrency: int = 16,
+    max_concurrency_per_agent: int = 4,
+    cache: Optional[ComparisonCache] = None,
+    interim_every: int = 10,
+    sampler: Optional[Sampler] = None,
+    batch_size: Optional[int] = None,
+    on_call: Optional[CallHook] = None,
+    retry: Optional[RetryPolicy] = None,
+    ranker: Union[str, Ranker, None] = None,
+) -> Iterator[Union[ComparisonResult, RankingResult]]:
+    """Blocking generator version of `rank_iter_async`.
+
+    The comparisons run on a private event loop that only advances while the
+    caller iterates. Breaking out of the loop cancels the remaining work.
+
+    Args:
+        items: List of items to rank (strings or Item objects)
+        contest_description: Description of what's being evaluated
+        agents: List of Agent objects with different evaluation criteria
+        competition_name: Optional name for the competition
+        n_comparisons_per_agent: Number of random pairwise comparisons per agent
+        random_seed: Optional seed for reproducible random sampling
+        max_concurrency: Maximum number of comparisons in flight overall
+        max_concurrency_per_agent: Maximum number of comparisons in flight per agent
+        cache: Optional ComparisonCache to reuse results of identical
+            comparisons from previous runs and store new ones
+        interim_every: Number of comparisons between interim rankings
+        sampler: Pair selection strategy, RandomSampler by default
+        batch_size: Number of comparisons of an agent to judge per request,
+            the sampler's batch size by default
+        on_call: Optional callback receiving the CallRecord of every model
+            request
+        retry: Optional RetryPolicy for timeouts, retries and hedging of
+            model requests
+        ranker: Method turning the comparisons into scores, as in `rank`.
+            Defaults to Bradley-Terry
+
+    Yields:
+        ComparisonResults in completion order, interleaved with interim
+        RankingResults, and the final RankingResult last
+    """
+    loop = asyncio.new_event_loop()
+    results = rank_iter_async(
+        items=items,
+        contest_description=contest_description,
+        agents=agents,
+        competition_name=competition_name,
+        n_comparisons_per_agent=n_comparisons_per_agent,
+        random_seed=random_seed,
+        max_concurrency=max_concurrency,
+        max_concurrency_per_agent=max_concurrency_per_agent,
+        cache=cache,
+        interim_every=interim_every,
+        sampler=sampler,
+        batch_size=batch_size,
+        on_call=on_call,
+        retry=retry,
+        ranker=ranker,
+    )
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
@@ -0,0 +1,169 @@
+import asyncio
+import random
+
+import arbitron
+from arbitron import ComparisonCache, ComparisonResult, Item, cache
+from arbitron.cache import comparison_key
+from arbitron.engine import ComparisonEngine
+from arbitron.simulation import simulated_agents
+
+
+def _comparison(winner: str = "a", loser: str = "b") -> ComparisonResult:
+    return ComparisonResult(
+        item_a=winner, item_b=loser, winner=winner, reasoning="why", agent_id="x"
+    )
+
+
+def _key(name_a: str = "a", name_b: str = "b", model: str = "m") -> str:
+    return comparison_key(
+        "prompt", model, "contest", Item(name=name_a), Item(name=name_b)
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_keys_depend_on_the_order_and_the_model():
+    assert _key() == _key()
+    assert _key("a", "b") != _key("b", "a")
+    assert _key(model="m") != _key(model="n")
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    store = ComparisonCache(path)
+    assert store.get(_key()) is None
+    store.put(_key(), _comparison())
+    store.close()
+
+    reopened = ComparisonCache(path)
+    assert reopened.get(_key()) == _comparison()
+    assert reopened.get(_key("b", "a")) is None
+    assert reopened.stats == {"hits": 1, "misses": 1}
+    assert len(reopened) == 1
+
+
+def test_expired_and_least_recently_used_entries_go(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", clock)
+    store = ComparisonCache(":memory:", ttl=60, max_entries=2)
+
+    store.put(_key("a", "b"), _comparison("a", "b"))
+    clock.now += 1
+    store.put(_key("a", "c"), _comparison("a", "c"))
+    clock.now += 1
+    # Reading "b" makes "c" the least recently used
+    assert store.get(_key("a", "b")) is not None
+    clock.now += 1
+    store.put(_key("a", "d"), _comparison("a", "d"))
+
+    assert store.get(_key("a", "c")) is None
+    assert len(store) == 2
+
+    # "b" was written at 1000 and "d" at 1003
+    clock.now = 1061
+    assert store.get(_key("a", "b")) is None
+    assert store.get(_key("a", "d")) is not None
+    clock.now = 1064
+    assert store.evict() == 1
+    assert len(store) == 0
+
+
+def test_write_only_cache_misses_but_refreshes():
+    store = ComparisonCache(":memory:", reuse=False)
+    store.put(_key(), _comparison())
+
+    assert store.get(_key()) is None
+    assert len(store) == 1
+
+
+def _strengths():
+    rng = random.Random(0)
+    return {f"item{i}": rng.gauss(0, 2) for i in range(8)}
+
+
+def test_second_run_is_served_from_the_cache():
+    strengths = _strengths()
+    store = ComparisonCache(":memory:")
+
+    def run():
+        agents = simulated_agents(strengths, n_agents=2, noise=0.0, seed=1)
+        result = arbitron.rank(
+            list(strengths),
+            "x",
+            agents,
+            n_comparisons_per_agent=10,
+            random_seed=2,
+            cache=store,
+        )
+        return result, sum(agent.usage["requests"] for agent in agents)
+
+    first, calls = run()
+    assert calls == 20
+    second, calls = run()
+    assert calls == 0
+    assert second.comparisons == first.comparisons
+    assert second.metadata["cache_hits"] == 20
+
+
+def test_batches_send_only_the_pairs_missing_from_the_cache():
+    strengths = _strengths()
+    [agent] = simulated_agents(strengths, n_agents=1, noise=0.0)
+    items = [Item(name=name) for name in strengths]
+    pairs = [(items[k], items[k + 1]) for k in range(4)]
+    engine = ComparisonEngine(cache=ComparisonCache(":memory:"), batch_size=4)
+
+    async def run():
+        for item_a, item_b in pairs[1::2]:
+            await engine.compare(agent, item_a, item_b, "x")
+        return await engine.compare_batch(agent, pairs, "x")
+
+    comparisons = asyncio.run(run())
+
+    assert [(c.item_a, c.item_b) for c in comparisons] == [
+        (a.name, b.name) for a, b in pairs
+    ]
+    # Two single requests, then one batch of the two uncached pairs
+    assert agent.usage["requests"] == 3
+    assert engine.batched_requests == 1
+    assert (engine.cache_hits, engine.cache_misses) == (2, 4)
+
+
+def test_cached_pairs_turn_a_group_into_a_batch():
+    strengths = _strengths()
+    [agent] = simulated_agents(strengths, n_agents=1, noise=0.0)
+    items = [Item(name=name) for name in list(strengths)[:4]]
+    group = [(a, b) for k, a in enumerate(items) for b in items[k + 1 :]]
+    tasks = []
+
+    def engine():
+        return ComparisonEngine(
+            cache=ComparisonCache(":memory:"),
+            batch_size=len(group),
+            on_call=lambda record: tasks.append(record.task),
+        )
+
+    async def run():
+        first = await engine().compare_batch(agent, group, "x")
+        warm = engine()
+        await warm.compare(agent, *group[0], "x")
+        return first, await warm.compare_batch(agent, group, "x")
+
+    first, second = asyncio.run(run())
+
+    # A whole group is ranked in one call; once a pair is cached the other
+    # five no longer make up a group and go out as a batch
+    assert tasks == ["group", "pair", "batch"]
+    assert [c.winner for c in second] == [c.winner for c in first]
+    for comparison in first:
+        loser = (
+            comparison.item_b
+            if comparison.winner == comparison.item_a
+            else comparison.item_a
+        )
+        assert strengths[comparison.winner] > strengths[loser]
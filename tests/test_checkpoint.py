@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+import arbitron
+from arbitron.samplers import AdaptiveSampler
+from arbitron.simulation import simulated_agents
+
+
+def _contest(checkpoint, resume=False, random_seed=3, sampler=None, n_items=10):
+    rng = random.Random(0)
+    strengths = {f"item{i}": rng.gauss(0, 2) for i in range(n_items)}
+    agents = simulated_agents(strengths, n_agents=2, noise=0.0)
+    result = arbitron.rank(
+        list(strengths),
+        "x",
+        agents,
+        n_comparisons_per_agent=15,
+        random_seed=random_seed,
+        checkpoint=checkpoint,
+        resume=resume,
+        sampler=sampler,
+    )
+    return result, sum(agent.usage["requests"] for agent in agents)
+
+
+def test_resume_after_torn_write(tmp_path):
+    path = tmp_path / "contest.jsonl"
+    full, calls = _contest(path)
+    assert calls == 30
+
+    # Crash in the middle of writing the 11th comparison
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(lines[:11]) + lines[11][:25], encoding="utf-8")
+
+    resumed, calls = _contest(path, resume=True)
+    assert calls == 20
+    assert resumed.comparisons == full.comparisons
+
+    # Every record appended by the resume survives the next one
+    again, calls = _contest(path, resume=True)
+    assert calls == 0
+    assert again.comparisons == full.comparisons
+
+
+def test_multi_round_contest_resumes_in_a_later_round(tmp_path):
+    path = tmp_path / "contest.jsonl"
+    full, calls = _contest(path, sampler=AdaptiveSampler(n_rounds=5))
+    assert calls == 30
+
+    # Keep the header and the first 17 comparisons, a few rounds in
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(lines[:18]), encoding="utf-8")
+
+    resumed, calls = _contest(path, resume=True, sampler=AdaptiveSampler(n_rounds=5))
+    assert calls == 13
+    assert resumed.comparisons == full.comparisons
+
+
+def test_resume_reuses_the_recorded_seed(tmp_path):
+    path = tmp_path / "contest.jsonl"
+    full, _ = _contest(path, random_seed=None)
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(lines[:6]), encoding="utf-8")
+
+    resumed, calls = _contest(path, resume=True, random_seed=None)
+    assert calls == 25
+    assert resumed.comparisons == full.comparisons
+
+
+def test_checkpoint_of_another_contest_is_refused(tmp_path):
+    path = tmp_path / "contest.jsonl"
+    _contest(path)
+
+    with pytest.raises(ValueError, match="already exists"):
+        _contest(path)
+    with pytest.raises(ValueError, match="does not match the seed"):
+        _contest(path, resume=True, random_seed=4)
+    with pytest.raises(ValueError, match="does not match this contest"):
+        _contest(path, resume=True, n_items=12)
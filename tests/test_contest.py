@@ -0,0 +1,91 @@
+import asyncio
+import math
+import random
+
+import pytest
+
+import arbitron
+from arbitron.rankers import EloRanker
+from arbitron.ranking import calculate_bradley_terry_scores
+from arbitron.simulation import simulated_agents
+
+
+def _strengths(n_items: int, seed: int = 0):
+    rng = random.Random(seed)
+    return {f"item{i}": rng.gauss(0, 2) for i in range(n_items)}
+
+
+def _rank(strengths, ranker=None, seed=1):
+    agents = simulated_agents(strengths, n_agents=2, seed=seed)
+    return arbitron.rank(
+        list(strengths),
+        "x",
+        agents,
+        n_comparisons_per_agent=20,
+        random_seed=seed + 1,
+        ranker=ranker,
+    )
+
+
+def test_extend_compares_only_the_new_items():
+    strengths = _strengths(12)
+    old = dict(list(strengths.items())[:10])
+    previous = _rank(old)
+    agents = simulated_agents(strengths, n_agents=2, noise=0.0, seed=3)
+
+    result = arbitron.extend(
+        previous,
+        agents,
+        new_items=["item10", "item11"],
+        n_comparisons_per_item=4,
+        random_seed=4,
+    )
+
+    assert sum(agent.usage["requests"] for agent in agents) == 8
+    assert list(result.comparisons[: len(previous.comparisons)]) == list(
+        previous.comparisons
+    )
+    added = result.comparisons[len(previous.comparisons) :]
+    assert all({"item10", "item11"} & {c.item_a, c.item_b} for c in added)
+    assert sorted(result.ranking) == sorted(strengths)
+    assert result.metadata["n_new_items"] == 2
+    assert result.metadata["n_new_comparisons"] == 8
+
+
+def test_extend_with_comparisons_matches_a_fresh_solve():
+    strengths = _strengths(8)
+    previous = _rank(strengths)
+    more = _rank(strengths, seed=5).comparisons[:15]
+
+    result = asyncio.run(arbitron.extend_async(previous, [], new_comparisons=more))
+
+    expected = calculate_bradley_terry_scores(
+        list(previous.comparisons) + more, list(strengths)
+    )
+    assert len(result.comparisons) == len(previous.comparisons) + 15
+    for item in strengths:
+        assert math.log(result.scores[item]) == pytest.approx(
+            math.log(expected[item]), abs=1e-4
+        )
+
+
+def test_extend_resumes_online_rankers_from_their_state():
+    strengths = _strengths(8)
+    previous = _rank(strengths, ranker="elo")
+    more = _rank(strengths, seed=5).comparisons[:15]
+
+    result = arbitron.extend(previous, [], new_comparisons=more)
+
+    ranker = EloRanker()
+    ranker.start(list(strengths))
+    for comparison in list(previous.comparisons) + list(more):
+        ranker.update(comparison)
+    assert result.scores == pytest.approx(ranker.scores)
+
+
+def test_extend_refuses_items_already_ranked():
+    strengths = _strengths(6)
+    previous = _rank(strengths)
+
+    with pytest.raises(ValueError, match="already in the ranking"):
+        arbitron.extend(previous, simulated_agents(strengths), new_items=["item0"])
@@ -0,0 +1,176 @@
+import asyncio
+
+from pydantic_ai.exceptions import ModelHTTPError
+
+from arbitron import Agent, Item, RateLimiter, RetryPolicy
+from arbitron.engine import ComparisonEngine, _FairSemaphore, current_lane
+from arbitron.simulation import SimulatedJudge
+
+STRENGTHS = {f"item{i}": float(i) for i in range(8)}
+ITEMS = [Item(name=name) for name in STRENGTHS]
+
+
+class ScriptedJudge(SimulatedJudge):
+    """Simulated judge whose calls can fail or stall, one script entry per call.
+
+    An exception entry is raised, a number is slept before answering, and
+    calls past the end of the script answer right away.
+    """
+
+    def __init__(self, script=(), latency: float = 0.0):
+        super().__init__(STRENGTHS, noise=0.0, latency=latency)
+        self.script = list(script)
+        self.started = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def respond(self, messages, info):
+        index = self.started
+        self.started += 1
+        action = self.script[index] if index < len(self.script) else None
+        if isinstance(action, BaseException):
+            raise action
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if action is not None:
+                await asyncio.sleep(action)
+            return await super().respond(messages, info)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def _agent(judge: ScriptedJudge, agent_id: str = "judge") -> Agent:
+    return Agent(
+        "Pick the stronger item.",
+        agent_id=agent_id,
+        model=judge.model(),
+        rate_limiter=RateLimiter(requests_per_minute=1e9),
+    )
+
+
+def _compare(engine: ComparisonEngine, agent: Agent, n: int = 1):
+    async def run():
+        return [
+            await engine.compare(agent, ITEMS[k % 7], ITEMS[7], "x") for k in range(n)
+        ]
+
+    return asyncio.run(run())
+
+
+def test_failed_request_is_retried():
+    judge = ScriptedJudge([TimeoutError(), ModelHTTPError(503, "judge")])
+    engine = ComparisonEngine(retry=RetryPolicy(backoff=0))
+
+    [comparison] = _compare(engine, _agent(judge))
+
+    assert comparison.winner == "item7"
+    assert judge.started == 3
+    assert engine.retries == 2
+    assert engine.metadata["retries"] == 2
+
+
+def test_retry_waits_as_long_as_the_provider_asks():
+    body = '{"error": {"details": [{"retryDelay": "0.3s"}]}}'
+    judge = ScriptedJudge([ModelHTTPError(429, "judge", body)])
+    engine = ComparisonEngine(retry=RetryPolicy(backoff=0))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await engine.compare(_agent(judge), ITEMS[0], ITEMS[1], "x")
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.3
+    assert judge.started == 2
+
+
+def test_errors_that_are_not_worth_retrying_are_raised():
+    judge = ScriptedJudge([ModelHTTPError(401, "judge")])
+    engine = ComparisonEngine(retry=RetryPolicy(backoff=0))
+
+    try:
+        _compare(engine, _agent(judge))
+    except ModelHTTPError as error:
+        assert error.status_code == 401
+    else:
+        raise AssertionError("expected the 401 to be raised")
+    assert judge.started == 1
+    assert engine.retries == 0
+
+
+def test_slow_request_is_hedged_and_the_loser_cancelled():
+    # Five quick calls set the hedge delay, then one stalls
+    judge = ScriptedJudge([None] * 5 + [30.0])
+    engine = ComparisonEngine(
+        retry=RetryPolicy(hedge=True, hedge_percentile=50, hedge_min_samples=5)
+    )
+
+    async def run():
+        agent = _agent(judge)
+        for _ in range(5):
+            await engine.compare(agent, ITEMS[0], ITEMS[1], "x")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        comparison = await engine.compare(agent, ITEMS[2], ITEMS[3], "x")
+        return comparison, loop.time() - start
+
+    comparison, elapsed = asyncio.run(run())
+
+    assert comparison.winner == "item3"
+    assert elapsed < 5
+    assert engine.hedged_requests == 1
+    assert judge.started == 7
+    assert judge.cancelled == 1
+
+
+def test_concurrency_is_capped_per_agent_and_overall():
+    judges = [ScriptedJudge(latency=0.02) for _ in range(3)]
+    agents = [_agent(judge, f"judge{k}") for k, judge in enumerate(judges)]
+    engine = ComparisonEngine(max_concurrency=5, max_concurrency_per_agent=2)
+    jobs = [(agent, ITEMS[k % 7], ITEMS[7]) for agent in agents for k in range(6)]
+
+    results = asyncio.run(engine.run(jobs, "x"))
+
+    assert [result.agent_id for result in results] == [
+        agent.agent_id for agent, _, _ in jobs
+    ]
+    assert all(judge.peak == 2 for judge in judges)
+    assert sum(judge.started for judge in judges) == len(jobs)
+
+    # With a single agent, the overall limit is the tighter one
+    judge = ScriptedJudge(latency=0.02)
+    agent = _agent(judge)
+    engine = ComparisonEngine(max_concurrency=3, max_concurrency_per_agent=4)
+    asyncio.run(engine.run([(agent, ITEMS[k], ITEMS[7]) for k in range(7)], "x"))
+    assert judge.peak == 3
+
+
+def test_free_slots_go_to_waiting_lanes_in_turn():
+    order = []
+
+    async def run():
+        semaphore = _FairSemaphore(1)
+        await semaphore.acquire()
+
+        async def worker(lane):
+            current_lane.set(lane)
+            async with semaphore:
+                order.append(lane)
+                await asyncio.sleep(0)
+
+        # Lane "a" queues four jobs before lane "b" queues its two
+        tasks = [asyncio.ensure_future(worker("a")) for _ in range(4)]
+        tasks += [asyncio.ensure_future(worker("b")) for _ in range(2)]
+        await asyncio.sleep(0)
+        semaphore.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert order == ["a", "b", "a", "b", "a", "a"]
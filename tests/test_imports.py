@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+HEAVY = ("pydantic_ai", "httpx", "pyarrow")
+
+
+def _loaded_after(code: str):
+    """Heavy modules imported by running `code` in a fresh interpreter."""
+    check = f"import sys\n{code}\nprint(*[m for m in {HEAVY!r} if m in sys.modules])"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", check],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    ).stdout
+    return output.split()
+
+
+def test_import_is_light():
+    assert _loaded_after("import arbitron") == []
+
+
+def test_models_and_agents_do_not_load_the_model_clients():
+    code = """
+import arbitron
+arbitron.Item(name="a")
+arbitron.load_result
+arbitron.rank
+arbitron.Agent("Pick one.", model="openai:gpt-4o-mini")
+"""
+    assert _loaded_after(code) == []
@@ -0,0 +1,144 @@
+import math
+import random
+
+import pytest
+
+from arbitron import ComparisonResult, rankers
+from arbitron.rankers import (
+    RANKERS,
+    BradleyTerryRanker,
+    ConsensusRanker,
+    EloRanker,
+    OnlineRanker,
+    RankCentralityRanker,
+    Ranker,
+    get_ranker,
+    register_ranker,
+)
+
+
+def _comparison(winner: str, loser: str, agent_id: str) -> ComparisonResult:
+    return ComparisonResult(
+        item_a=winner, item_b=loser, winner=winner, reasoning="", agent_id=agent_id
+    )
+
+
+def test_consensus_mean_of_items_that_never_won():
+    # Without regularization an item that never won gets no mass at all
+    comparisons = [
+        _comparison(winner, loser, agent_id)
+        for agent_id in ("a1", "a2")
+        for winner, loser in [("x", "y"), ("y", "z"), ("x", "z")]
+    ]
+    ranker = ConsensusRanker(RankCentralityRanker(regularization=0))
+
+    scores = ranker.fit(comparisons, ["x", "y", "z"])
+
+    assert all(math.isfinite(score) for score in scores.values())
+    assert scores["x"] > scores["y"] > scores["z"]
+
+
+def _split_contest():
+    # Each agent compares only some of the items, and nobody compares "e"
+    comparisons = []
+    for agent_id, ranking in [("a1", ["a", "b", "c"]), ("a2", ["c", "d"])]:
+        for i, winner in enumerate(ranking):
+            for loser in ranking[i + 1 :]:
+                comparisons += [_comparison(winner, loser, agent_id)] * 3
+                comparisons.append(_comparison(loser, winner, agent_id))
+    return comparisons, ["a", "b", "c", "d", "e"]
+
+
+def test_batched_solve_pins_items_an_agent_never_compared():
+    comparisons, items = _split_contest()
+
+    scores = BradleyTerryRanker().fit_per_agent(comparisons, items)
+
+    assert [scores["a1"][item] for item in "de"] == [1.0, 1.0]
+    assert [scores["a2"][item] for item in "abe"] == [1.0, 1.0, 1.0]
+    assert scores["a2"]["c"] > 1 > scores["a2"]["d"]
+
+
+@pytest.mark.parametrize("method", ["mean", "borda"])
+def test_consensus_averages_over_the_agents_that_judged_an_item(method):
+    comparisons, items = _split_contest()
+    ranker = ConsensusRanker(method=method)
+
+    scores = ranker.fit(comparisons, items)
+
+    if method == "mean":
+        for item in "ab":
+            assert scores[item] == pytest.approx(ranker.agent_scores["a1"][item])
+        assert scores["e"] == pytest.approx(1.0)
+    assert scores["a"] > scores["b"] > scores["e"]
+    assert scores["c"] > scores["d"]
+
+
+def test_incomplete_rankers_cannot_be_instantiated():
+    class NoFit(Ranker):
+        pass
+
+    class NoUpdate(OnlineRanker):
+        def start(self, items, state=None):
+            pass
+
+    with pytest.raises(TypeError):
+        NoFit()
+    with pytest.raises(TypeError):
+        NoUpdate()
+
+
+def _round_robins(n_rounds: int = 4):
+    # Every pair, in random order, by two agents; lower numbers always win
+    items = [f"item{k}" for k in range(6)]
+    rng = random.Random(0)
+    comparisons = []
+    for _ in range(n_rounds):
+        for agent_id in ("a1", "a2"):
+            pairs = [(a, b) for k, a in enumerate(items) for b in items[k + 1 :]]
+            rng.shuffle(pairs)
+            comparisons += [_comparison(a, b, agent_id) for a, b in pairs]
+    return comparisons, items
+
+
+@pytest.mark.parametrize("name", sorted(RANKERS))
+def test_registered_rankers_recover_a_consistent_order(name):
+    comparisons, items = _round_robins()
+    ranker = get_ranker(name)
+
+    scores = ranker.fit(comparisons, items)
+
+    assert ranker.name == ("consensus:bradley-terry" if name == "consensus" else name)
+    assert sorted(items, key=scores.get, reverse=True) == items
+
+
+@pytest.mark.parametrize("name", ["elo", "glicko", "trueskill"])
+def test_online_rankers_resume_from_their_state(name):
+    comparisons, items = _round_robins()
+    first = get_ranker(name)
+    first.fit(comparisons[:30], items)
+
+    resumed = get_ranker(name)
+    resumed.start(items, first.state)
+    for comparison in comparisons[30:]:
+        resumed.update(comparison)
+
+    assert isinstance(resumed, OnlineRanker)
+    assert resumed.scores == get_ranker(name).fit(comparisons, items)
+    assert resumed.metadata == {"ranker_state": resumed.state}
+
+
+def test_ranker_arguments_resolve(monkeypatch):
+    monkeypatch.setattr(rankers, "RANKERS", dict(RANKERS))
+    elo = EloRanker(k=16)
+
+    assert isinstance(get_ranker(None), BradleyTerryRanker)
+    assert get_ranker(elo) is elo
+    consensus = get_ranker("consensus:elo")
+    assert isinstance(consensus, ConsensusRanker)
+    assert consensus.name == "consensus:elo"
+    with pytest.raises(ValueError, match="Unknown ranker 'nope'"):
+        get_ranker("nope")
+
+    register_ranker("slow-elo", lambda: EloRanker(k=4))
+    assert get_ranker("slow-elo").k == 4
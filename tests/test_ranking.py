@@ -0,0 +1,48 @@
+import math
+import random
+
+import pytest
+
+from arbitron import ComparisonResult
+from arbitron.ranking import calculate_bradley_terry_scores
+from arbitron.store import ComparisonLog
+
+pytest.importorskip("numpy")
+
+
+def _random_contest(n_items: int, n_comparisons: int, seed: int):
+    rng = random.Random(seed)
+    strengths = {f"item{i}": rng.gauss(0, 1.5) for i in range(n_items)}
+    items = list(strengths)
+    comparisons = []
+    for _ in range(n_comparisons):
+        a, b = rng.sample(items, 2)
+        p_a = 1 / (1 + math.exp(strengths[b] - strengths[a]))
+        comparisons.append(
+            ComparisonResult(
+                item_a=a,
+                item_b=b,
+                winner=a if rng.random() < p_a else b,
+                reasoning="",
+                agent_id="judge",
+            )
+        )
+    return comparisons, items
+
+
+@pytest.mark.parametrize("engine", ["numpy", "sparse"])
+@pytest.mark.parametrize("prior", [0.0, 1.0])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_engines_match_python(engine, prior, seed):
+    # Few comparisons per item leave some items without a win or a loss
+    comparisons, items = _random_contest(25, 20 + 60 * seed, seed)
+
+    expected = calculate_bradley_terry_scores(
+        comparisons, items, engine="python", prior=prior
+    )
+    for log in (comparisons, ComparisonLog.from_comparisons(comparisons)):
+        scores = calculate_bradley_terry_scores(log, items, engine=engine, prior=prior)
+        for item in items:
+            assert math.log(scores[item]) == pytest.approx(
+                math.log(expected[item]), abs=1e-6
+            )
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from arbitron import Agent, rate_limit
+from arbitron.backends import Backend
+from arbitron.rate_limit import RateLimiter, get_rate_limiter
+
+
+class FakeClock:
+    """Stands in for the time module; sleeping moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    return clock
+
+
+def test_burst_goes_out_at_once_then_requests_follow_the_rate(clock):
+    limiter = RateLimiter(requests_per_minute=60, burst=3)
+
+    waits = [limiter.acquire() for _ in range(6)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([1.0, 1.0, 1.0])
+    assert clock.now == pytest.approx(1003.0)
+    assert limiter.stats["requests"] == 6
+    assert limiter.stats["requests_waited"] == 3
+
+
+def test_idle_time_refills_the_burst_but_not_beyond(clock):
+    limiter = RateLimiter(requests_per_minute=30, burst=2)
+    limiter.acquire()
+    limiter.acquire()
+
+    clock.now += 600
+    waits = [limiter.acquire() for _ in range(3)]
+
+    assert waits == pytest.approx([0.0, 0.0, 2.0])
+
+
+def test_token_budget_delays_large_requests(clock):
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1200, burst=10)
+
+    assert limiter.acquire(tokens=1200) == 0.0
+    # The bucket is empty; 600 more tokens take half a minute to accrue
+    assert limiter.acquire(tokens=600) == pytest.approx(30.0)
+    assert limiter.estimate_wait(tokens=1) == pytest.approx(0.05)
+
+
+def test_waiting_callers_are_spaced_without_holding_the_lock(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+
+    # Reservations made at the same instant queue up one interval apart
+    waits = [limiter._reserve(0) for _ in range(4)]
+
+    assert waits == pytest.approx([0.0, 1.0, 2.0, 3.0])
+
+
+def test_cancelled_wait_returns_its_slot(clock):
+    limiter = RateLimiter(requests_per_minute=1)
+    limiter.acquire()
+
+    async def cancel_waiter():
+        task = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_waiter())
+
+    assert limiter.stats["requests"] == 1
+    assert limiter.estimate_wait() == pytest.approx(60.0)
+
+
+def test_limiters_are_shared_per_model_and_backend(clock):
+    first = Agent("a", model="openai:gpt-4o-mini")
+    second = Agent("b", model="openai:gpt-4o-mini")
+    other = Agent("c", model="openai:gpt-4o")
+    keyed = Agent(
+        "d",
+        model=[
+            Backend("openai:gpt-4o-mini", name="key-1"),
+            Backend("openai:gpt-4o-mini", name="key-2"),
+        ],
+    )
+
+    assert first.rate_limiter is second.rate_limiter
+    assert first.rate_limiter is get_rate_limiter("openai:gpt-4o-mini")
+    assert other.rate_limiter is not first.rate_limiter
+    limiters = [backend.rate_limiter for backend in keyed.backends.backends]
+    assert limiters[0] is get_rate_limiter("key-1")
+    assert limiters[1] is get_rate_limiter("key-2")
+    assert limiters[0] is not limiters[1]
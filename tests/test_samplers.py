@@ -0,0 +1,157 @@
+import random
+from collections import Counter
+
+import pytest
+
+import arbitron
+from arbitron import ComparisonResult, Item, StoppingRule
+from arbitron.ranking import comparison_graph_components
+from arbitron.samplers import AdaptiveSampler, BalancedSampler, SortSampler
+from arbitron.simulation import simulated_agents
+
+
+def _strengths(n_items: int, seed: int):
+    rng = random.Random(seed)
+    return {f"item{i}": rng.gauss(0, 2) for i in range(n_items)}
+
+
+def _judge(jobs, strengths):
+    """Noiseless outcomes of `jobs`."""
+    return [
+        ComparisonResult(
+            item_a=a.name,
+            item_b=b.name,
+            winner=max(a.name, b.name, key=strengths.get),
+            reasoning="",
+            agent_id=agent.agent_id,
+        )
+        for agent, a, b in jobs
+    ]
+
+
+def _start(sampler, strengths, n_agents, n_comparisons_per_agent, seed=3):
+    agents = simulated_agents(strengths, n_agents=n_agents, seed=1)
+    items = [Item(name=name) for name in strengths]
+    sampler.start(items, agents, n_comparisons_per_agent, random.Random(seed))
+    return agents
+
+
+def test_sort_sampler_matches_outcomes_to_jobs_in_any_order():
+    # Noiseless outcomes make the sort exact, so any outcome credited to the
+    # wrong decision shows up as a wrong order
+    strengths = _strengths(30, 0)
+    truth = sorted(strengths, key=strengths.get, reverse=True)
+    agents = simulated_agents(strengths, n_agents=3, seed=1)
+    rng = random.Random(3)
+
+    sampler = SortSampler()
+    sampler.start([Item(name=name) for name in strengths], agents, 0, rng)
+    comparisons = []
+    while jobs := sampler.next_round(comparisons):
+        outcomes = _judge(jobs, strengths)
+        rng.shuffle(outcomes)
+        comparisons.extend(outcomes)
+
+    assert sampler.metadata["sort_order"] == truth
+
+
+def test_sort_sampler_asks_again_for_jobs_cut_from_a_round():
+    # Only the first half of every round runs, as when a call cap cuts it
+    strengths = _strengths(20, 0)
+    truth = sorted(strengths, key=strengths.get, reverse=True)
+    agents = simulated_agents(strengths, n_agents=3, seed=1)
+
+    sampler = SortSampler(votes=3)
+    sampler.start([Item(name=name) for name in strengths], agents, 0, random.Random(2))
+    comparisons = []
+    while jobs := sampler.next_round(comparisons):
+        comparisons.extend(_judge(jobs[: (len(jobs) + 1) // 2], strengths))
+
+    assert sampler.metadata["sort_order"] == truth
+    # Load is counted for the comparisons that ran, not the ones planned
+    assert sum(sampler._assigned.values()) == len(comparisons)
+
+
+def test_sort_sampler_under_stopping_rule():
+    strengths = _strengths(25, 0)
+    truth = sorted(strengths, key=strengths.get, reverse=True)
+
+    for stopping in (None, StoppingRule(n_rounds=4, min_rounds=100)):
+        agents = simulated_agents(strengths, n_agents=3, noise=0.0, seed=1)
+        result = arbitron.rank(
+            list(strengths),
+            "x",
+            agents,
+            random_seed=2,
+            sampler=SortSampler(),
+            stopping=stopping,
+        )
+        assert result.metadata["sort_order"] == truth
+
+
+@pytest.mark.parametrize(
+    "n_comparisons_per_agent, judges_per_pair", [(5, 1), (10, 1), (50, 2)]
+)
+def test_balanced_sampler_spreads_pairs_evenly(
+    n_comparisons_per_agent, judges_per_pair
+):
+    strengths = _strengths(15, 0)
+    sampler = BalancedSampler(judges_per_pair=judges_per_pair)
+    agents = _start(sampler, strengths, 4, n_comparisons_per_agent)
+
+    jobs = sampler.next_round([])
+
+    assert sampler.next_round(_judge(jobs, strengths)) == []
+    loads = Counter(agent.agent_id for agent, _, _ in jobs)
+    assert loads == {agent.agent_id: n_comparisons_per_agent for agent in agents}
+
+    # Distinct pairs, each judged by different agents
+    judges = {}
+    for agent, a, b in jobs:
+        judges.setdefault(frozenset((a.name, b.name)), []).append(agent.agent_id)
+    assert all(len(set(ids)) == judges_per_pair for ids in judges.values())
+
+    low, high = sampler.metadata["pairs_per_item"]
+    assert high - low <= 1
+    assert sampler.metadata["n_pairs"] == len(judges)
+    components = comparison_graph_components(_judge(jobs, strengths), list(strengths))
+    assert len(components) == 1
+
+    if judges_per_pair == 2:
+        # The two judges of a pair see it in opposite orders
+        shown_first = Counter(a.name for _, a, _ in jobs)
+        for name in strengths:
+            assert shown_first[name] == sum(name in pair for pair in judges)
+
+
+def test_balanced_sampler_caps_judges_at_the_number_of_agents():
+    strengths = _strengths(6, 0)
+    sampler = BalancedSampler(judges_per_pair=3)
+    _start(sampler, strengths, 2, 5)
+
+    jobs = sampler.next_round([])
+
+    assert sampler.metadata["judges_per_pair"] == 2
+    assert len(jobs) == 10
+    with pytest.raises(ValueError):
+        BalancedSampler(judges_per_pair=0)
+
+
+@pytest.mark.parametrize("n_rounds", [1, 5])
+def test_adaptive_sampler_spends_the_budget_in_rounds(n_rounds):
+    strengths = _strengths(15, 0)
+    sampler = AdaptiveSampler(n_rounds=n_rounds)
+    agents = _start(sampler, strengths, 4, 10)
+
+    comparisons = []
+    rounds = []
+    while jobs := sampler.next_round(comparisons):
+        rounds.append(jobs)
+        comparisons.extend(_judge(jobs, strengths))
+
+    # The first round connects every item along a cycle
+    warmup = _judge(rounds[0], strengths)
+    assert len(comparison_graph_components(warmup, list(strengths))) == 1
+    assert 1 < len(rounds) <= n_rounds + 1
+    loads = Counter(comparison.agent_id for comparison in comparisons)
+    assert loads == {agent.agent_id: 10 for agent in agents}
@@ -0,0 +1,178 @@
+import io
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from arbitron import (
+    ComparisonLog,
+    ComparisonResult,
+    Competition,
+    Item,
+    RankingResult,
+    iter_comparisons,
+    load_result,
+    save_result,
+)
+from arbitron.models import TRUSTED
+from arbitron.store import _JsonStream
+
+
+def _comparisons():
+    return [
+        ComparisonResult(
+            item_a="a", item_b="b", winner="a", reasoning="first", agent_id="x"
+        ),
+        ComparisonResult(
+            item_a="c",
+            item_b="a",
+            winner="a",
+            reasoning="second",
+            agent_id="y",
+            backend="key-1",
+        ),
+        ComparisonResult(
+            item_a="b",
+            item_b="c",
+            winner="c",
+            reasoning="third",
+            agent_id="x",
+            backend="key-2",
+        ),
+    ]
+
+
+def test_log_round_trips_through_arrow_and_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    log = ComparisonLog.from_comparisons(_comparisons(), items=["a", "b", "c", "d"])
+    assert log == _comparisons()
+    assert log.items == ["a", "b", "c", "d"]
+
+    table = log.to_arrow()
+    assert table.column("backend").to_pylist() == [None, "key-1", "key-2"]
+    assert ComparisonLog.from_arrow(table) == _comparisons()
+
+    path = tmp_path / "log.parquet"
+    log.write_parquet(path)
+    assert ComparisonLog.read_parquet(path) == _comparisons()
+
+    lean = ComparisonLog.read_parquet(path, keep_reasoning=False)
+    assert lean.reasoning is None
+    assert [c.reasoning for c in lean] == ["", "", ""]
+    assert [c.backend for c in lean] == [None, "key-1", "key-2"]
+
+
+def test_tables_without_a_backend_column_load_with_no_backend():
+    pytest.importorskip("pyarrow")
+    table = ComparisonLog.from_comparisons(_comparisons()).to_arrow()
+    table = table.drop_columns(["backend"])
+
+    log = ComparisonLog.from_arrow(table)
+
+    assert [c.backend for c in log] == [None, None, None]
+    assert [c.winner for c in log] == ["a", "a", "c"]
+
+
+def test_log_fields_keep_logs_and_serialize_as_lists():
+    class Holder(BaseModel):
+        log: ComparisonLog
+
+    log = ComparisonLog.from_comparisons(_comparisons())
+    holder = Holder(log=log)
+
+    assert holder.log is log
+    data = holder.model_dump()
+    assert data["log"] == [c.model_dump() for c in _comparisons()]
+    assert Holder.model_validate_json(holder.model_dump_json()).log == _comparisons()
+
+
+def _result(comparisons=None):
+    return RankingResult(
+        competition=Competition(
+            name="test",
+            description="Pick the better letter",
+            items=[Item(name=name) for name in "abcd"],
+        ),
+        ranking=["a", "c", "b", "d"],
+        scores={"a": 2.0, "c": 1.0, "b": 0.5, "d": 0.5},
+        comparisons=_comparisons() if comparisons is None else comparisons,
+        metadata={"ranker": "bradley-terry", "nested": {"seed": 1}},
+    )
+
+
+def test_saved_results_match_model_dump_json(tmp_path):
+    path = tmp_path / "result.json"
+    for result in (_result(), _result().compact(), _result([])):
+        save_result(result, path)
+        assert json.loads(path.read_text()) == json.loads(result.model_dump_json())
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_results_load_back_as_saved(tmp_path, compact):
+    path = tmp_path / "result.json"
+    save_result(_result(), path)
+
+    # A tiny chunk size makes values straddle the chunk boundaries
+    loaded = load_result(path, compact=compact, chunk_size=7)
+
+    assert isinstance(loaded.comparisons, ComparisonLog) == compact
+    assert list(loaded.comparisons) == _comparisons()
+    assert [c.backend for c in loaded.comparisons] == [None, "key-1", "key-2"]
+    assert loaded.ranking == ["a", "c", "b", "d"]
+    assert loaded.scores == _result().scores
+    assert loaded.metadata == _result().metadata
+    assert loaded.competition == _result().competition
+    if compact:
+        assert loaded.comparisons.items == ["a", "b", "c", "d"]
+
+    lean = load_result(path, compact=compact, keep_reasoning=False)
+    assert [c.reasoning for c in lean.comparisons] == ["", "", ""]
+
+
+def test_empty_results_load(tmp_path):
+    path = tmp_path / "result.json"
+    save_result(_result([]), path)
+
+    assert list(load_result(path).comparisons) == []
+    assert len(load_result(path, compact=True).comparisons) == 0
+    assert list(iter_comparisons(path)) == []
+
+
+def test_comparisons_stream_one_at_a_time(tmp_path):
+    path = tmp_path / "result.json"
+    path.write_text(_result().model_dump_json(indent=2))
+
+    stream = iter_comparisons(path, chunk_size=5)
+
+    assert next(stream) == _comparisons()[0]
+    assert list(stream) == _comparisons()[1:]
+
+
+def test_json_stream_reads_values_across_chunks():
+    stream = _JsonStream(io.StringIO(' [12345 , "ab\\"cd", {"k": [1, 2]}]'), 2)
+
+    assert stream.expect("[") == "["
+    assert stream.value() == 12345
+    assert stream.expect(",") == ","
+    assert stream.value() == 'ab"cd'
+    stream.expect(",")
+    assert stream.value() == {"k": [1, 2]}
+    assert stream.expect(",]") == "]"
+    with pytest.raises(ValueError, match="end of JSON"):
+        stream.peek()
+
+
+def test_trusted_loading_skips_winner_validation(tmp_path):
+    data = json.loads(_result().model_dump_json())
+    data["comparisons"][0]["winner"] = "zzz"
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps(data))
+
+    with pytest.raises(ValidationError, match="must be exactly one of"):
+        RankingResult.model_validate_json(path.read_text())
+
+    # Trusted files are taken as they are, without repair
+    assert load_result(path).comparisons[0].winner == "zzz"
+    assert next(iter_comparisons(path)).winner == "zzz"
+    trusted = ComparisonResult.model_validate(data["comparisons"][0], context=TRUSTED)
+    assert trusted.winner == "zzz"
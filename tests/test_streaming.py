@@ -0,0 +1,97 @@
+import asyncio
+import random
+
+import arbitron
+from arbitron import ComparisonResult, RankingResult
+from arbitron.samplers import AdaptiveSampler
+from arbitron.simulation import simulated_agents
+
+
+def _strengths():
+    rng = random.Random(0)
+    return {f"item{i}": rng.gauss(0, 2) for i in range(10)}
+
+
+def _stream(strengths, agents, **kwargs):
+    return arbitron.rank_iter(
+        list(strengths),
+        "x",
+        agents,
+        n_comparisons_per_agent=12,
+        random_seed=1,
+        interim_every=5,
+        **kwargs,
+    )
+
+
+def test_stream_yields_every_comparison_then_the_final_ranking():
+    strengths = _strengths()
+    agents = simulated_agents(strengths, n_agents=2, latency=(0, 0.01), seed=2)
+
+    events = list(_stream(strengths, agents))
+
+    comparisons = [e for e in events if isinstance(e, ComparisonResult)]
+    rankings = [e for e in events if isinstance(e, RankingResult)]
+    assert len(comparisons) == 24
+    assert sum(agent.usage["requests"] for agent in agents) == 24
+
+    # An interim ranking follows every fifth comparison and covers all so far
+    seen = 0
+    for event in events[:-1]:
+        if isinstance(event, ComparisonResult):
+            seen += 1
+        else:
+            assert seen % 5 == 0
+            assert event.metadata["interim"]
+            assert list(event.comparisons) == comparisons[:seen]
+    assert [r.metadata["total_comparisons"] for r in rankings[:-1]] == [
+        5,
+        10,
+        15,
+        20,
+    ]
+
+    final = events[-1]
+    assert isinstance(final, RankingResult)
+    assert "interim" not in final.metadata
+    assert list(final.comparisons) == comparisons
+    assert sorted(final.ranking) == sorted(strengths)
+
+
+def test_stream_feeds_every_round_to_the_sampler():
+    strengths = _strengths()
+    agents = simulated_agents(strengths, n_agents=2, noise=0.0, seed=2)
+
+    events = list(_stream(strengths, agents, sampler=AdaptiveSampler(n_rounds=4)))
+
+    comparisons = [e for e in events if isinstance(e, ComparisonResult)]
+    assert len(comparisons) == 24
+    assert list(events[-1].comparisons) == comparisons
+
+
+def test_closing_the_stream_cancels_pending_comparisons():
+    strengths = _strengths()
+    agents = simulated_agents(strengths, n_agents=2, latency=0.05, seed=2)
+
+    def requests():
+        return sum(agent.usage["requests"] for agent in agents)
+
+    async def take(n):
+        stream = arbitron.rank_iter_async(
+            list(strengths), "x", agents, n_comparisons_per_agent=12, random_seed=1
+        )
+        taken = []
+        async for event in stream:
+            taken.append(event)
+            if len(taken) == n:
+                break
+        await stream.aclose()
+        after_close = requests()
+        # Requests in flight when the stream closed must not finish later
+        await asyncio.sleep(0.2)
+        return taken, after_close
+
+    taken, after_close = asyncio.run(take(3))
+
+    assert len(taken) == 3
+    assert requests() == after_close < 24
@@ -0,0 +1,99 @@
+import math
+import random
+
+import pytest
+
+import arbitron
+from arbitron import ComparisonResult
+from arbitron.ranking import calculate_bradley_terry_scores
+from arbitron.simulation import simulated_agents
+from arbitron.uncertainty import bootstrap
+
+pytest.importorskip("numpy")
+
+
+def _comparison(winner: str, loser: str) -> ComparisonResult:
+    return ComparisonResult(
+        item_a=winner, item_b=loser, winner=winner, reasoning="", agent_id="judge"
+    )
+
+
+def _random_contest(n_items: int, n_comparisons: int, seed: int):
+    rng = random.Random(seed)
+    strengths = {f"item{i}": rng.gauss(0, 1.5) for i in range(n_items)}
+    items = list(strengths)
+    comparisons = []
+    for _ in range(n_comparisons):
+        a, b = rng.sample(items, 2)
+        p_a = 1 / (1 + math.exp(strengths[b] - strengths[a]))
+        comparisons.append(
+            _comparison(a, b) if rng.random() < p_a else _comparison(b, a)
+        )
+    return comparisons, items
+
+
+def _small_contest():
+    # The undamped engines oscillate on this log instead of converging
+    outcomes = {
+        ("a", "b"): 5,
+        ("b", "a"): 2,
+        ("b", "c"): 6,
+        ("c", "b"): 1,
+        ("a", "d"): 3,
+        ("c", "d"): 2,
+        ("d", "c"): 1,
+    }
+    comparisons = [
+        _comparison(winner, loser)
+        for (winner, loser), count in outcomes.items()
+        for _ in range(count)
+    ]
+    return comparisons, ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "contest, prior",
+    [
+        (_small_contest(), 0.0),
+        (_random_contest(30, 600, 0), 0.0),
+        (_random_contest(30, 600, 0), 1.0),
+    ],
+)
+def test_point_estimate_is_the_engine_solution(contest, prior):
+    comparisons, items = contest
+
+    result = bootstrap(comparisons, items, n_replicates=200, prior=prior, random_seed=1)
+
+    assert result.scores == calculate_bradley_terry_scores(
+        comparisons, items, prior=prior
+    )
+    for item in items:
+        low, high = result.score_intervals[item]
+        assert low <= result.scores[item] <= high
+
+
+@pytest.mark.parametrize("ranker", [None, "elo"])
+def test_result_bootstrap_reports_the_result_scores(ranker):
+    strengths = {f"item{i}": 0.5 * i for i in range(8)}
+    agents = simulated_agents(strengths, n_agents=2, seed=0)
+    result = arbitron.rank(list(strengths), "x", agents, random_seed=1, ranker=ranker)
+
+    intervals = result.bootstrap(n_replicates=50, random_seed=2)
+
+    if ranker is None:
+        assert intervals.scores == result.scores
+    else:
+        assert intervals.scores == calculate_bradley_terry_scores(
+            result.comparisons, list(strengths)
+        )
+
+
+def test_items_missing_from_a_replicate_stay_average():
+    comparisons, items = _random_contest(10, 300, 0)
+    comparisons.append(_comparison(items[0], "rare"))
+
+    result = bootstrap(comparisons, items + ["rare"], n_replicates=200, random_seed=1)
+
+    # "rare" never wins, so its only finite values come from the replicates
+    # that leave out its one comparison
+    assert result.score_intervals["rare"][1] == pytest.approx(1.0)